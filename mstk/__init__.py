@@ -13,10 +13,11 @@ from .schedule.interval import Interval
 from .schedule.activity import Activity, Operation
 from .schedule.machine import Machine
 from .schedule.schedule import Schedule
-from .schedule.to_dt import to_dt_datetime
+from .schedule.to_dt import to_dt_datetime, Moment
 from .visualize.color_map import Cmap
 
 from .visualize.plot_schedule import PlotSchedule
 from .read_schedule import read_schedule
+from .write_schedule import write_schedule
 
 # TODO: use AcTypes as a global param
@@ -0,0 +1,399 @@
+""" Vectorized reader of project folders into columnar schedules
+Created on 17th Oct. 2026
+"""
+from __future__ import annotations
+
+__all__ = [
+    "read_info_table",
+    "read_activity_columns",
+    "read_columnar_schedule",
+]
+
+# common Python packages
+from typing import List, Dict, Any, Optional, Tuple
+
+import csv, os, warnings
+from functools import partial
+
+import numpy as np
+
+# defined packages
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.interval import Interval
+from mstk.schedule.schedule import Schedule
+from mstk.schedule.columnar import TICK, RowContents
+from mstk.read_schedule import read_metadata, find_metadata_horizon
+
+
+def read_info_table(
+    fname: str, id_key: str
+) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Reads machine or job information
+
+    Args:
+        fname (str): the file path
+        id_key (str): the column of ids (mc_id or job_id)
+
+    Returns:
+        Tuple[List[str], List[Dict[str, str]]]: ids and contents of rows
+    """
+    id_list: List[str] = []
+    contents_list: List[Dict[str, str]] = []
+    with open(fname, "r", encoding="utf-8") as file_data:
+        for contents in csv.DictReader(file_data):
+            id_list.append(contents[id_key])
+            contents_list.append(dict(contents))
+    return (id_list, contents_list)
+
+
+def read_activity_columns(
+    fname: str, ac_types: AcTypesParam
+) -> Dict[str, Any]:
+    """Reads activity information into columns of codes
+
+    The file is parsed into string columns by np.loadtxt, and machine ids,
+    job ids and date strings are replaced with codes by np.unique, so that
+    each distinct date string is parsed only once afterwards
+    (ids are coded in the order of their first appearance)
+
+    Args:
+        fname (str): the file path
+        ac_types (AcTypesParam): a container of ac types
+
+    Raises:
+        ValueError: an ac_type is neither an operation nor a breakdown,
+            or rows do not have the columns of the header
+
+    Returns:
+        Dict[str, Any]: columns of codes (mc_codes, job_codes, type_codes,
+            start_codes, end_codes), the tables of codes (mc_id_list,
+            job_id_list, text_list) and string columns of the file by key
+            (contents of rows are their non-empty values)
+    """
+    with open(fname, "r", encoding="utf-8") as file_data:
+        header = next(csv.reader(file_data), [])
+    mc_col = header.index("mc_id")
+    type_col = header.index("ac_type")
+    job_col = header.index("job_id")
+    start_col = header.index("start")
+    end_col = header.index("end")
+    with warnings.catch_warnings():
+        # warnings on empty files and blank lines
+        warnings.simplefilter("ignore", UserWarning)
+        table = np.loadtxt(
+            fname,
+            dtype=np.str_,
+            delimiter=",",
+            comments=None,
+            quotechar='"',
+            skiprows=1,
+            ndmin=2,
+            encoding="utf-8",
+        )
+    if len(table) == 0:
+        table = np.empty((0, len(header)), dtype=np.str_)
+    elif table.shape[1] != len(header):
+        raise ValueError(
+            f"{fname} has {table.shape[1]} columns, not {len(header)}"
+        )
+
+    # codes of ac_types are indices of all_types as in ColumnarMCSchedule
+    type_code_dict = {
+        ac_type: ac_types.all_types.index(ac_type)
+        for ac_type in [ac_types.operation, ac_types.breakdown]
+    }
+    type_list, type_inverse = np.unique(
+        table[:, type_col], return_inverse=True
+    )
+    type_table = np.array(
+        [type_code_dict.get(ac_type, -1) for ac_type in type_list.tolist()],
+        dtype=np.int8,
+    )
+    type_codes = type_table[type_inverse]
+    invalid_rows = np.flatnonzero(type_codes < 0)
+    if len(invalid_rows) > 0:
+        ac_type = table[invalid_rows[0], type_col]
+        raise ValueError(f"ac_type [{ac_type}] is not supported")
+
+    mc_codes, mc_id_list = _codes_of_first_appearance(table[:, mc_col])
+    job_codes, job_id_list = _codes_of_first_appearance(table[:, job_col])
+    size = len(table)
+    text_list, text_codes = np.unique(
+        np.concatenate((table[:, start_col], table[:, end_col])),
+        return_inverse=True,
+    )
+    text_codes = text_codes.astype(np.int32)
+    return {
+        "mc_codes": mc_codes,
+        "job_codes": job_codes,
+        "type_codes": type_codes,
+        "start_codes": text_codes[:size],
+        "end_codes": text_codes[size:],
+        "mc_id_list": mc_id_list,
+        "job_id_list": job_id_list,
+        "text_list": text_list.tolist(),
+        "contents_columns": {
+            key: table[:, col] for col, key in enumerate(header)
+        },
+    }
+
+
+def read_columnar_schedule(proj_folder: str) -> Schedule:
+    """Reads a schedule of a project folder with the columnar backend
+    (see read_schedule)
+
+    Rows are grouped by machine with a stable sort, and overlaps are checked
+    with differences of the sorted columns; machines are then loaded
+    from the columns without creating Activity objects (contents of
+    activities and operations of jobs are created on their first access)
+
+    Args:
+        proj_folder (str): a project folder that contains metadata
+
+    Raises:
+        ValueError: an ac_type is not supported, an activity is out of
+            the horizon, or activities overlap
+        KeyError: an activity refers to a machine or a job not in info files
+
+    Returns:
+        Schedule: the schedule of the project
+    """
+    input_dict, ac_types, dt_parser = read_metadata(proj_folder)
+    mc_info_fname = input_dict["file_info"]["machine_info"]
+    job_info_fname = input_dict["file_info"]["job_info"]
+    columns = read_activity_columns(
+        os.path.join(proj_folder, input_dict["file_info"]["activity_info"]),
+        ac_types,
+    )
+    mc_codes = columns["mc_codes"]
+    type_codes = columns["type_codes"]
+    size = len(type_codes)
+
+    ### Find the horizon
+    moment_list = [dt_parser(text) for text in columns["text_list"]]
+    ac_interval: Optional[Interval] = None
+    if size > 0:
+        ac_interval = Interval(
+            min(
+                moment_list[code] for code in np.unique(columns["start_codes"])
+            ),
+            max(moment_list[code] for code in np.unique(columns["end_codes"])),
+        )
+    horizon = find_metadata_horizon(input_dict, dt_parser, ac_interval)
+
+    # ticks from the horizon start as in ColumnarMCSchedule
+    tick_table = np.array(
+        [(moment - horizon.start) // TICK for moment in moment_list],
+        dtype=np.int64,
+    )
+    starts = tick_table[columns["start_codes"]]
+    ends = tick_table[columns["end_codes"]]
+    horizon_end = (horizon.end - horizon.start) // TICK
+    invalid_rows = np.flatnonzero(
+        (starts > ends) | (starts < 0) | (ends > horizon_end)
+    )
+    if len(invalid_rows) > 0:
+        row = int(invalid_rows[0])
+        raise ValueError(
+            f"Activity ({columns['text_list'][columns['start_codes'][row]]}, "
+            f"{columns['text_list'][columns['end_codes'][row]]}) "
+            f"is not a valid interval in the horizon {horizon}"
+        )
+
+    ### Machines and jobs
+    if mc_info_fname != None:
+        mc_id_list, mc_contents = read_info_table(
+            os.path.join(proj_folder, mc_info_fname), "mc_id"
+        )
+    else:
+        mc_id_list = list(columns["mc_id_list"])
+        mc_contents = [{} for _ in mc_id_list]
+    mc_index_dict = {mc_id: idx for idx, mc_id in enumerate(mc_id_list)}
+    for mc_id in columns["mc_id_list"]:
+        if mc_id not in mc_index_dict:
+            raise KeyError(f"Machine {mc_id} does not exist")
+    mc_indices = np.array(
+        [mc_index_dict[mc_id] for mc_id in columns["mc_id_list"]],
+        dtype=np.int32,
+    )[mc_codes]
+
+    if job_info_fname != None:
+        job_id_list, job_contents = read_info_table(
+            os.path.join(proj_folder, job_info_fname), "job_id"
+        )
+    else:
+        job_id_list = list(columns["job_id_list"])
+        job_contents = [{} for _ in job_id_list]
+    job_index_dict = {job_id: idx for idx, job_id in enumerate(job_id_list)}
+    is_operation = type_codes == ac_types.all_types.index(ac_types.operation)
+    # breakdowns have no job (-1) regardless of their job_ids
+    job_indices = np.array(
+        [job_index_dict.get(job_id, -1) for job_id in columns["job_id_list"]],
+        dtype=np.int32,
+    )[columns["job_codes"]]
+    job_indices[~is_operation] = -1
+    missing_rows = np.flatnonzero(is_operation & (job_indices < 0))
+    if len(missing_rows) > 0:
+        job_code = columns["job_codes"][missing_rows[0]]
+        raise KeyError(
+            f"Job {columns['job_id_list'][job_code]} does not exist"
+        )
+
+    ### ac_ids as in Schedule.bulk_add: ac_type(mc_id-count) in the order of rows
+    # the sort is stable, so rows of a (machine, type) keep their order
+    group_order = np.lexsort((type_codes, mc_indices))
+    group_keys = mc_indices[group_order].astype(np.int64) * 256 + (
+        type_codes[group_order]
+    )
+    group_starts = np.flatnonzero(
+        np.concatenate(([True], group_keys[1:] != group_keys[:-1]))
+    )
+    group_sizes = np.diff(np.append(group_starts, size))
+    counts = np.empty(size, dtype=np.int64)
+    counts[group_order] = np.arange(1, size + 1) - np.repeat(
+        group_starts, group_sizes
+    )
+    all_types = ac_types.all_types
+    ac_id_list = [
+        f"{all_types[type_code]}({mc_id_list[mc_index]}-{count})"
+        for type_code, mc_index, count in zip(
+            type_codes.tolist(), mc_indices.tolist(), counts.tolist()
+        )
+    ]
+
+    ### Sort rows by machine and start, and check overlaps
+    # activities of duration 0 precede the one starting at the same time
+    row_order = np.lexsort((ends != starts, starts, mc_indices))
+    sorted_mc_indices = mc_indices[row_order]
+    sorted_starts = starts[row_order]
+    sorted_ends = ends[row_order]
+    # in a valid order, each row starts after the end of the previous row
+    # (so ends are sorted, and the previous end is the latest one)
+    overlaps = np.flatnonzero(
+        (sorted_mc_indices[1:] == sorted_mc_indices[:-1])
+        & (sorted_starts[1:] < sorted_ends[:-1])
+    )
+    if len(overlaps) > 0:
+        pos = int(overlaps[0])
+        raise ValueError(
+            f"{ac_id_list[row_order[pos + 1]]} overlaps "
+            f"{ac_id_list[row_order[pos]]} "
+            f"in Machine {mc_id_list[sorted_mc_indices[pos]]}"
+        )
+
+    ### States of machines (see ColumnarMCSchedule.get_state)
+    sorted_type_codes = type_codes[row_order]
+    sorted_job_indices = job_indices[row_order]
+    row_order_list = row_order.tolist()
+    contents_columns = columns["contents_columns"]
+    bounds = np.searchsorted(
+        sorted_mc_indices, np.arange(len(mc_id_list) + 1)
+    ).tolist()
+    mc_states: List[Tuple[Any, ...]] = []
+    for mc_index in range(len(mc_id_list)):
+        first, last = bounds[mc_index], bounds[mc_index + 1]
+        mc_type_codes = sorted_type_codes[first:last]
+        mc_job_indices = sorted_job_indices[first:last]
+        has_job = mc_job_indices >= 0
+        # job_ids of the machine, and indices into them
+        job_table, local_indices = np.unique(
+            mc_job_indices[has_job], return_inverse=True
+        )
+        local_job_indices = np.full(last - first, -1, dtype=np.int32)
+        local_job_indices[has_job] = local_indices
+        type_counts = np.bincount(mc_type_codes, minlength=len(all_types))
+        mc_states.append(
+            (
+                {
+                    ac_types.operation: int(
+                        type_counts[all_types.index(ac_types.operation)]
+                    ),
+                    ac_types.breakdown: int(
+                        type_counts[all_types.index(ac_types.breakdown)]
+                    ),
+                },
+                sorted_starts[first:last],
+                sorted_ends[first:last],
+                mc_type_codes,
+                local_job_indices,
+                [ac_id_list[row] for row in row_order_list[first:last]],
+                RowContents(
+                    last - first,
+                    partial(
+                        _row_contents, contents_columns, row_order[first:last]
+                    ),
+                ),
+                [job_id_list[job_index] for job_index in job_table.tolist()],
+            )
+        )
+
+    ### Operations of jobs in the order of rows
+    operation_rows = np.flatnonzero(is_operation)
+    operation_rows = operation_rows[
+        np.argsort(job_indices[operation_rows], kind="stable")
+    ]
+    # rows of operations on their machines
+    sorted_rows = np.empty(size, dtype=np.int64)
+    sorted_rows[row_order] = np.arange(size)
+    operation_mc_indices = mc_indices[operation_rows]
+    job_op_rows = (
+        sorted_rows[operation_rows]
+        - np.array(bounds, dtype=np.int64)[operation_mc_indices]
+    )
+    return Schedule.from_state(
+        {
+            "schedule_id": input_dict["schedule_name"],
+            "horizon": horizon.dt_range(),
+            "ac_types_param": ac_types,
+            "backend": "columnar",
+            "mc_id_list": mc_id_list,
+            "mc_contents": mc_contents,
+            "mc_states": mc_states,
+            "job_id_list": job_id_list,
+            "job_contents": job_contents,
+            "job_op_counts": np.bincount(
+                job_indices[operation_rows], minlength=len(job_id_list)
+            ).tolist(),
+            "job_op_mc_indices": operation_mc_indices.tolist(),
+            "job_op_ac_ids": None,
+            "job_op_rows": job_op_rows.tolist(),
+        }
+    )
+
+
+def _codes_of_first_appearance(
+    column: np.ndarray,
+) -> Tuple[np.ndarray, List[str]]:
+    # int32 codes of values, and the values in the order of their codes
+    value_list, first_rows, inverse = np.unique(
+        column, return_index=True, return_inverse=True
+    )
+    order = np.argsort(first_rows)
+    ranks = np.empty(len(order), dtype=np.int32)
+    ranks[order] = np.arange(len(order), dtype=np.int32)
+    return (ranks[inverse], value_list[order].tolist())
+
+
+def _row_contents(
+    contents_columns: Dict[str, np.ndarray], rows: np.ndarray, row: int
+) -> Dict[str, str]:
+    # non-empty values of rows[row] in the columns of the file
+    file_row = rows[row]
+    contents: Dict[str, str] = {}
+    for key, column in contents_columns.items():
+        value = str(column[file_row])
+        if value != "":
+            contents[key] = value
+    return contents
+
+
+def main():
+    from mstk.test import sample_proj_folder
+
+    sample_schedule = read_columnar_schedule(sample_proj_folder)
+    print(sample_schedule.backend, sample_schedule.horizon)
+    print("Finished reading a sample schedule")
+
+
+if __name__ == "__main__":
+    main()
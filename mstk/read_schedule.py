@@ -1,13 +1,192 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 
-import csv, json
+import csv, json, os, re
 from datetime import datetime
 from dateutil.parser import parse as dt_parse
 
 from mstk.schedule.ac_types import AcTypesParam
-from mstk.schedule.interval import Interval
+from mstk.schedule.interval import Interval, to_moment_array
 from mstk.schedule.schedule import Schedule
 
+# readers of activity files in read_schedule
+read_engines = ["python", "columnar"]
+
+
+class DatetimeParser:
+    """Parses date strings of a project with a memo cache
+
+    A format is either given (e.g. "%d/%m/%Y %H:%M") or detected from the
+    first distinct strings: a candidate format is taken only if it gives
+    the same datetime as dateutil for all of them. Strings are then parsed
+    with datetime.fromisoformat or datetime.strptime, and dateutil is used
+    only for strings not in the format (or if no format is found).
+    Only month-first candidates are tried, as dateutil reads "1/2/2020"
+    as January 2nd.
+    Formats of numbers only (%Y, %m, %d, %H, %M and %S) are matched
+    with a compiled regular expression instead of strptime
+    """
+
+    __slots__ = [
+        "__dt_format",
+        "__candidates",
+        "__detect_size",
+        "__n_detected",
+        "__cache",
+        "__cache_size",
+        "__pattern",
+        "__positions",
+    ]
+
+    ISO_FORMAT = "iso"
+    CANDIDATE_FORMATS = [
+        ISO_FORMAT,
+        "%m/%d/%Y %H:%M",
+        "%m/%d/%Y %H:%M:%S",
+        "%m/%d/%Y",
+        "%Y/%m/%d %H:%M",
+        "%Y/%m/%d %H:%M:%S",
+        "%Y/%m/%d",
+        "%m-%d-%Y %H:%M",
+        "%m-%d-%Y %H:%M:%S",
+    ]
+    # the same patterns as datetime.strptime
+    NUMBER_PATTERNS = {
+        "Y": r"(\d\d\d\d)",
+        "m": r"(1[0-2]|0[1-9]|[1-9])",
+        "d": r"(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])",
+        "H": r"(2[0-3]|[0-1]\d|\d)",
+        "M": r"([0-5]\d|\d)",
+        "S": r"(6[0-1]|[0-5]\d|\d)",
+    }
+
+    def __init__(
+        self,
+        dt_format: Optional[str] = None,
+        detect_size: int = 8,
+        cache_size: int = 1 << 16,
+    ):
+        """
+        Args:
+            dt_format (Optional[str], optional): a format of datetime.strptime
+                ("iso" for datetime.fromisoformat); detected if None.
+            detect_size (int, optional): the number of distinct strings
+                to detect a format. Defaults to 8.
+            cache_size (int, optional): the maximum number of cached strings
+                (the cache is cleared when full). Defaults to 65536.
+        """
+        self.__dt_format: Optional[str] = None
+        # a compiled format, and positions of (Y, m, d, H, M, S) in its groups
+        self.__pattern: Optional[re.Pattern] = None
+        self.__positions: List[int] = []
+        if dt_format != None:
+            self.__set_format(dt_format)
+        self.__candidates: List[str] = (
+            [] if dt_format != None else list(self.CANDIDATE_FORMATS)
+        )
+        self.__detect_size: int = detect_size
+        self.__n_detected: int = 0
+        self.__cache: Dict[str, datetime] = {}
+        self.__cache_size: int = cache_size
+
+    @property
+    def dt_format(self) -> Optional[str]:
+        """The format in use (None while detecting or if no format is found)"""
+        return self.__dt_format
+
+    def __call__(self, text: str) -> datetime:
+        """
+        Args:
+            text (str): a date string
+
+        Raises:
+            ValueError: the string is not a date (raised by dateutil)
+
+        Returns:
+            datetime
+        """
+        cache = self.__cache
+        value = cache.get(text)
+        if value is None:
+            if self.__candidates:
+                value = self.__detect(text)
+            elif self.__pattern is not None:
+                match = self.__pattern.fullmatch(text)
+                if match is None:
+                    value = dt_parse(text)
+                else:
+                    groups = match.groups()
+                    try:
+                        value = datetime(
+                            *[
+                                int(groups[position]) if position >= 0 else 0
+                                for position in self.__positions
+                            ]
+                        )
+                    except ValueError:
+                        value = dt_parse(text)
+            elif self.__dt_format != None:
+                try:
+                    value = self.__parse_with(self.__dt_format, text)
+                except ValueError:
+                    value = dt_parse(text)
+            else:
+                value = dt_parse(text)
+            if len(cache) >= self.__cache_size:
+                cache.clear()
+            cache[text] = value
+        return value
+
+    def __detect(self, text: str) -> datetime:
+        # keeps candidates agreeing with dateutil on the first strings
+        value = dt_parse(text)
+        candidates = []
+        for dt_format in self.__candidates:
+            try:
+                if self.__parse_with(dt_format, text) == value:
+                    candidates.append(dt_format)
+            except ValueError:
+                pass
+        self.__candidates = candidates
+        self.__n_detected += 1
+        if self.__n_detected >= self.__detect_size and candidates:
+            self.__set_format(candidates[0])
+            self.__candidates = []
+        return value
+
+    def __set_format(self, dt_format: str):
+        self.__dt_format = dt_format
+        self.__pattern = None
+        # directives and the other parts of the format
+        parts = re.split(r"(%.)", dt_format)
+        directives = parts[1::2]
+        if not all(
+            directive[1] in self.NUMBER_PATTERNS for directive in directives
+        ) or not all(key in dt_format for key in ["%Y", "%m", "%d"]):
+            return
+        pattern = ""
+        for idx, part in enumerate(parts):
+            if idx % 2 == 1:
+                pattern += self.NUMBER_PATTERNS[part[1]]
+            else:
+                # as in strptime, whitespace matches any whitespace
+                pattern += r"\s+".join(
+                    re.escape(chunk) for chunk in re.split(r"\s+", part)
+                )
+        keys = [directive[1] for directive in directives]
+        if len(set(keys)) != len(keys):
+            return
+        self.__pattern = re.compile(pattern)
+        self.__positions = [
+            keys.index(key) if key in keys else -1
+            for key in ["Y", "m", "d", "H", "M", "S"]
+        ]
+
+    @classmethod
+    def __parse_with(cls, dt_format: str, text: str) -> datetime:
+        if dt_format == cls.ISO_FORMAT:
+            return datetime.fromisoformat(text)
+        return datetime.strptime(text, dt_format)
+
 
 def read_machine_info(fname: str, schedule: Schedule):
     """Reads machine information
@@ -44,6 +223,7 @@ def find_horizon(
     fname: str,
     horizon_start: Optional[datetime],
     horizon_end: Optional[datetime],
+    dt_parser: Optional[DatetimeParser] = None,
 ):
     """Detects the earliest and the latest moment in the activity info
     if explicit start or end is not given
@@ -52,6 +232,7 @@ def find_horizon(
         fname (str): the file path
         horizon_start (Optional[datetime]): the start of a horizon (if None, find the earliest moment of activities)
         horizon_end (Optional[datetime]): the end of a horizon (if None, find the latest moment of activities)
+        dt_parser (Optional[DatetimeParser], optional): a parser of date strings (detects a format if None)
 
     Returns:
         Interval: a (compact) horizon of activities
@@ -64,12 +245,14 @@ def find_horizon(
     else:
         min_horizon_start = datetime.max
         max_horizon_end = datetime.min
+        if dt_parser == None:
+            dt_parser = DatetimeParser()
 
         with open(fname, "r", encoding="utf-8") as file_data:
             ac_info_dict = csv.DictReader(file_data)
             for contents in ac_info_dict:
-                start = dt_parse(contents["start"])
-                end = dt_parse(contents["end"])
+                start = dt_parser(contents["start"])
+                end = dt_parser(contents["end"])
                 if (horizon_start == None) and (start < min_horizon_start):
                     min_horizon_start = start
                 if (horizon_end == None) and (end > max_horizon_end):
@@ -83,43 +266,298 @@ def find_horizon(
         return interval
 
 
-def read_schedule(proj_folder: str):
-    """[summary]
+def read_activity_info(
+    fname: str,
+    ac_types: AcTypesParam,
+    dt_parser: Optional[DatetimeParser] = None,
+) -> Tuple[
+    List[Tuple[str, str, str, datetime, datetime, Dict[str, str]]],
+    Optional[Interval],
+]:
+    """Reads and parses activity information in a single pass
 
     Args:
-        proj_folder (str): a project folder that contains metadata
+        fname (str): the file path
+        ac_types (AcTypesParam): a container of ac types
+        dt_parser (Optional[DatetimeParser], optional): a parser of date strings (detects a format if None)
 
     Raises:
-        ValueError: [description]
+        ValueError: an ac_type is neither an operation nor a breakdown
 
     Returns:
-        [type]: [description]
+        Tuple[List[Tuple[str, str, str, datetime, datetime, Dict[str, str]]], Optional[Interval]]:
+            (mc_id, ac_type, job_id, start, end, contents) of activities in the order of the file,
+            and the interval from the earliest start to the latest end (None if no activities)
     """
+    ac_type_list = [ac_types.operation, ac_types.breakdown]
+    ac_row_list: List[
+        Tuple[str, str, str, datetime, datetime, Dict[str, str]]
+    ] = []
+    min_start = datetime.max
+    max_end = datetime.min
+    if dt_parser == None:
+        dt_parser = DatetimeParser()
+    with open(fname, "r", encoding="utf-8") as file_data:
+        ac_info_dict = csv.DictReader(file_data)
+        for contents in ac_info_dict:
+            ac_type = contents["ac_type"]
+            if ac_type not in ac_type_list:
+                raise ValueError(f"ac_type [{ac_type}] is not supported")
+            start = dt_parser(contents["start"])
+            end = dt_parser(contents["end"])
+            if start < min_start:
+                min_start = start
+            if end > max_end:
+                max_end = end
+            ac_row_list.append(
+                (
+                    contents["mc_id"],
+                    ac_type,
+                    contents["job_id"],
+                    start,
+                    end,
+                    {
+                        key: value
+                        for key, value in contents.items()
+                        if value != ""
+                    },
+                )
+            )
+    if not ac_row_list:
+        return (ac_row_list, None)
+    return (ac_row_list, Interval(min_start, max_end))
+
+
+def iter_activity_rows(
+    proj_folder: str,
+    chunk_size: int = 4096,
+    mc_id_list: Optional[List[str]] = None,
+    job_id_list: Optional[List[str]] = None,
+    types: Optional[List[str]] = None,
+    window: Optional[Interval] = None,
+    as_array: bool = False,
+) -> Iterator[Any]:
+    """Yields activities of a project in chunks without building a schedule,
+    so that only a chunk of rows is kept in memory
+
+    Rows are filtered by machines, jobs and ac_types before their dates are
+    parsed, and the end of a row is not parsed if it starts after window
 
+    Args:
+        proj_folder (str): a project folder that contains metadata
+        chunk_size (int, optional): the maximum number of rows in a chunk.
+            Defaults to 4096.
+        mc_id_list (Optional[List[str]], optional): machines to be yielded
+            (if None, all machines)
+        job_id_list (Optional[List[str]], optional): jobs to be yielded
+            (if None, all jobs and breakdowns)
+        types (Optional[List[str]], optional): ac_types to be yielded
+            (if None, operations and breakdowns)
+        window (Optional[Interval], optional): a window of datetimes; only
+            activities not distinct from window are yielded (if None, all)
+        as_array (bool, optional): if True, chunks are NumPy record arrays
+            of fields mc_id, ac_type, job_id, start, end (datetime64[us],
+            in UTC for timezone-aware dates) and contents. Defaults to False.
+
+    Raises:
+        ValueError: an ac_type is neither an operation nor a breakdown
+
+    Yields:
+        Iterator[Any]: lists of (mc_id, ac_type, job_id, start, end, contents)
+            in the order of the file as read_activity_info, or record arrays
+    """
+    input_dict, ac_types, dt_parser = read_metadata(proj_folder)
+    ac_type_list = [ac_types.operation, ac_types.breakdown]
+    mc_id_set = None if mc_id_list == None else set(mc_id_list)
+    job_id_set = None if job_id_list == None else set(job_id_list)
+    type_set = set(ac_type_list) if types == None else set(types)
+    if as_array:
+        # NumPy is required only for record arrays
+        import numpy as np
+
+    def to_chunk(ac_row_list: List[Tuple]) -> Any:
+        if not as_array:
+            return ac_row_list
+        columns = list(zip(*ac_row_list))
+        contents_array = np.empty(len(ac_row_list), dtype=object)
+        contents_array[:] = columns[5]
+        return np.rec.fromarrays(
+            [
+                np.array(columns[0], dtype=np.str_),
+                np.array(columns[1], dtype=np.str_),
+                np.array(columns[2], dtype=np.str_),
+                to_moment_array(columns[3]),
+                to_moment_array(columns[4]),
+                contents_array,
+            ],
+            names=["mc_id", "ac_type", "job_id", "start", "end", "contents"],
+        )
+
+    ac_row_list: List[
+        Tuple[str, str, str, datetime, datetime, Dict[str, str]]
+    ] = []
     with open(
-        proj_folder + "\\schedule_metadata.json", "r", encoding="utf-8"
+        os.path.join(proj_folder, input_dict["file_info"]["activity_info"]),
+        "r",
+        encoding="utf-8",
+    ) as file_data:
+        reader = csv.reader(file_data)
+        header = next(reader, [])
+        mc_col = header.index("mc_id")
+        type_col = header.index("ac_type")
+        job_col = header.index("job_id")
+        start_col = header.index("start")
+        end_col = header.index("end")
+        for row in reader:
+            if not row:
+                # blank lines are skipped as in csv.DictReader
+                continue
+            ac_type = row[type_col]
+            if ac_type not in ac_type_list:
+                raise ValueError(f"ac_type [{ac_type}] is not supported")
+            if ac_type not in type_set:
+                continue
+            mc_id = row[mc_col]
+            if mc_id_set != None and mc_id not in mc_id_set:
+                continue
+            job_id = row[job_col]
+            if job_id_set != None and job_id not in job_id_set:
+                continue
+            start = dt_parser(row[start_col])
+            if window != None and window.end <= start:
+                continue
+            end = dt_parser(row[end_col])
+            if window != None and end <= window.start:
+                continue
+            ac_row_list.append(
+                (
+                    mc_id,
+                    ac_type,
+                    job_id,
+                    start,
+                    end,
+                    {
+                        key: value
+                        for key, value in zip(header, row)
+                        if value != ""
+                    },
+                )
+            )
+            if len(ac_row_list) >= chunk_size:
+                yield to_chunk(ac_row_list)
+                ac_row_list = []
+    if ac_row_list:
+        yield to_chunk(ac_row_list)
+
+
+def read_metadata(
+    proj_folder: str,
+) -> Tuple[Dict[str, Any], AcTypesParam, DatetimeParser]:
+    """Reads schedule_metadata.json and the ac types of a project
+
+    Args:
+        proj_folder (str): a project folder that contains metadata
+
+    Returns:
+        Tuple[Dict[str, Any], AcTypesParam, DatetimeParser]: the metadata,
+            ac types, and a parser of date strings
+    """
+    with open(
+        os.path.join(proj_folder, "schedule_metadata.json"),
+        "r",
+        encoding="utf-8",
     ) as file_data:
         input_dict = json.load(file_data)
 
-    mc_info_fname = input_dict["file_info"]["machine_info"]
-    job_info_fname = input_dict["file_info"]["job_info"]
-    ac_info_full_name = (
-        proj_folder + "\\" + input_dict["file_info"]["activity_info"]
-    )
+    if input_dict["file_info"]["ac_types_info"] == None:
+        ac_types = AcTypesParam()
+    else:
+        ac_types = AcTypesParam(
+            filename=os.path.join(
+                proj_folder, input_dict["file_info"]["ac_types_info"]
+            )
+        )
+
+    # an optional strptime format of all date strings (detected if absent)
+    dt_parser = DatetimeParser(input_dict.get("datetime_format"))
+    return (input_dict, ac_types, dt_parser)
+
+
+def find_metadata_horizon(
+    input_dict: Dict[str, Any],
+    dt_parser: DatetimeParser,
+    ac_interval: Optional[Interval],
+) -> Interval:
+    """Returns the horizon of metadata; an open start or end is taken
+    from the interval of activities
+
+    Args:
+        input_dict (Dict[str, Any]): the metadata
+        dt_parser (DatetimeParser): a parser of date strings
+        ac_interval (Optional[Interval]): the interval from the earliest start
+            to the latest end of activities (None if no activities)
+
+    Returns:
+        Interval: the horizon
+    """
     horizon_start: Optional[datetime] = None
     if input_dict["horizon"]["start"] != None:
-        horizon_start = dt_parse(input_dict["horizon"]["start"])
+        horizon_start = dt_parser(input_dict["horizon"]["start"])
+    elif ac_interval != None:
+        horizon_start = ac_interval.start
+    else:
+        horizon_start = datetime.max
 
     horizon_end: Optional[datetime] = None
     if input_dict["horizon"]["end"] != None:
-        horizon_end = dt_parse(input_dict["horizon"]["end"])
+        horizon_end = dt_parser(input_dict["horizon"]["end"])
+    elif ac_interval != None:
+        horizon_end = ac_interval.end
+    else:
+        horizon_end = datetime.min
 
-    horizon = find_horizon(ac_info_full_name, horizon_start, horizon_end)
+    return Interval(horizon_start, horizon_end)
 
-    if input_dict["file_info"]["ac_types_info"] == None:
-        ac_types = AcTypesParam()
-    else:
-        ac_types = AcTypesParam(filename=proj_folder + "\\ac_types.json")
+
+def read_schedule(proj_folder: str, engine: str = "python") -> Schedule:
+    """Reads a schedule of a project folder
+
+    Args:
+        proj_folder (str): a project folder that contains metadata
+        engine (str, optional): a reader, one of read_engines. "columnar"
+            reads the files into NumPy arrays, and returns a schedule of
+            the columnar backend. Defaults to "python".
+
+    Raises:
+        ValueError: **engine** is not valid, an ac_type is not supported,
+            or activities overlap
+        KeyError: an activity refers to a machine or a job not in info files
+
+    Returns:
+        Schedule: the schedule of the project
+    """
+    if engine == "columnar":
+        # NumPy is required only for the columnar engine
+        from mstk.read_columnar import read_columnar_schedule
+
+        return read_columnar_schedule(proj_folder)
+    elif engine != "python":
+        raise ValueError(
+            f"engine {engine} is invalid -- try one of {read_engines}"
+        )
+
+    input_dict, ac_types, dt_parser = read_metadata(proj_folder)
+    mc_info_fname = input_dict["file_info"]["machine_info"]
+    job_info_fname = input_dict["file_info"]["job_info"]
+    ac_info_full_name = os.path.join(
+        proj_folder, input_dict["file_info"]["activity_info"]
+    )
+
+    # the activity file is read once; the horizon is derived from the rows
+    ac_row_list, ac_interval = read_activity_info(
+        ac_info_full_name, ac_types, dt_parser
+    )
+    horizon = find_metadata_horizon(input_dict, dt_parser, ac_interval)
 
     schedule: Schedule = Schedule(
         input_dict["schedule_name"], horizon, ac_types
@@ -127,46 +565,34 @@ def read_schedule(proj_folder: str):
 
     ### Add machines
     if mc_info_fname != None:
-        fname = proj_folder + "\\" + mc_info_fname
+        fname = os.path.join(proj_folder, mc_info_fname)
         read_machine_info(fname, schedule)
-    else:
-        mc_id_dict: Dict[str, bool] = {}
 
     ### Add jobs
     if job_info_fname != None:
-        fname = proj_folder + "\\" + job_info_fname
+        fname = os.path.join(proj_folder, job_info_fname)
         read_job_info(fname, schedule)
-    else:
-        job_id_dict: Dict[str, bool] = {}
+
+    # machines and jobs without info files are added in the order of rows
+    for mc_id, _, job_id, _, _, _ in ac_row_list:
+        if mc_info_fname == None and mc_id not in schedule.mc_dict:
+            schedule.add_machine(mc_id)
+        if job_info_fname == None and job_id not in schedule.job_dict:
+            schedule.add_job(job_id)
 
     ### Add activities
-    with open(ac_info_full_name, "r", encoding="utf-8") as file_data:
-        ac_info_dict = csv.DictReader(file_data)
-        for contents in ac_info_dict:
-            mc_id = contents["mc_id"]
-            ac_type = contents["ac_type"]
-            job_id = contents["job_id"]
-            start = dt_parse(contents["start"])
-            end = dt_parse(contents["end"])
-
-            if mc_info_fname == None:
-                if mc_id not in mc_id_dict:
-                    schedule.add_machine(mc_id)
-                    mc_id_dict[mc_id] = True
-            if job_info_fname == None:
-                if job_id not in job_id_dict:
-                    schedule.add_job(job_id)
-                    job_id_dict[job_id] = True
-
-            if ac_type == ac_types.operation:
-                ac = schedule.add_operation(mc_id, job_id, start, end)
-            elif ac_type == ac_types.breakdown:
-                ac = schedule.add_breakdown(mc_id, start, end)
-            else:
-                raise ValueError(f"ac_type [{ac_type}] is not supported")
-            for key, value in contents.items():
-                if value != "":
-                    ac.add_contents(key, value)
+    # activities are sorted and added to each machine at once
+    schedule.bulk_add(
+        {
+            "mc_id": mc_id,
+            "ac_type": ac_type,
+            "job_id": job_id,
+            "start": start,
+            "end": end,
+            "contents": contents,
+        }
+        for mc_id, ac_type, job_id, start, end, contents in ac_row_list
+    )
     return schedule
 
 
@@ -176,6 +602,12 @@ def main():
     sample_schedule = read_schedule(sample_proj_folder)
     print("Finished reading a sample schedule")
 
+    n_rows = sum(
+        len(ac_row_list)
+        for ac_row_list in iter_activity_rows(sample_proj_folder, 100)
+    )
+    print(f"Iterated {n_rows} activity rows of the sample schedule")
+
 
 if __name__ == "__main__":
     main()
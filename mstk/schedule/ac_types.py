@@ -5,7 +5,7 @@ Created at 10th Aug. 2020
 __all__ = ["AcTypesParam"]
 
 import json
-from typing import List
+from typing import List, Dict
 import os
 
 current_path = os.path.dirname(os.path.abspath(__file__))
@@ -32,14 +32,47 @@ class AcTypesParam:
         encoding: str = "utf-8",
         filename: str = f"{current_path}/ac_types.json",
     ):
-        self.all_types: List[str] = list()
         with open(filename, encoding=encoding) as file_data:
             input_dict = json.load(file_data)
-            for key, value in input_dict.items():
-                if key == "_comment":
-                    continue
-                self.all_types.append(value)
-                self.__dict__[key] = value
+        self.__load_dict(input_dict)
+
+    @classmethod
+    def from_dict(cls, input_dict: Dict[str, str]) -> "AcTypesParam":
+        """Creates a container from a dictionary in the format of .json files
+
+        Args:
+            input_dict (Dict[str, str]): prefixes of activity types by key
+                (_comment is ignored)
+
+        Raises:
+            ValueError: 'idle' is not in the keys
+
+        Returns:
+            AcTypesParam: the created container
+        """
+        ac_types_param = cls.__new__(cls)
+        ac_types_param.__load_dict(input_dict)
+        return ac_types_param
+
+    def to_dict(self) -> Dict[str, str]:
+        """Returns the types in the format of .json files
+
+        Returns:
+            Dict[str, str]: prefixes of activity types by key (without _comment)
+        """
+        return {
+            key: value
+            for key, value in self.__dict__.items()
+            if key != "all_types"
+        }
+
+    def __load_dict(self, input_dict: Dict[str, str]):
+        self.all_types: List[str] = list()
+        for key, value in input_dict.items():
+            if key == "_comment":
+                continue
+            self.all_types.append(value)
+            self.__dict__[key] = value
         if "idle" not in self.__dict__:
             raise ValueError("Type 'idle' and its display prefix should exist")
 
@@ -1,7 +1,7 @@
 """ Interval by datetime class definition
 Created on 8th Aug. 2020
 """
-from typing import TYPE_CHECKING, Dict, Any, Tuple, Callable
+from typing import TYPE_CHECKING, Dict, Any, Tuple, Callable, Optional
 
 import datetime as dt
 
@@ -37,13 +37,14 @@ class Activity:
         ac_id: str,
         interval: Interval,
         ac_types_param: AcTypesParam,
+        contents: Optional[Dict[str, Any]] = None,
     ):
         self.__ac_id: str = ac_id
         self.__ac_types_param = ac_types_param
 
         self.__ac_type: str = ac_types_param.activity
         self.__interval: Interval = interval
-        self.__contents: Dict[str, Any] = {}
+        self.__contents: Dict[str, Any] = {} if contents is None else contents
 
     @property
     def ac_id(self) -> str:
@@ -68,6 +69,33 @@ class Activity:
     def __repr__(self) -> str:
         return f"{self.ac_type}({self.__ac_id}): {self.interval}"
 
+    def __reduce__(self):
+        # an activity on a machine is pickled with the machine
+        # (see Machine.__reduce__) and restored by MCSchedule.restore_ac,
+        # so that its job and other activities are not pickled recursively
+        mc = getattr(self, "mc", None)
+        if mc is None:
+            return (
+                type(self),
+                (
+                    self.__ac_id,
+                    self.__interval,
+                    self.__ac_types_param,
+                    self.__contents,
+                ),
+            )
+        job = getattr(self, "job", None)
+        return (
+            mc.mc_schedule.restore_ac,
+            (
+                self.ac_type,
+                self.__ac_id,
+                self.__interval,
+                None if job is None else job.job_id,
+                self.__contents,
+            ),
+        )
+
     def includes(self, moment: dt.datetime) -> bool:
         """Checks whether the activity contains {moment}
 
@@ -135,8 +163,9 @@ class Idle(Activity):
         interval: Interval,
         mc: "Machine",
         ac_types_param: AcTypesParam,
+        contents: Optional[Dict[str, Any]] = None,
     ):
-        super().__init__(ac_id, interval, ac_types_param)
+        super().__init__(ac_id, interval, ac_types_param, contents)
         self.__ac_type = ac_types_param.idle
         self.__mc = mc
 
@@ -160,8 +189,9 @@ class Breakdown(Activity):
         interval: Interval,
         mc: "Machine",
         ac_types_param: AcTypesParam,
+        contents: Optional[Dict[str, Any]] = None,
     ):
-        super().__init__(ac_id, interval, ac_types_param)
+        super().__init__(ac_id, interval, ac_types_param, contents)
         self.__ac_type = ac_types_param.breakdown
         self.__mc = mc
 
@@ -186,9 +216,10 @@ class Operation(Activity):
         mc: "Machine",
         job: "Job",
         ac_types_param: AcTypesParam,
+        contents: Optional[Dict[str, Any]] = None,
     ):
 
-        super().__init__(ac_id, interval, ac_types_param)
+        super().__init__(ac_id, interval, ac_types_param, contents)
         self.__ac_type = ac_types_param.operation
         self.__mc = mc
         self.__job = job
@@ -0,0 +1,1619 @@
+""" Columnar machine schedule backed by NumPy arrays
+Created on 17th Oct. 2026
+"""
+from __future__ import annotations
+
+__all__ = [
+    "ColumnarMCSchedule",
+    "ColumnarAcList",
+    "RowContents",
+    "ColumnSlice",
+]
+
+# common Python packages
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    Any,
+    Iterator,
+    Union,
+    Optional,
+    Callable,
+)
+
+import datetime as dt
+import warnings
+
+import numpy as np
+
+# defined packages
+from mstk.schedule import to_dt
+from mstk.schedule.interval import Interval, to_moment_array
+from mstk.schedule.activity import Activity, Idle, Operation, Breakdown
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.machine import Machine, MCSchedule
+from mstk.schedule.job import Job
+
+# a time unit of the start and end columns
+TICK = dt.timedelta(microseconds=1)
+# the number of rows converted at once when activities are iterated
+ROW_CHUNK_SIZE = 256
+
+
+class ColumnarMCSchedule(MCSchedule):
+    """A schedule on a machine that stores activities in NumPy columns
+
+    Operations and breakdowns are stored as rows sorted by start time:
+
+    - starts, ends: int64 ticks from the horizon start (microseconds,
+      or ticks of to_dt.Moment if the horizon is on Moments)
+    - type_codes: int8 index of the type in ac_types_param.all_types
+    - job_indices: int32 index of the job in job_list (-1 for no job)
+
+    Ids and contents are kept in lists aligned with the rows
+    (contents may be a RowContents until the rows change).
+    Idle activities are not stored; they are the gaps between rows.
+
+    Warning:
+        Activity instances are created whenever they are iterated,
+        so changes on their intervals are not reflected to the schedule
+        (contents are shared with the stored rows)
+    """
+
+    def __init__(
+        self,
+        mc_id: str,
+        mc: Machine,
+        horizon: Interval,
+        ac_types_param: AcTypesParam,
+    ):
+        self.__type_code_dict: Dict[str, int] = {
+            ac_type: code
+            for code, ac_type in enumerate(ac_types_param.all_types)
+        }
+        # the tick of the horizon start if the horizon is on Moments
+        self.__origin: Optional[int] = (
+            int(horizon.start)
+            if isinstance(horizon.start, to_dt.Moment)
+            else None
+        )
+        super().__init__(mc_id, mc, horizon, ac_types_param)
+
+    @property
+    def ac_id_list(self) -> List[str]:
+        """A list of ac_ids in the order of time (including idle gaps)
+
+        Warning:
+            Unlike the view of MCSchedule, the list is built on every call
+            since the ac_ids of gaps are derived; use ac_iter to traverse
+            activities
+        """
+        return [ac.ac_id for ac in self.ac_iter()]
+
+    @property
+    def ac_list(self) -> ColumnarAcList:
+        """A read-only view of the rows with the lookups of SortedAcList
+        (operations and breakdowns only, as in ImplicitIdleMCSchedule)"""
+        return ColumnarAcList(self)
+
+    @property
+    def ac_dict(self) -> Dict[str, Activity]:
+        """A dictionary of activities created on demand
+
+        Warning:
+            The dictionary is built on every call
+        """
+        return {ac.ac_id: ac for ac in self.ac_iter()}
+
+    @property
+    def ac_counts(self) -> Dict[str, int]:
+        """A copy of the counts of rows for each type
+        with the count of idle gaps (kept up to date on every change)"""
+        if self.__gap_count is None:
+            self.__gap_count = len(self.__gap_rows())
+        ac_counts = dict(super().ac_counts)
+        ac_counts[self.ac_types_param.idle] = self.__gap_count
+        return ac_counts
+
+    @property
+    def size(self) -> int:
+        """The number of stored rows"""
+        return self.__size
+
+    @property
+    def starts(self) -> np.ndarray:
+        """A read-only int64 array of start ticks"""
+        return self.__column_view(self.__starts)
+
+    @property
+    def ends(self) -> np.ndarray:
+        """A read-only int64 array of end ticks"""
+        return self.__column_view(self.__ends)
+
+    @property
+    def type_codes(self) -> np.ndarray:
+        """A read-only int8 array of type codes"""
+        return self.__column_view(self.__type_codes)
+
+    @property
+    def job_indices(self) -> np.ndarray:
+        """A read-only int32 array of indices of job_list"""
+        return self.__column_view(self.__job_indices)
+
+    @property
+    def job_list(self) -> List["Job"]:
+        return self.__job_list
+
+    def initialize_idle(self):
+        """Initialize ColumnarMCSchedule with empty columns"""
+        capacity = 16
+        self.__size: int = 0
+        self.__starts: np.ndarray = np.empty(capacity, dtype=np.int64)
+        self.__ends: np.ndarray = np.empty(capacity, dtype=np.int64)
+        self.__type_codes: np.ndarray = np.empty(capacity, dtype=np.int8)
+        self.__job_indices: np.ndarray = np.empty(capacity, dtype=np.int32)
+        self.__ac_ids: List[str] = []
+        self.__contents: List[Dict[str, Any]] = []
+        self.__job_list: List["Job"] = []
+        self.__job_index_dict: Dict[str, int] = {}
+        # jobs whose operations on this machine are rows not created yet
+        self.__deferred_jobs: List["Job"] = []
+        # the number of idle gaps, counted on the first access of ac_counts
+        self.__gap_count: Optional[int] = None
+        self.reset_gap_index()
+
+        for ac_type in self.ac_types_param.all_types:
+            super().ac_counts[ac_type] = 0
+            self.ac_cum_counts[ac_type] = 0
+        self.ac_cum_counts[self.ac_types_param.idle] = 1
+
+    def defer_job(self, job: "Job"):
+        """Registers a job whose operations refer to rows of this machine
+        without being created (see Job.defer_operations); the operations
+        are created before the rows change
+
+        Args:
+            job (Job): a job with deferred operations
+        """
+        self.__deferred_jobs.append(job)
+
+    def type_code(self, ac_type: str) -> int:
+        """Returns the code of ac_type used in type_codes
+
+        Args:
+            ac_type (str): an ac_type value
+
+        Raises:
+            KeyError: ac_type is not supported
+
+        Returns:
+            int: the type code
+        """
+        return self.__type_code_dict[ac_type]
+
+    def moment_to_tick(self, moment: dt.datetime) -> int:
+        """Converts a moment to ticks from the horizon start
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            int: ticks from the horizon start
+        """
+        if self.__origin is not None:
+            return int(moment) - self.__origin
+        return (to_dt.to_dt_datetime(moment) - self.horizon.start) // TICK
+
+    def tick_to_moment(self, tick: int) -> dt.datetime:
+        """Converts ticks from the horizon start to a moment
+
+        Args:
+            tick (int): ticks from the horizon start
+
+        Returns:
+            datetime.datetime: (a Moment if the horizon is on Moments)
+        """
+        if self.__origin is not None:
+            return to_dt.Moment(self.__origin + int(tick))
+        return self.horizon.start + dt.timedelta(microseconds=int(tick))
+
+    def start_datetime64(self) -> np.ndarray:
+        """Returns the start times of rows in datetime64[us]
+        (in UTC for a timezone-aware horizon)"""
+        return self.__to_datetime64(self.starts)
+
+    def end_datetime64(self) -> np.ndarray:
+        """Returns the end times of rows in datetime64[us]
+        (in UTC for a timezone-aware horizon)"""
+        return self.__to_datetime64(self.ends)
+
+    def type_mask(self, ac_type: str) -> np.ndarray:
+        """Returns a boolean array of rows of ac_type
+
+        Args:
+            ac_type (str): an ac_type value
+
+        Returns:
+            np.ndarray: True for the rows of ac_type
+        """
+        return self.type_codes == self.type_code(ac_type)
+
+    def make_ac(self, row: int) -> Union[Operation, Breakdown]:
+        """Creates an Activity instance of a row
+
+        Args:
+            row (int): an index of the rows
+
+        Returns:
+            Union[Operation, Breakdown]: the created activity
+        """
+        ac_type = self.ac_types_param.all_types[self.__type_codes[row]]
+        interval = Interval(
+            self.tick_to_moment(self.__starts[row]),
+            self.tick_to_moment(self.__ends[row]),
+        )
+        if ac_type == self.ac_types_param.operation:
+            return Operation(
+                self.__ac_ids[row],
+                interval,
+                self.mc,
+                self.__job_list[self.__job_indices[row]],
+                self.ac_types_param,
+                self.__contents[row],
+            )
+        return Breakdown(
+            self.__ac_ids[row],
+            interval,
+            self.mc,
+            self.ac_types_param,
+            self.__contents[row],
+        )
+
+    def make_acs(self, rows: List[int]) -> List[Union[Operation, Breakdown]]:
+        """Creates Activity instances of rows as make_ac,
+        converting their start and end times at once
+
+        Args:
+            rows (List[int]): indices of the rows
+
+        Returns:
+            List[Union[Operation, Breakdown]]: the created activities
+        """
+        all_types = self.ac_types_param.all_types
+        operation_type = self.ac_types_param.operation
+        starts = self.__moments_of_ticks(self.__starts[rows])
+        ends = self.__moments_of_ticks(self.__ends[rows])
+        ac_list: List[Union[Operation, Breakdown]] = []
+        for row, type_code, job_index, start, end in zip(
+            rows,
+            self.__type_codes[rows].tolist(),
+            self.__job_indices[rows].tolist(),
+            starts,
+            ends,
+        ):
+            if all_types[type_code] == operation_type:
+                ac_list.append(
+                    Operation(
+                        self.__ac_ids[row],
+                        Interval(start, end),
+                        self.mc,
+                        self.__job_list[job_index],
+                        self.ac_types_param,
+                        self.__contents[row],
+                    )
+                )
+            else:
+                ac_list.append(
+                    Breakdown(
+                        self.__ac_ids[row],
+                        Interval(start, end),
+                        self.mc,
+                        self.ac_types_param,
+                        self.__contents[row],
+                    )
+                )
+        return ac_list
+
+    def make_idle(self, row: int) -> Idle:
+        """Creates an Idle instance of the gap right before a row
+
+        Args:
+            row (int): an index of the rows (size for the last gap)
+
+        Returns:
+            Idle: the created activity
+        """
+        start, end = self.__gap_before(row)
+        gap_start = self.tick_to_moment(start)
+        return Idle(
+            self.make_ac_id_for_gap(gap_start),
+            Interval(gap_start, self.tick_to_moment(end)),
+            self.mc,
+            self.ac_types_param,
+        )
+
+    def insert_ac(self, ac: Activity):
+        """Stores an activity without checking the occupation of its interval
+        (ac_cum_counts is not changed; idle activities are ignored)
+
+        Args:
+            ac (Activity): an activity to be stored
+        """
+        if ac.ac_type == self.ac_types_param.idle:
+            return
+        if not isinstance(ac, (Operation, Breakdown)):
+            raise TypeError(f"{ac} cannot be stored in ColumnarMCSchedule")
+        start = self.moment_to_tick(ac.interval.start)
+        end = self.moment_to_tick(ac.interval.end)
+        if isinstance(ac, Operation):
+            job_index = self.__job_index(ac.job)
+        else:
+            job_index = -1
+        self.__insert_rows(
+            self.__first_row_ending_after(start),
+            [start],
+            [end],
+            [self.type_code(ac.ac_type)],
+            [job_index],
+            [ac.ac_id],
+            [ac.contents],
+        )
+
+    def remove_ac(self, ac: Activity):
+        """Removes a stored activity (ac_cum_counts is not changed)
+
+        Args:
+            ac (Activity): an activity to be removed
+
+        Raises:
+            ValueError: the activity is not stored
+        """
+        if ac.ac_type == self.ac_types_param.idle:
+            return
+        row = self.row_of(ac)
+        self.__delete_rows(row, row + 1)
+
+    def change_ac_interval(
+        self, ac: Activity, start: dt.datetime, end: dt.datetime
+    ):
+        """Changes the interval of a stored activity and updates its row
+
+        Args:
+            ac (Activity): a stored activity
+            start (datetime.datetime): a new start time
+            end (datetime.datetime): a new end time
+        """
+        self.remove_ac(ac)
+        self.set_interval(ac, start, end)
+        self.insert_ac(ac)
+
+    def ac_iter(self) -> Iterator[Activity]:
+        """
+        Yields:
+            Iterator[Activity]
+        """
+        return self.__ac_iter_from_row(0)
+
+    def ac_iter_of_types(self, ac_type_list: List[str]) -> Iterator[Activity]:
+        """
+        Yields:
+            Iterator[Activity]
+        """
+        if not (
+            all(
+                (ac_type in self.ac_types_param.all_types)
+                for ac_type in ac_type_list
+            )
+        ):
+            raise KeyError(
+                f"List {ac_type_list} contains an unsupported activity type"
+            )
+        for ac in self.ac_iter():
+            if ac.ac_type in ac_type_list:
+                yield ac
+
+    def operation_iter(self) -> Iterator[Operation]:
+        """
+        Yields:
+            Iterator[Opearation]
+        """
+        code = self.type_code(self.ac_types_param.operation)
+        rows = np.flatnonzero(self.type_codes == code).tolist()
+        # rows are converted in chunks, which is faster than one by one
+        for idx in range(0, len(rows), ROW_CHUNK_SIZE):
+            yield from self.make_acs(rows[idx : idx + ROW_CHUNK_SIZE])
+
+    def actual_ac_iter(self) -> Iterator[Union[Operation, Breakdown]]:
+        """
+        Yields:
+            Iterator[Opearation, Breakdown]
+        """
+        for row in range(0, self.__size, ROW_CHUNK_SIZE):
+            yield from self.make_acs(
+                list(range(row, min(row + ROW_CHUNK_SIZE, self.__size)))
+            )
+
+    def idle_ac_iter(self) -> Iterator[Idle]:
+        """
+        Yields:
+            Iterator[Idle]
+        """
+        for row in self.__gap_rows().tolist():
+            yield self.make_idle(row)
+
+    def gap_iter(
+        self, moment: Optional[dt.datetime] = None
+    ) -> Iterator[Tuple[dt.datetime, dt.datetime]]:
+        """Yields (start, end) of idle gaps
+
+        Args:
+            moment (datetime.datetime, optional): if given, yields gaps ending after moment
+
+        Yields:
+            Iterator[Tuple[dt.datetime, dt.datetime]]
+        """
+        tick = None if moment is None else self.moment_to_tick(moment)
+        for row in self.__gap_rows().tolist():
+            gap_start, gap_end = self.__gap_before(row)
+            if tick is None or tick < gap_end:
+                yield (
+                    self.tick_to_moment(gap_start),
+                    self.tick_to_moment(gap_end),
+                )
+
+    def ac_iter_from(self, moment: dt.datetime) -> Iterator[Activity]:
+        """Yields activities from the first one that ends after moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Yields:
+            Iterator[Activity]
+        """
+        tick = self.moment_to_tick(moment)
+        row = self.__first_row_ending_after(tick)
+        return self.__ac_iter_from_row(row, tick)
+
+    def actual_ac_iter_within(
+        self, interval: Interval
+    ) -> Iterator[Union[Operation, Breakdown]]:
+        """Yields operations and breakdowns in the closed interval
+        (activities of duration 0 on its boundaries are included)
+
+        Args:
+            interval (Interval): a window of time
+
+        Yields:
+            Iterator[Union[Operation, Breakdown]]
+        """
+        start = self.moment_to_tick(interval.start)
+        end = self.moment_to_tick(interval.end)
+        first_row = int(np.searchsorted(self.starts, start, side="left"))
+        last_row = int(np.searchsorted(self.starts, end, side="right"))
+        for row in range(first_row, last_row):
+            if self.__ends[row] <= end:
+                yield self.make_ac(row)
+
+    def hbar_tuple_list(self) -> List[Tuple[dt.datetime, dt.timedelta]]:
+        """Returns a horizontal bar tuple list
+
+        Warnings:
+            Use an iterator ac_iter to retrieve activities
+
+        Returns:
+            List[Tuple[dt.datetime, dt.timedelta]]: Tuple of [start, duration]
+        """
+        warnings.warn("This module is replaced by ac_iter", DeprecationWarning)
+        return [ac.interval.start_duration_tuple() for ac in self.ac_iter()]
+
+    def ac_id_of_moment(self, moment: dt.datetime) -> str:
+        """Returns the activity occupying moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Raises:
+            SyntaxError: no Activity instance occupying moment
+
+        Returns:
+            str: ac_id of the Activity instance occupying moment
+                 if moment is boundary, latter ac_id is returned
+        """
+        self.error_if_moment_outside_horizon(moment)
+        tick = self.moment_to_tick(moment)
+        row = self.__first_row_ending_after(tick)
+        if row < self.__size and self.__starts[row] <= tick:
+            return self.__ac_ids[row]
+        if tick < self.__gap_before(row)[1]:
+            return self.make_idle(row).ac_id
+        e_str = "No Activity instance occupying moment "
+        e_str += f"{moment} of machine {self.mc_id}"
+        raise SyntaxError(e_str)
+
+    def ac_at(self, moment: dt.datetime) -> Optional[Activity]:
+        """Returns the activity occupying moment (a binary search)
+        if moment is boundary, latter activity is returned
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Optional[Activity]: None if no activity occupies moment
+                (e.g. moment is outside the horizon)
+        """
+        _moment = to_dt.to_moment_value(moment)
+        if not (self.horizon.start <= _moment < self.horizon.end):
+            return None
+        tick = self.moment_to_tick(_moment)
+        row = self.__first_row_ending_after(tick)
+        if row < self.__size and self.__starts[row] <= tick:
+            return self.make_ac(row)
+        if tick < self.__gap_before(row)[1]:
+            return self.make_idle(row)
+        return None
+
+    def ac_ids_at(self, moments: Any) -> List[Optional[str]]:
+        """Returns ac_ids of the activities occupying each of moments
+        (if a moment is boundary, latter ac_id is returned)
+
+        Moments are located with numpy.searchsorted over the start column,
+        so that k moments take O(k log n) time for n rows
+        (ac_ids of idle gaps are made once for each gap found)
+
+        Args:
+            moments (Any): a list or an array of moments
+                (datetime64 or int64 arrays are not converted in a Python loop)
+
+        Returns:
+            List[Optional[str]]: ac_ids in the order of moments
+                (None if no activity occupies the moment)
+        """
+        ticks = self.__ticks_of_moments(moments)
+        size = self.__size
+        rows = np.searchsorted(self.starts, ticks, side="right") - 1
+        # rows of -1 are checked with the first row, and then dropped
+        occupied = (rows >= 0) & (
+            ticks < np.append(self.ends, 0)[np.maximum(rows, 0)]
+        )
+        horizon_end = self.moment_to_tick(self.horizon.end)
+        # moments in a gap are in the gap before the next row
+        in_gap = ~occupied & (ticks >= 0) & (ticks < horizon_end)
+        gap_rows, gap_codes = np.unique(rows[in_gap] + 1, return_inverse=True)
+        codes = np.where(occupied, rows, -1)
+        codes[in_gap] = size + gap_codes
+        # the last element is taken for the code -1 (no activity)
+        ac_id_list: List[Optional[str]] = list(self.__ac_ids)
+        gap_starts = np.append(0, self.ends)[gap_rows]
+        ac_id_list += [
+            self.make_ac_id_for_gap(gap_start)
+            for gap_start in self.__moments_of_ticks(gap_starts)
+        ]
+        ac_id_list.append(None)
+        return [ac_id_list[code] for code in codes.tolist()]
+
+    def delete_ac_id(self, ac_id: str):
+        """Deletes the row of ac_id (found by a search of the ac_id column;
+        nothing is stored for the ac_id of an idle gap)
+
+        Args:
+            ac_id (str)
+
+        Raises:
+            KeyError: ac_id is neither a row nor an idle gap
+        """
+        try:
+            row = self.__ac_ids.index(ac_id)
+        except ValueError:
+            # idle gaps are not stored (see ac_dict)
+            super().delete_ac_id(ac_id)
+            return
+        self.__delete_rows(row, row + 1)
+
+    def delete_ac_beyond_moment(self, moment: dt.datetime):
+        """Deletes all activities beyond moment
+        the end of the activity occupying the moment is changed to the moment,
+        and the rest of the horizon becomes an idle gap
+
+        Args:
+            moment (datetime.datetime)
+        """
+        _moment = to_dt.to_moment_value(moment)
+        if _moment >= self.horizon.end:
+            return
+        tick = self.moment_to_tick(_moment)
+        row = self.__first_row_ending_after(tick)
+        if row < self.__size and self.__starts[row] < tick:
+            self.__delete_rows(row + 1, self.__size)
+            self.__set_end(row, tick)
+        else:
+            self.__delete_rows(row, self.__size)
+
+    def is_idle_only(self, given_interval: Interval) -> bool:
+        """Check if the given interval contains a single activity
+
+        Args:
+            given_interval (Interval):
+
+        Returns:
+            bool: True if an idle Activity occupies given interval
+        """
+        self.error_if_interval_outside_horizon(given_interval)
+        start = self.moment_to_tick(given_interval.start)
+        end = self.moment_to_tick(given_interval.end)
+        gap_end = self.__gap_before(self.__first_row_ending_after(start))[1]
+        return gap_end > start and gap_end >= end
+
+    def add_activity(self, ac: Activity) -> bool:
+        """Tries to add given Activity instance with given interval
+
+        Args:
+            ac (Activity): with ac_type and Interval set
+
+        Returns:
+            bool: True if addition of Activity was successful, False otherwise
+        """
+        _interval = ac.interval
+
+        if (_interval.start == _interval.end) and (
+            _interval.end == self.horizon.end
+        ):
+            if ac.ac_type == self.ac_types_param.idle:
+                raise ValueError(
+                    "An idle job with duration 0 is not allowed to insert"
+                )
+            self.insert_ac(ac)
+            self.ac_cum_counts[ac.ac_type] += 1
+            print(f"Warning: {ac} has duration of 0")
+            return True
+
+        if not self.is_idle_only(_interval):
+            raise ValueError(
+                f"{_interval} is occupied in Machine {self.mc_id}"
+            )
+        self.insert_ac(ac)
+        self.ac_cum_counts[ac.ac_type] += 1
+        return True
+
+    def load_sorted_acs(self, sorted_ac_list: List[Activity]):
+        """Replaces the rows with actual activities checked by validate_new_acs
+
+        Args:
+            sorted_ac_list (List[Activity]): actual activities sorted by start time
+
+        Raises:
+            TypeError: an activity is neither an operation nor a breakdown
+        """
+        self.__before_change()
+        undo_log = self.undo_log
+        if undo_log is not None and undo_log.is_recording:
+            undo_log.record(self.load_sorted_acs, list(self.actual_ac_iter()))
+
+        size = len(sorted_ac_list)
+        job_index_list: List[int] = []
+        for ac in sorted_ac_list:
+            if isinstance(ac, Operation):
+                job_index_list.append(self.__job_index(ac.job))
+            elif isinstance(ac, Breakdown):
+                job_index_list.append(-1)
+            else:
+                raise TypeError(f"{ac} cannot be stored in ColumnarMCSchedule")
+
+        self.__reserve(max(size, 16))
+        self.__starts[:size] = [
+            self.moment_to_tick(ac.interval.start) for ac in sorted_ac_list
+        ]
+        self.__ends[:size] = [
+            self.moment_to_tick(ac.interval.end) for ac in sorted_ac_list
+        ]
+        self.__type_codes[:size] = [
+            self.type_code(ac.ac_type) for ac in sorted_ac_list
+        ]
+        self.__job_indices[:size] = job_index_list
+        self.__ac_ids = [ac.ac_id for ac in sorted_ac_list]
+        self.__contents = [ac.contents for ac in sorted_ac_list]
+        self.__size = size
+
+        self.__count_rows()
+        self.reset_gap_index()
+
+    def copy(
+        self, mc: Machine, job_dict: Dict[str, "Job"]
+    ) -> ColumnarMCSchedule:
+        """Returns a copy of the columns for another Machine object
+
+        Args:
+            mc (Machine): the machine of the copied schedule
+            job_dict (Dict[str, Job]): jobs of the copied rows by job_id
+
+        Returns:
+            ColumnarMCSchedule: the copied machine schedule (without undo_log)
+        """
+        mc_schedule = ColumnarMCSchedule(
+            self.mc_id, mc, self.horizon, self.ac_types_param
+        )
+        size = self.__size
+        mc_schedule.__reserve(max(size, 16))
+        mc_schedule.__starts[:size] = self.__starts[:size]
+        mc_schedule.__ends[:size] = self.__ends[:size]
+        mc_schedule.__type_codes[:size] = self.__type_codes[:size]
+        mc_schedule.__job_indices[:size] = self.__job_indices[:size]
+        mc_schedule.__ac_ids = list(self.__ac_ids)
+        mc_schedule.__contents = [
+            dict(contents) for contents in self.__contents
+        ]
+        mc_schedule.__job_list = [
+            job_dict.get(job.job_id, job) for job in self.__job_list
+        ]
+        mc_schedule.__job_index_dict = dict(self.__job_index_dict)
+        mc_schedule.__size = size
+        mc_schedule.__count_rows()
+        mc_schedule.ac_cum_counts.update(self.ac_cum_counts)
+        return mc_schedule
+
+    def get_state(self) -> Tuple[Any, ...]:
+        """Returns the columns to be pickled (undo_log is not included)
+
+        Returns:
+            Tuple[Any, ...]: ac_cum_counts, the four columns, ac_ids,
+                contents and job_ids of job_list
+        """
+        size = self.__size
+        contents = self.__contents
+        if not isinstance(contents, list):
+            contents = list(contents)
+        return (
+            dict(self.ac_cum_counts),
+            self.__starts[:size].copy(),
+            self.__ends[:size].copy(),
+            self.__type_codes[:size].copy(),
+            self.__job_indices[:size].copy(),
+            self.__ac_ids,
+            contents,
+            [job.job_id for job in self.__job_list],
+        )
+
+    def set_state(
+        self,
+        state: Tuple[Any, ...],
+        job_dict: Optional[Dict[str, "Job"]] = None,
+    ):
+        """Replaces the columns with a state of get_state
+        (contents of the state are stored as they are, and arrays of
+        the column dtypes and RowContents are used without copying,
+        e.g. memory-mapped arrays of Schedule.load)
+
+        Args:
+            state (Tuple[Any, ...]): a state returned by get_state
+            job_dict (Dict[str, Job], optional): jobs of operations by job_id
+                (if None, new jobs with the same job_ids, which hold
+                no operations since jobs are not pickled with a machine)
+
+        Raises:
+            KeyError: the job of an operation is not in job_dict
+        """
+        self.__before_change()
+        (
+            ac_cum_counts,
+            starts,
+            ends,
+            type_codes,
+            job_indices,
+            ac_ids,
+            contents,
+            job_id_list,
+        ) = state
+        size = len(starts)
+        # the columns are resized on the first insertion
+        self.__starts = np.asarray(starts, dtype=np.int64)
+        self.__ends = np.asarray(ends, dtype=np.int64)
+        self.__type_codes = np.asarray(type_codes, dtype=np.int8)
+        self.__job_indices = np.asarray(job_indices, dtype=np.int32)
+        self.__ac_ids = list(ac_ids)
+        self.__contents = (
+            contents if isinstance(contents, RowContents) else list(contents)
+        )
+        if job_dict is None:
+            self.__job_list = [Job(job_id) for job_id in job_id_list]
+        else:
+            self.__job_list = [job_dict[job_id] for job_id in job_id_list]
+        self.__job_index_dict = {
+            job_id: idx for idx, job_id in enumerate(job_id_list)
+        }
+        self.__size = size
+
+        self.__count_rows()
+        self.ac_cum_counts.update(ac_cum_counts)
+        self.reset_gap_index()
+
+    def restore_ac(
+        self,
+        ac_type: str,
+        ac_id: str,
+        interval: Interval,
+        job_id: Optional[str],
+        contents: Dict[str, Any],
+    ) -> Activity:
+        """Returns a new activity of a pickled activity on this machine
+        (activities are created on demand, so they are never shared)
+
+        Args:
+            ac_type (str): the ac_type of the activity
+            ac_id (str): the ac_id of the activity
+            interval (Interval): the interval of the activity
+            job_id (Optional[str]): the job_id of an operation
+            contents (Dict[str, Any]): the contents of the activity
+
+        Returns:
+            Activity: the restored activity
+        """
+        job_dict: Dict[str, "Job"] = {}
+        if job_id is not None:
+            job_index = self.__job_index_dict.get(job_id)
+            job_dict[job_id] = (
+                Job(job_id)
+                if job_index is None
+                else self.__job_list[job_index]
+            )
+        return self.make_ac_of_row(
+            (ac_type, ac_id, interval.start, interval.end, job_id, contents),
+            job_dict,
+        )
+
+    def slice_rows(
+        self, horizon: Interval, horz_overlap: str
+    ) -> List[Tuple[Any, ...]]:
+        """Returns rows (see ac_row) of operations and breakdowns
+        in a new horizon, sliced from the columns between the rows
+        found with binary searches (see Schedule.transform)
+
+        Args:
+            horizon (Interval): a new horizon
+            horz_overlap (str): "trim" for activities not distinct from horizon
+                with trimmed intervals, "exclude" for activities in horizon
+
+        Raises:
+            ValueError: **horz_overlap** is not valid
+
+        Returns:
+            List[Tuple[Any, ...]]: rows sorted by start time
+        """
+        return self.slice_columns(horizon, horz_overlap).rows()
+
+    def slice_columns(
+        self, horizon: Interval, horz_overlap: str
+    ) -> ColumnSlice:
+        """Returns the columns of the rows of slice_rows without creating
+        the rows, so that only the sliced rows are sent to another process
+
+        Args:
+            horizon (Interval): a new horizon
+            horz_overlap (str): "trim" for activities not distinct from horizon
+                with trimmed intervals, "exclude" for activities in horizon
+
+        Raises:
+            ValueError: **horz_overlap** is not valid
+
+        Returns:
+            ColumnSlice: the columns of the rows sorted by start time
+        """
+        start = self.moment_to_tick(horizon.start)
+        end = self.moment_to_tick(horizon.end)
+        if horz_overlap in ["trim"]:
+            # as ac_iter_in, rows ending after the start and starting before the end
+            first_row = self.__first_row_ending_after(start)
+            last_row = max(
+                int(np.searchsorted(self.starts, end, side="left")), first_row
+            )
+            rows = np.arange(first_row, last_row)
+            starts = np.maximum(self.__starts[first_row:last_row], start)
+            ends = np.minimum(self.__ends[first_row:last_row], end)
+        elif horz_overlap in ["exclude"]:
+            # as actual_ac_iter_within, rows in the closed horizon
+            first_row = int(np.searchsorted(self.starts, start, side="left"))
+            last_row = int(np.searchsorted(self.starts, end, side="right"))
+            rows = first_row + np.flatnonzero(
+                self.__ends[first_row:last_row] <= end
+            )
+            starts = self.__starts[rows]
+            ends = self.__ends[rows]
+        else:
+            raise ValueError(f"horz_overlap {horz_overlap} is not valid ")
+
+        all_types = self.ac_types_param.all_types
+        job_id_list = [job.job_id for job in self.__job_list] + [None]
+        row_list = rows.tolist()
+        return ColumnSlice(
+            [all_types[code] for code in self.__type_codes[rows].tolist()],
+            [self.__ac_ids[row] for row in row_list],
+            starts,
+            ends,
+            [job_id_list[idx] for idx in self.__job_indices[rows].tolist()],
+            [self.__contents[row] for row in row_list],
+            self.horizon.start,
+            self.__origin,
+        )
+
+    def del_activities_in_interval(self, given_interval: Interval):
+        """Deletes all activities within given interval
+        (the space becomes a gap of idle)
+
+        Args:
+            given_interval (Interval)
+        """
+        self.error_if_interval_outside_horizon(given_interval)
+        start = self.moment_to_tick(given_interval.start)
+        end = self.moment_to_tick(given_interval.end)
+        first_row = self.__first_row_ending_after(start)
+        if start < end:
+            last_row = int(np.searchsorted(self.starts, end, side="left"))
+        elif first_row < self.__size and self.__starts[first_row] <= start:
+            last_row = first_row + 1
+        else:
+            last_row = first_row
+        self.__delete_rows(first_row, last_row)
+
+    def idle_interval_list(self, release_date: dt.datetime) -> List[Interval]:
+        """Returns a list of idle activities
+
+        Args:
+            release_date (datetime.datetime)
+
+        Returns:
+            List[Interval]: list of idle activities beyond release_date
+        """
+        if self.after_horizon_end(release_date):
+            return []
+        release_tick = self.moment_to_tick(release_date)
+        return_list: List[Interval] = list()
+        for row in self.__gap_rows().tolist():
+            gap_start, gap_end = self.__gap_before(row)
+            if gap_end >= release_tick:
+                return_list.append(
+                    Interval(
+                        self.tick_to_moment(gap_start),
+                        self.tick_to_moment(gap_end),
+                    )
+                )
+        return return_list
+
+    def last_ac_id_of_type(self, target_type: str) -> str:
+        """Returns ac_id of last Activity instance with target_type
+
+        Args:
+            target_type (str): an ac_type value
+
+        Returns:
+            str: ac_id, "" if no such Activity instance
+        """
+        ac = self.__last_ac_of_type(target_type)
+        return "" if ac is None else ac.ac_id
+
+    def last_ac_interval_of_type(self, target_type: str) -> Interval:
+        """Returns interval of last Activity instance with target_type
+
+        Args:
+            target_type (str): an ac_type value
+
+        Returns:
+            Interval: interval of the Activity instance,
+                      (start, start) if no Activity of target_type
+        """
+        ac = self.__last_ac_of_type(target_type)
+        if ac is None:
+            return Interval(self.horizon.start, self.horizon.start)
+        return ac.interval
+
+    def __last_ac_of_type(self, target_type: str) -> Optional[Activity]:
+        if target_type == self.ac_types_param.idle:
+            gap_rows = self.__gap_rows()
+            return self.make_idle(gap_rows[-1]) if len(gap_rows) else None
+        if target_type not in self.__type_code_dict:
+            return None
+        rows = np.flatnonzero(self.type_mask(target_type))
+        return self.make_ac(int(rows[-1])) if len(rows) else None
+
+    def __ac_iter_from_row(
+        self, row: int, tick: int = -1
+    ) -> Iterator[Activity]:
+        # yields the gap before each row (if it ends after tick) and the row;
+        # the columns are converted in chunks from row, so that a window
+        # of k activities takes O(k) time after the binary search
+        gap_start = int(self.__ends[row - 1]) if row > 0 else 0
+        chunk_start = row
+        while chunk_start < self.__size:
+            chunk_end = min(chunk_start + ROW_CHUNK_SIZE, self.__size)
+            for _row, start, end in zip(
+                range(chunk_start, chunk_end),
+                self.__starts[chunk_start:chunk_end].tolist(),
+                self.__ends[chunk_start:chunk_end].tolist(),
+            ):
+                if gap_start < start and tick < start:
+                    yield self.make_idle(_row)
+                yield self.make_ac(_row)
+                gap_start = end
+            chunk_start = chunk_end
+        horizon_end = self.moment_to_tick(self.horizon.end)
+        if gap_start < horizon_end and tick < horizon_end:
+            yield self.make_idle(self.__size)
+
+    def __gap_before(self, row: int) -> Tuple[int, int]:
+        gap_start = int(self.__ends[row - 1]) if row > 0 else 0
+        if row < self.__size:
+            gap_end = int(self.__starts[row])
+        else:
+            gap_end = self.moment_to_tick(self.horizon.end)
+        return (gap_start, gap_end)
+
+    def __gap_rows(self) -> np.ndarray:
+        # rows preceded by a gap of positive length (size for the last gap)
+        gap_starts = np.concatenate(([0], self.ends))
+        gap_ends = np.concatenate(
+            (self.starts, [self.moment_to_tick(self.horizon.end)])
+        )
+        return np.flatnonzero(gap_ends > gap_starts)
+
+    def __count_rows(self):
+        # counts rows of each type, and gaps again on the next access
+        type_counts = np.bincount(
+            self.type_codes, minlength=len(self.ac_types_param.all_types)
+        )
+        for code, ac_type in enumerate(self.ac_types_param.all_types):
+            super().ac_counts[ac_type] = int(type_counts[code])
+        self.__gap_count = None
+
+    def __first_row_ending_after(self, tick: int) -> int:
+        return int(np.searchsorted(self.ends, tick, side="right"))
+
+    def row_of(self, ac: Activity) -> int:
+        """Returns the row of a stored activity
+
+        Args:
+            ac (Activity): an operation or a breakdown on the machine
+
+        Raises:
+            ValueError: the activity is not stored
+
+        Returns:
+            int: the index of the row
+        """
+        start = self.moment_to_tick(ac.interval.start)
+        row = int(np.searchsorted(self.starts, start, side="left"))
+        while row < self.__size and self.__starts[row] == start:
+            if self.__ac_ids[row] == ac.ac_id:
+                return row
+            row += 1
+        raise ValueError(f"{ac} is not in machine {self.mc_id}")
+
+    def __job_index(self, job: "Job") -> int:
+        if job.job_id not in self.__job_index_dict:
+            self.__job_index_dict[job.job_id] = len(self.__job_list)
+            self.__job_list.append(job)
+        return self.__job_index_dict[job.job_id]
+
+    def __column_view(self, column: np.ndarray) -> np.ndarray:
+        view = column[: self.__size]
+        view.flags.writeable = False
+        return view
+
+    def __to_datetime64(self, ticks: np.ndarray) -> np.ndarray:
+        if self.__origin is not None:
+            tick_us = to_dt.Moment.resolution // TICK
+            return np.datetime64(
+                to_dt.to_dt_datetime(self.horizon.start), "us"
+            ) + (ticks * tick_us).astype("timedelta64[us]")
+        # in UTC for a timezone-aware horizon (see to_moment_array)
+        return to_moment_array(self.horizon.start) + ticks.astype(
+            "timedelta64[us]"
+        )
+
+    def __ticks_of_moments(self, moments: Any) -> np.ndarray:
+        # int64 ticks from the horizon start (see moment_to_tick)
+        values = to_moment_array(moments)
+        if self.__origin is not None:
+            return values.astype(np.int64) - self.__origin
+        return (values - to_moment_array(self.horizon.start)).astype(np.int64)
+
+    def __moments_of_ticks(self, ticks: np.ndarray) -> List[Any]:
+        return moments_of_ticks(ticks, self.horizon.start, self.__origin)
+
+    def __insert_rows(
+        self,
+        row: int,
+        starts: List[int],
+        ends: List[int],
+        type_codes: List[int],
+        job_indices: List[int],
+        ac_ids: List[str],
+        contents_list: List[Dict[str, Any]],
+    ):
+        # inserts rows that fit in the gap before row
+        self.__before_change()
+        size = self.__size
+        count = len(ac_ids)
+        if self.is_gap_indexed or self.__gap_count is not None:
+            gap_start, gap_end = self.__gap_before(row)
+            boundaries = [gap_start]
+            for start, end in zip(starts, ends):
+                boundaries += [start, end]
+            boundaries.append(gap_end)
+            if self.__gap_count is not None:
+                self.__gap_count += sum(
+                    start < end
+                    for start, end in zip(boundaries[::2], boundaries[1::2])
+                ) - (gap_start < gap_end)
+        if self.is_gap_indexed:
+            moments = [self.tick_to_moment(tick) for tick in boundaries]
+            self.update_gaps(
+                [(moments[0], moments[-1])],
+                list(zip(moments[::2], moments[1::2])),
+            )
+        if size + count > len(self.__starts):
+            self.__reserve(max(2 * size, size + count))
+        for column, values in (
+            (self.__starts, starts),
+            (self.__ends, ends),
+            (self.__type_codes, type_codes),
+            (self.__job_indices, job_indices),
+        ):
+            column[row + count : size + count] = column[row:size]
+            column[row : row + count] = values
+        self.__ac_ids[row:row] = ac_ids
+        self.__contents[row:row] = contents_list
+        self.__size += count
+        for type_code in type_codes:
+            super().ac_counts[self.ac_types_param.all_types[type_code]] += 1
+
+        undo_log = self.undo_log
+        if undo_log is not None:
+            undo_log.record(self.__delete_rows, row, row + count)
+
+    def __delete_rows(self, first_row: int, last_row: int):
+        # deletes rows in [first_row, last_row)
+        count = last_row - first_row
+        if count <= 0:
+            return
+        self.__before_change()
+        undo_log = self.undo_log
+        if undo_log is not None and undo_log.is_recording:
+            undo_log.record(
+                self.__insert_rows,
+                first_row,
+                self.__starts[first_row:last_row].tolist(),
+                self.__ends[first_row:last_row].tolist(),
+                self.__type_codes[first_row:last_row].tolist(),
+                self.__job_indices[first_row:last_row].tolist(),
+                self.__ac_ids[first_row:last_row],
+                self.__contents[first_row:last_row],
+            )
+        removed_codes = np.bincount(
+            self.__type_codes[first_row:last_row],
+            minlength=len(self.ac_types_param.all_types),
+        )
+        for code, removed_count in enumerate(removed_codes.tolist()):
+            ac_type = self.ac_types_param.all_types[code]
+            super().ac_counts[ac_type] -= removed_count
+        if self.__gap_count is not None:
+            gap_starts = np.append(
+                self.__gap_before(first_row)[0],
+                self.__ends[first_row:last_row],
+            )
+            gap_ends = np.append(
+                self.__starts[first_row:last_row],
+                self.__gap_before(last_row)[1],
+            )
+            self.__gap_count += int(gap_starts[0] < gap_ends[-1]) - int(
+                np.count_nonzero(gap_starts < gap_ends)
+            )
+        if self.is_gap_indexed:
+            old_gaps = [
+                tuple(
+                    self.tick_to_moment(tick)
+                    for tick in self.__gap_before(row)
+                )
+                for row in range(first_row, last_row + 1)
+            ]
+            new_gap = (old_gaps[0][0], old_gaps[-1][1])
+            self.update_gaps(old_gaps, [new_gap])
+
+        size = self.__size
+        for column in (
+            self.__starts,
+            self.__ends,
+            self.__type_codes,
+            self.__job_indices,
+        ):
+            column[first_row : size - count] = column[last_row:size]
+        del self.__ac_ids[first_row:last_row]
+        del self.__contents[first_row:last_row]
+        self.__size -= count
+
+    def __set_end(self, row: int, tick: int):
+        # changes the end of a row within the gap after it
+        self.__before_change()
+        old_tick = int(self.__ends[row])
+        gap_end = self.__gap_before(row + 1)[1]
+        self.__ends[row] = tick
+        if self.__gap_count is not None:
+            self.__gap_count += (tick < gap_end) - (old_tick < gap_end)
+        self.update_gaps(
+            [(self.tick_to_moment(old_tick), self.tick_to_moment(gap_end))],
+            [(self.tick_to_moment(tick), self.tick_to_moment(gap_end))],
+        )
+        undo_log = self.undo_log
+        if undo_log is not None:
+            undo_log.record(self.__set_end, row, old_tick)
+
+    def __before_change(self):
+        # creates deferred operations while their rows are valid,
+        # and contents of all rows to be moved with the rows
+        if self.__deferred_jobs:
+            deferred_jobs = self.__deferred_jobs
+            self.__deferred_jobs = []
+            for job in deferred_jobs:
+                job.load_operations()
+        if not isinstance(self.__contents, list):
+            self.__contents = list(self.__contents)
+
+    def __reserve(self, capacity: int):
+        self.__starts = np.resize(self.__starts, capacity)
+        self.__ends = np.resize(self.__ends, capacity)
+        self.__type_codes = np.resize(self.__type_codes, capacity)
+        self.__job_indices = np.resize(self.__job_indices, capacity)
+
+
+class RowContents:
+    """A read-only sequence of contents of rows, each created on its first
+    access (e.g. contents unpickled from a snapshot on demand)
+
+    Created contents are kept, so that changes on them are shared
+    as in a list. ColumnarMCSchedule converts it to a list
+    before its rows change
+    """
+
+    __slots__ = ["__size", "__make_contents", "__contents_dict"]
+
+    def __init__(
+        self, size: int, make_contents: Callable[[int], Dict[str, Any]]
+    ):
+        """
+        Args:
+            size (int): the number of rows
+            make_contents (Callable[[int], Dict[str, Any]]): a function
+                creating the contents of a row
+        """
+        self.__size: int = size
+        self.__make_contents = make_contents
+        self.__contents_dict: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __getitem__(
+        self, key: Union[int, slice]
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(key, slice):
+            return [self[row] for row in range(*key.indices(self.__size))]
+        row = int(key)
+        if row < 0:
+            row += self.__size
+        if not 0 <= row < self.__size:
+            raise IndexError(f"Row {key} is out of range")
+        contents = self.__contents_dict.get(row)
+        if contents is None:
+            contents = self.__make_contents(row)
+            self.__contents_dict[row] = contents
+        return contents
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(self.__size):
+            yield self[row]
+
+
+class ColumnarAcList:
+    """A read-only SortedAcList of the rows of a ColumnarMCSchedule
+
+    The rows form a single block, so that a location is (0, row).
+    Activities are created whenever they are returned (see make_ac),
+    and the schedule is changed only with the methods of ColumnarMCSchedule
+    """
+
+    __slots__ = ["__mc_schedule"]
+
+    def __init__(self, mc_schedule: ColumnarMCSchedule):
+        self.__mc_schedule: ColumnarMCSchedule = mc_schedule
+
+    def __len__(self) -> int:
+        return self.__mc_schedule.size
+
+    def __iter__(self) -> Iterator[Union[Operation, Breakdown]]:
+        return self.__mc_schedule.actual_ac_iter()
+
+    def __reversed__(self) -> Iterator[Union[Operation, Breakdown]]:
+        for row in reversed(range(self.__mc_schedule.size)):
+            yield self.__mc_schedule.make_ac(row)
+
+    def __repr__(self) -> str:
+        return f"ColumnarAcList({len(self)} activities)"
+
+    def clear(self):
+        self.__error_read_only()
+
+    def reset(self, sorted_ac_list: List[Activity]):
+        self.__error_read_only()
+
+    def add(self, ac: Activity):
+        self.__error_read_only()
+
+    def remove(self, ac: Activity):
+        self.__error_read_only()
+
+    def pop(self) -> Activity:
+        self.__error_read_only()
+
+    def first(self) -> Optional[Union[Operation, Breakdown]]:
+        """Returns the earliest activity (None if empty)"""
+        if not len(self):
+            return None
+        return self.__mc_schedule.make_ac(0)
+
+    def last(self) -> Optional[Union[Operation, Breakdown]]:
+        """Returns the latest activity (None if empty)"""
+        if not len(self):
+            return None
+        return self.__mc_schedule.make_ac(len(self) - 1)
+
+    def locate(self, ac: Activity) -> Tuple[int, int]:
+        """Returns (0, row) of an activity
+
+        Args:
+            ac (Activity): an activity in the container
+
+        Raises:
+            ValueError: the activity is not in the container
+
+        Returns:
+            Tuple[int, int]: a location valid until the next modification
+        """
+        return (0, self.__mc_schedule.row_of(ac))
+
+    def floor_loc(self, moment: dt.datetime) -> Optional[Tuple[int, int]]:
+        """Returns the location of the last activity starting at or before moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Optional[Tuple[int, int]]: None if every activity starts after moment
+        """
+        row = self.__search(moment, "right") - 1
+        return None if row < 0 else (0, row)
+
+    def ceil_loc(self, moment: dt.datetime) -> Optional[Tuple[int, int]]:
+        """Returns the location of the first activity starting at or after moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Optional[Tuple[int, int]]: None if every activity starts before moment
+        """
+        row = self.__search(moment, "left")
+        return None if row == len(self) else (0, row)
+
+    def floor(
+        self, moment: dt.datetime
+    ) -> Optional[Union[Operation, Breakdown]]:
+        """Returns the last activity starting at or before moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Optional[Activity]: None if every activity starts after moment
+        """
+        loc = self.floor_loc(moment)
+        return None if loc is None else self.__mc_schedule.make_ac(loc[1])
+
+    def next_of(self, ac: Activity) -> Optional[Union[Operation, Breakdown]]:
+        """Returns the activity right after ac (None if ac is the last one)"""
+        row = self.__mc_schedule.row_of(ac) + 1
+        return self.__mc_schedule.make_ac(row) if row < len(self) else None
+
+    def prev_of(self, ac: Activity) -> Optional[Union[Operation, Breakdown]]:
+        """Returns the activity right before ac (None if ac is the first one)"""
+        row = self.__mc_schedule.row_of(ac) - 1
+        return self.__mc_schedule.make_ac(row) if row >= 0 else None
+
+    def iter_from_loc(
+        self, loc: Tuple[int, int]
+    ) -> Iterator[Union[Operation, Breakdown]]:
+        """Yields activities from the given location to the end
+
+        Args:
+            loc (Tuple[int, int]): a location returned by locate or floor_loc
+
+        Yields:
+            Iterator[Union[Operation, Breakdown]]
+        """
+        size = len(self)
+        for row in range(loc[1], size, ROW_CHUNK_SIZE):
+            yield from self.__mc_schedule.make_acs(
+                list(range(row, min(row + ROW_CHUNK_SIZE, size)))
+            )
+
+    def iter_from_moment(
+        self, moment: dt.datetime
+    ) -> Iterator[Union[Operation, Breakdown]]:
+        """Yields activities from the last one starting at or before moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Yields:
+            Iterator[Union[Operation, Breakdown]]
+        """
+        loc = self.floor_loc(moment)
+        return self.iter_from_loc((0, 0) if loc is None else loc)
+
+    def __search(self, moment: dt.datetime, side: str) -> int:
+        mc_schedule = self.__mc_schedule
+        tick = mc_schedule.moment_to_tick(to_dt.to_moment_value(moment))
+        return int(np.searchsorted(mc_schedule.starts, tick, side=side))
+
+    def __error_read_only(self):
+        raise TypeError(
+            f"{self} is read-only; use the methods of ColumnarMCSchedule"
+        )
+
+
+class ColumnSlice:
+    """Columns of the rows of a ColumnarMCSchedule in a new horizon
+    (see ColumnarMCSchedule.slice_columns)
+
+    Only the sliced rows are kept with the start and the origin
+    of the horizon. The tick columns can be converted to moments
+    in another process and passed to rows, so that a process pool
+    receives and returns the times of the sliced rows only
+    """
+
+    __slots__ = [
+        "ac_types",
+        "ac_ids",
+        "starts",
+        "ends",
+        "job_ids",
+        "contents_list",
+        "horizon_start",
+        "origin",
+    ]
+
+    def __init__(
+        self,
+        ac_types: List[str],
+        ac_ids: List[str],
+        starts: np.ndarray,
+        ends: np.ndarray,
+        job_ids: List[Optional[str]],
+        contents_list: List[Dict[str, Any]],
+        horizon_start: dt.datetime,
+        origin: Optional[int] = None,
+    ):
+        """
+        Args:
+            ac_types (List[str]): activity types of the rows
+            ac_ids (List[str]): ac_ids of the rows
+            starts (np.ndarray): int64 ticks of the (trimmed) start times
+            ends (np.ndarray): int64 ticks of the (trimmed) end times
+            job_ids (List[Optional[str]]): job ids of the rows (None for breakdowns)
+            contents_list (List[Dict[str, Any]]): contents of the rows
+            horizon_start (datetime.datetime): the moment of tick 0
+            origin (int, optional): the Moment of tick 0 on a Moment horizon
+        """
+        self.ac_types: List[str] = ac_types
+        self.ac_ids: List[str] = ac_ids
+        self.starts: np.ndarray = starts
+        self.ends: np.ndarray = ends
+        self.job_ids: List[Optional[str]] = job_ids
+        self.contents_list: List[Dict[str, Any]] = contents_list
+        self.horizon_start: dt.datetime = horizon_start
+        self.origin: Optional[int] = origin
+
+    def __len__(self) -> int:
+        return len(self.ac_ids)
+
+    def rows(
+        self,
+        start_moments: Optional[List[Any]] = None,
+        end_moments: Optional[List[Any]] = None,
+    ) -> List[Tuple[Any, ...]]:
+        """Returns the rows of ColumnarMCSchedule.slice_rows
+
+        Args:
+            start_moments (List[Any], optional): start times converted from
+                starts (e.g. in another process). Defaults to None (converted here).
+            end_moments (List[Any], optional): end times converted from
+                ends. Defaults to None (converted here).
+
+        Returns:
+            List[Tuple[Any, ...]]: (ac_type, ac_id, start, end, job_id, contents)
+        """
+        if start_moments is None:
+            start_moments = self.moments_of_ticks(self.starts)
+        if end_moments is None:
+            end_moments = self.moments_of_ticks(self.ends)
+        return list(
+            zip(
+                self.ac_types,
+                self.ac_ids,
+                start_moments,
+                end_moments,
+                self.job_ids,
+                self.contents_list,
+            )
+        )
+
+    def moments_of_ticks(self, ticks: np.ndarray) -> List[Any]:
+        """Converts ticks of the slice to moments (see moments_of_ticks)"""
+        return moments_of_ticks(ticks, self.horizon_start, self.origin)
+
+
+def moments_of_ticks(
+    ticks: np.ndarray, horizon_start: dt.datetime, origin: Optional[int] = None
+) -> List[Any]:
+    """Converts ticks from the horizon start to moments at once
+    (see ColumnarMCSchedule.tick_to_moment)
+
+    Args:
+        ticks (np.ndarray): int64 ticks
+        horizon_start (datetime.datetime): the moment of tick 0
+        origin (int, optional): the Moment of tick 0 on a Moment horizon
+
+    Returns:
+        List[Any]: datetimes (Moments if origin is given)
+    """
+    if origin is not None:
+        return [to_dt.Moment(origin + tick) for tick in ticks.tolist()]
+    if horizon_start.tzinfo is None:
+        # datetime64[us] is converted to datetime.datetime by tolist
+        return (
+            to_moment_array(horizon_start) + ticks.astype("timedelta64[us]")
+        ).tolist()
+    return [
+        horizon_start + dt.timedelta(microseconds=tick)
+        for tick in ticks.tolist()
+    ]
+
+
+def main():
+    ac_types_param = AcTypesParam()
+    machine_1 = Machine("test machine 1")
+    machine_1.reset_schedule(Interval(0, 20), ac_types_param, "columnar")
+    job_1 = Job("Job_1")
+    mc_schedule_1 = machine_1.mc_schedule
+
+    mc_schedule_1.add_activity(
+        Operation(
+            "test ops 1", Interval(1, 3), machine_1, job_1, ac_types_param
+        )
+    )
+    mc_schedule_1.add_activity(
+        Breakdown("test brkdown 1", Interval(4, 8), machine_1, ac_types_param)
+    )
+
+    print("ac_iter begins")
+    for ac in mc_schedule_1.ac_iter():
+        print(ac)
+    print("ac_iter ends")
+
+    print("\nstart & end columns")
+    print(mc_schedule_1.start_datetime64(), mc_schedule_1.end_datetime64())
+
+    print("\ntest ops 1 deleted")
+    mc_schedule_1.del_activities_in_interval(Interval(1, 3))
+    for ac in mc_schedule_1.ac_iter():
+        print(ac)
+
+
+if __name__ == "__main__":
+    main()
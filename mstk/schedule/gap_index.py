@@ -0,0 +1,227 @@
+""" Index of idle gaps for earliest-fit queries
+Created on 17th Oct. 2026
+"""
+from __future__ import annotations
+
+__all__ = ["GapIndex"]
+
+# common Python packages
+from typing import Iterable, Iterator, List, Tuple, Optional, Any
+
+import random
+
+
+class GapNode:
+    """A node of GapIndex holding a gap and the longest gap of its subtree"""
+
+    __slots__ = [
+        "start",
+        "end",
+        "length",
+        "max_length",
+        "priority",
+        "left",
+        "right",
+    ]
+
+    def __init__(self, start: Any, end: Any, priority: float):
+        self.start = start
+        self.end = end
+        self.length = end - start
+        self.max_length = self.length
+        self.priority: float = priority
+        self.left: Optional[GapNode] = None
+        self.right: Optional[GapNode] = None
+
+    def update(self):
+        """Recomputes max_length from the children"""
+        max_length = self.length
+        if self.left is not None and self.left.max_length > max_length:
+            max_length = self.left.max_length
+        if self.right is not None and self.right.max_length > max_length:
+            max_length = self.right.max_length
+        self.max_length = max_length
+
+
+class GapIndex:
+    """Disjoint gaps (start, end) indexed for earliest-fit queries
+
+    Gaps are stored in a treap (a binary search tree balanced by random
+    priorities) keyed on their start times, and each node keeps the
+    longest gap in its subtree. Adding or removing a gap and finding the
+    earliest gap that can hold a duration take O(log n) expected time.
+
+    Start and end values may be datetime.datetime or integer ticks
+    as long as (end - start) is comparable with the queried duration.
+    """
+
+    __slots__ = ["__root", "__len", "__random"]
+
+    def __init__(self, gaps: Iterable[Tuple[Any, Any]] = ()):
+        """
+        Args:
+            gaps (Iterable[Tuple[Any, Any]], optional): (start, end) of gaps sorted by start
+        """
+        self.__random = random.Random()
+        self.__root: Optional[GapNode] = None
+        self.__len: int = 0
+        self.__build(gaps)
+
+    def __len__(self) -> int:
+        return self.__len
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        stack: List[GapNode] = []
+        node = self.__root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield (node.start, node.end)
+            node = node.right
+
+    def __repr__(self) -> str:
+        return f"GapIndex({self.__len} gaps)"
+
+    def add(self, start: Any, end: Any):
+        """Adds a gap (start < end)
+
+        Args:
+            start (Any): the start of the gap
+            end (Any): the end of the gap
+        """
+        new_node = GapNode(start, end, self.__random.random())
+        left, right = self.__split(self.__root, start)
+        self.__root = self.__merge(self.__merge(left, new_node), right)
+        self.__len += 1
+
+    def remove(self, start: Any):
+        """Removes the gap starting at start
+
+        Args:
+            start (Any): the start of the gap
+
+        Raises:
+            KeyError: no gap starts at start
+        """
+        self.__root = self.__remove(self.__root, start)
+        self.__len -= 1
+
+    def floor(self, moment: Any) -> Optional[Tuple[Any, Any]]:
+        """Returns the last gap starting at or before moment
+
+        Args:
+            moment (Any)
+
+        Returns:
+            Optional[Tuple[Any, Any]]: (start, end) of the gap if exists
+        """
+        found: Optional[GapNode] = None
+        node = self.__root
+        while node is not None:
+            if node.start <= moment:
+                found = node
+                node = node.right
+            else:
+                node = node.left
+        return None if found is None else (found.start, found.end)
+
+    def earliest_fit(self, release: Any, duration: Any) -> Optional[Any]:
+        """Returns the earliest start not before release that fits in a gap
+
+        Args:
+            release (Any): the earliest possible start
+            duration (Any): the length to be fitted
+
+        Returns:
+            Optional[Any]: the earliest feasible start, None if no gap fits
+        """
+        floor_gap = self.floor(release)
+        if floor_gap is not None:
+            gap_end = floor_gap[1]
+            if release < gap_end and duration <= gap_end - release:
+                return release
+        node = self.__first_fit_after(self.__root, release, duration)
+        return None if node is None else node.start
+
+    def __first_fit_after(
+        self, node: Optional[GapNode], release: Any, duration: Any
+    ) -> Optional[GapNode]:
+        # the first node starting after release with length >= duration
+        while node is not None and node.max_length >= duration:
+            if node.start <= release:
+                node = node.right
+                continue
+            found = self.__first_fit_after(node.left, release, duration)
+            if found is not None:
+                return found
+            if node.length >= duration:
+                return node
+            node = node.right
+        return None
+
+    def __build(self, gaps: Iterable[Tuple[Any, Any]]):
+        # builds a treap from sorted gaps in linear time (Cartesian tree)
+        stack: List[GapNode] = []
+        for start, end in gaps:
+            node = GapNode(start, end, self.__random.random())
+            last: Optional[GapNode] = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+                last.update()
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+            self.__len += 1
+        if stack:
+            self.__root = stack[0]
+        while stack:
+            stack.pop().update()
+
+    def __split(
+        self, node: Optional[GapNode], key: Any
+    ) -> Tuple[Optional[GapNode], Optional[GapNode]]:
+        # splits into (start < key, start >= key)
+        if node is None:
+            return (None, None)
+        if node.start < key:
+            left, right = self.__split(node.right, key)
+            node.right = left
+            node.update()
+            return (node, right)
+        left, right = self.__split(node.left, key)
+        node.left = right
+        node.update()
+        return (left, node)
+
+    def __merge(
+        self, left: Optional[GapNode], right: Optional[GapNode]
+    ) -> Optional[GapNode]:
+        # merges two treaps where every key of left precedes those of right
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self.__merge(left.right, right)
+            left.update()
+            return left
+        right.left = self.__merge(left, right.left)
+        right.update()
+        return right
+
+    def __remove(
+        self, node: Optional[GapNode], start: Any
+    ) -> Optional[GapNode]:
+        if node is None:
+            raise KeyError(f"No gap starts at {start}")
+        if start < node.start:
+            node.left = self.__remove(node.left, start)
+        elif node.start < start:
+            node.right = self.__remove(node.right, start)
+        else:
+            return self.__merge(node.left, node.right)
+        node.update()
+        return node
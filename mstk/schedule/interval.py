@@ -4,19 +4,32 @@ Created on 8th Aug. 2020
 
 from __future__ import annotations
 
-__all__ = ["Interval"]
+__all__ = ["Interval", "IntervalArray", "to_moment_array"]
 
 # common Python packages
 import datetime as dt
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List, Iterable, Iterator, Union, Any
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is required only for IntervalArray
+    np = None
 
 # defined packages
 from mstk.schedule import to_dt
 
+UNIX_EPOCH = dt.datetime(1970, 1, 1)
+# the epoch of timezone-aware datetimes, which are stored in UTC
+UTC_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+MICROSECOND = dt.timedelta(microseconds=1)
+
 
 class Interval:
     """interval with start & end datetime value
     (start <= end) must hold true in initialization
+
+    Start and end may also be to_dt.Moment ticks (kept as they are),
+    then durations are integer ticks
     """
 
     __slots__ = ["__start", "__end"]
@@ -26,8 +39,17 @@ class Interval:
     def __init__(self, start: dt.datetime, end: dt.datetime):
         if start > end:
             raise ValueError("Interval start after end")
-        self.__start = to_dt.to_dt_datetime(start)
-        self.__end = to_dt.to_dt_datetime(end)
+        # skips conversion for the stored types (the most frequent case)
+        self.__start = (
+            start
+            if type(start) in to_dt.MOMENT_TYPES
+            else to_dt.to_moment_value(start)
+        )
+        self.__end = (
+            end
+            if type(end) in to_dt.MOMENT_TYPES
+            else to_dt.to_moment_value(end)
+        )
 
     @property
     def start(self):
@@ -40,8 +62,12 @@ class Interval:
     def __repr__(self) -> str:
         return f"Interval({self.start}, {self.end})"
 
+    def __reduce__(self):
+        return (Interval, (self.__start, self.__end))
+
     def duration(self) -> dt.timedelta:
         """Returns duration of the interval in timedelta
+        (integer ticks for an interval of Moments)
 
         Returns:
             dt.timedelta: (end - start) timedelta value
@@ -75,11 +101,8 @@ class Interval:
         Returns:
             bool:
         """
-        _moment = to_dt.to_dt_datetime(moment)
-        if self.start <= _moment and _moment <= self.end:
-            return True
-        else:
-            return False
+        _moment = to_dt.to_moment_value(moment)
+        return self.__start <= _moment <= self.__end
 
     def is_distinct(self, other: "Interval") -> bool:
         """Returns true if two intervals are distinct (considering a point overlay)
@@ -135,7 +158,7 @@ class Interval:
         Raises:
             ValueError: the interval range is invalid
         """
-        dt_new_start_time = to_dt.to_dt_datetime(new_start_time)
+        dt_new_start_time = to_dt.to_moment_value(new_start_time)
         if dt_new_start_time > self.end:
             raise ValueError(
                 f"The new start time {dt_new_start_time}"
@@ -153,7 +176,7 @@ class Interval:
         Raises:
             ValueError: the interval range is invalid
         """
-        dt_new_end_time = to_dt.to_dt_datetime(new_end_time)
+        dt_new_end_time = to_dt.to_moment_value(new_end_time)
         if self.start > dt_new_end_time:
             raise ValueError(
                 f"The new end time {dt_new_end_time}"
@@ -163,6 +186,323 @@ class Interval:
             self.__end = dt_new_end_time
 
 
+class IntervalArray:
+    """Intervals stored in two NumPy arrays of starts and ends
+
+    Values are datetime64[us] for datetime intervals, or int64 ticks
+    for intervals of to_dt.Moment. Timezone-aware datetimes are stored
+    in UTC, so that intervals of them are returned as naive UTC datetimes.
+    Operations are computed on the whole
+    arrays; an Interval or a moment operand is applied to every interval,
+    and array operands follow the NumPy broadcasting rules.
+    """
+
+    __slots__ = ["__starts", "__ends"]
+
+    def __init__(self, starts: Any, ends: Any):
+        """
+        Args:
+            starts (Any): an array-like of start times (datetime64 or int64;
+                NumPy arrays of the same type are used without a copy)
+            ends (Any): an array-like of end times of the same length
+
+        Raises:
+            ImportError: NumPy is not installed
+            ValueError: shapes of starts and ends are different,
+                or an interval starts after its end
+        """
+        if np is None:
+            raise ImportError("IntervalArray requires NumPy")
+        # read-only views (arrays of the caller stay writeable)
+        self.__starts: np.ndarray = to_moment_array(starts).view()
+        self.__ends: np.ndarray = to_moment_array(ends).view()
+        if self.__starts.ndim != 1 or self.__starts.shape != self.__ends.shape:
+            raise ValueError(
+                f"starts {self.__starts.shape} and ends {self.__ends.shape}"
+                + " must be 1-D arrays of the same length"
+            )
+        if self.__starts.dtype != self.__ends.dtype:
+            raise ValueError(
+                f"starts ({self.__starts.dtype}) and ends ({self.__ends.dtype})"
+                + " have different types"
+            )
+        if np.any(self.__starts > self.__ends):
+            raise ValueError("Interval start after end")
+        self.__starts.flags.writeable = False
+        self.__ends.flags.writeable = False
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable[Interval]) -> "IntervalArray":
+        """Creates an IntervalArray from Interval instances
+
+        Args:
+            intervals (Iterable[Interval]): intervals of datetimes or Moments
+
+        Returns:
+            IntervalArray
+        """
+        start_list = []
+        end_list = []
+        for interval in intervals:
+            start_list.append(interval.start)
+            end_list.append(interval.end)
+        if not start_list:
+            empty = np.empty(0, dtype="datetime64[us]")
+            return cls(empty, empty)
+        return cls(to_moment_array(start_list), to_moment_array(end_list))
+
+    def to_intervals(self) -> List[Interval]:
+        """
+        Returns:
+            List[Interval]: intervals of datetimes (or Moments for int64 arrays)
+        """
+        return list(self)
+
+    @property
+    def starts(self) -> np.ndarray:
+        """A read-only array of start times"""
+        return self.__starts
+
+    @property
+    def ends(self) -> np.ndarray:
+        """A read-only array of end times"""
+        return self.__ends
+
+    @property
+    def is_tick(self) -> bool:
+        """True if values are int64 ticks of to_dt.Moment"""
+        return self.__starts.dtype == np.int64
+
+    def __len__(self) -> int:
+        return len(self.__starts)
+
+    def __getitem__(self, key: Any) -> Union[Interval, "IntervalArray"]:
+        if isinstance(key, (int, np.integer)):
+            return Interval(
+                self.__to_moment(self.__starts[key]),
+                self.__to_moment(self.__ends[key]),
+            )
+        return IntervalArray(self.__starts[key], self.__ends[key])
+
+    def __iter__(self) -> Iterator[Interval]:
+        for start, end in zip(self.__starts.tolist(), self.__ends.tolist()):
+            if self.is_tick:
+                yield Interval(to_dt.Moment(start), to_dt.Moment(end))
+            else:
+                yield Interval(start, end)
+
+    def __repr__(self) -> str:
+        return f"IntervalArray({len(self)} intervals, {self.__starts.dtype})"
+
+    def index_of(self, moments: Any) -> np.ndarray:
+        """Returns the index of the interval occupying each moment
+        by a binary search over starts (numpy.searchsorted)
+
+        Intervals must be sorted by start and must not overlap
+        (e.g. activities of a machine schedule); a moment is in [start, end)
+        of the last interval starting at or before it
+
+        Args:
+            moments (Any): a moment or an array-like of moments
+
+        Returns:
+            np.ndarray: indices of intervals (-1 if no interval occupies the moment)
+        """
+        values = to_moment_array(moments)
+        if values.size == 0 or len(self) == 0:
+            return np.full(values.shape, -1, dtype=np.intp)
+        idx = np.searchsorted(self.__starts, values, side="right") - 1
+        # idx of -1 is checked with the first interval, and then dropped
+        occupied = (idx >= 0) & (values < self.__ends[np.maximum(idx, 0)])
+        return np.where(occupied, idx, -1)
+
+    def duration(self) -> np.ndarray:
+        """Returns durations of the intervals
+
+        Returns:
+            np.ndarray: (end - start) in timedelta64[us] or int64 ticks
+        """
+        return self.__ends - self.__starts
+
+    def contains(self, moments: Any) -> np.ndarray:
+        """Returns true if moments are in the (closed) intervals
+
+        Args:
+            moments (Any): a moment or an array-like of moments
+                (e.g. moments[:, None] to test every moment in every interval)
+
+        Returns:
+            np.ndarray: a boolean array
+        """
+        values = to_moment_array(moments)
+        return (self.__starts <= values) & (values <= self.__ends)
+
+    def is_distinct(
+        self, other: Union[Interval, "IntervalArray"]
+    ) -> np.ndarray:
+        """Returns true if two intervals are distinct (considering a point overlay)
+
+        Args:
+            other (Union[Interval, IntervalArray]): intervals to be compared
+
+        Raises:
+            TypeError: {other} is not an interval instance
+
+        Returns:
+            np.ndarray: a boolean array
+        """
+        other_starts, other_ends = self.__operand_values(other)
+        return (self.__ends <= other_starts) | (other_ends <= self.__starts)
+
+    def intersect(
+        self, other: Union[Interval, "IntervalArray"]
+    ) -> "IntervalArray":
+        """Returns the intersections of the pairs that are not distinct
+        (use ~is_distinct(other) to find the pairs)
+
+        Args:
+            other (Union[Interval, IntervalArray]): intervals to be referred
+
+        Raises:
+            TypeError: {other} is not an interval instance
+
+        Returns:
+            IntervalArray: the intersections in the order of the pairs
+        """
+        other_starts, other_ends = self.__operand_values(other)
+        starts = np.maximum(self.__starts, other_starts)
+        ends = np.minimum(self.__ends, other_ends)
+        overlapped = ~(
+            (self.__ends <= other_starts) | (other_ends <= self.__starts)
+        )
+        return IntervalArray(starts[overlapped], ends[overlapped])
+
+    def overlap_pairs(
+        self, other: "IntervalArray", chunk_size: int = 1024
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns indices of every pair of intervals that are not distinct
+
+        Pairs are compared by blocks of chunk_size intervals of self,
+        so that memory is bounded by chunk_size * len(other)
+
+        Args:
+            other (IntervalArray): intervals to be compared
+            chunk_size (int, optional): the number of rows of a block. Defaults to 1024.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: indices of self and other of the pairs
+        """
+        other_starts, other_ends = self.__operand_values(other)
+        self_index_list = [np.empty(0, dtype=np.intp)]
+        other_index_list = [np.empty(0, dtype=np.intp)]
+        for first in range(0, len(self), chunk_size):
+            starts = self.__starts[first : first + chunk_size, None]
+            ends = self.__ends[first : first + chunk_size, None]
+            overlapped = (starts < other_ends) & (other_starts < ends)
+            self_index, other_index = np.nonzero(overlapped)
+            self_index_list.append(self_index + first)
+            other_index_list.append(other_index)
+        return (
+            np.concatenate(self_index_list),
+            np.concatenate(other_index_list),
+        )
+
+    def clip_to(self, horizon: Interval) -> Tuple["IntervalArray", np.ndarray]:
+        """Trims the intervals that are not distinct from a horizon
+        to conform with the horizon
+
+        Intervals distinct from the horizon (see is_distinct) are dropped
+        instead of becoming empty intervals on its boundary; the returned
+        mask finds the rows of the clipped intervals
+
+        Args:
+            horizon (Interval): a reference horizon
+
+        Returns:
+            Tuple[IntervalArray, np.ndarray]: the clipped intervals in the same order,
+                and a boolean array of the rows overlapping the horizon
+        """
+        horizon_start, horizon_end = self.__operand_values(horizon)
+        overlapped = ~self.is_distinct(horizon)
+        return (
+            IntervalArray(
+                np.maximum(self.__starts[overlapped], horizon_start),
+                np.minimum(self.__ends[overlapped], horizon_end),
+            ),
+            overlapped,
+        )
+
+    def __operand_values(
+        self, other: Union[Interval, "IntervalArray"]
+    ) -> Tuple[Any, Any]:
+        if isinstance(other, IntervalArray):
+            return (other.starts, other.ends)
+        elif isinstance(other, Interval):
+            return (
+                to_moment_array(other.start),
+                to_moment_array(other.end),
+            )
+        raise TypeError(f"{other} is not an interval instance")
+
+    def __to_moment(self, value: Any) -> Union[dt.datetime, to_dt.Moment]:
+        if self.is_tick:
+            return to_dt.Moment(int(value))
+        return value.astype(dt.datetime)
+
+
+def to_moment_array(moments: Any) -> np.ndarray:
+    """Converts moments to an array of IntervalArray values
+
+    Args:
+        moments (Any): a datetime, a Moment, or an array-like of them
+            (datetime64 and integer arrays are converted without a Python loop;
+            timezone-aware datetimes are converted to UTC)
+
+    Raises:
+        TypeError: the type of moments is not supported,
+            or naive and timezone-aware datetimes are mixed
+
+    Returns:
+        np.ndarray: datetime64[us] values, or int64 ticks for Moments
+    """
+    if isinstance(moments, to_dt.Moment):
+        return np.asarray(int(moments), dtype=np.int64)
+    if isinstance(moments, dt.datetime):
+        return _datetimes_to_array([moments]).reshape(())
+    if not isinstance(moments, np.ndarray):
+        moments = list(moments)
+        if moments and isinstance(moments[0], dt.datetime):
+            return _datetimes_to_array(moments)
+    values = np.asarray(moments)
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[us]", copy=False)
+    elif values.dtype.kind in "iu":
+        return values.astype(np.int64, copy=False)
+    elif values.dtype.kind == "O":
+        if values.size and isinstance(values.flat[0], to_dt.Moment):
+            return values.astype(np.int64)
+        return _datetimes_to_array(values.ravel().tolist()).reshape(
+            values.shape
+        )
+    elif values.size == 0:
+        return values.astype(np.int64)
+    raise TypeError(f"moments of {values.dtype} are not supported")
+
+
+def _datetimes_to_array(moment_list: List[dt.datetime]) -> np.ndarray:
+    # integer microseconds are several times faster than NumPy's
+    # conversion of datetime objects; aware datetimes are taken from
+    # the UTC epoch (subtraction raises TypeError for mixed ones)
+    epoch = UNIX_EPOCH
+    if moment_list and moment_list[0].tzinfo is not None:
+        epoch = UTC_EPOCH
+    return np.fromiter(
+        ((moment - epoch) // MICROSECOND for moment in moment_list),
+        dtype=np.int64,
+        count=len(moment_list),
+    ).view("datetime64[us]")
+
+
 def main():
     interval1 = Interval(2, 10)
     print("interval1:", interval1, "with duration", interval1.duration())
@@ -183,6 +523,16 @@ def main():
     )
     print([interval1, interval2, interval3])
 
+    interval_array = IntervalArray.from_intervals(
+        [interval1, interval2, interval3]
+    )
+    print(interval_array, interval_array.duration())
+    print("Is distinct?:", interval_array.is_distinct(interval1))
+    print("Intersections:", interval_array.intersect(interval1).to_intervals())
+    print("Overlapping pairs:", interval_array.overlap_pairs(interval_array))
+    clipped, overlapped = interval_array.clip_to(Interval(9, 11))
+    print("Clipped:", clipped.to_intervals(), "of rows", overlapped.nonzero())
+
 
 if __name__ == "__main__":
     main()
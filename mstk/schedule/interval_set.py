@@ -0,0 +1,297 @@
+""" Set of disjoint intervals with linear-time set operations
+Created on 17th Oct. 2026
+"""
+from __future__ import annotations
+
+__all__ = ["IntervalSet"]
+
+# common Python packages
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Tuple,
+    Any,
+    Iterable,
+    Iterator,
+)
+
+import bisect
+import datetime as dt
+
+# defined packages
+from mstk.schedule.interval import Interval
+from mstk.schedule.activity import Activity
+
+if TYPE_CHECKING:
+    from mstk.schedule.machine import MCSchedule
+
+
+class IntervalSet:
+    """A set of moments stored as sorted, disjoint and merged intervals
+
+    Each interval [start, end) is half-open as in Interval.is_distinct,
+    so that touching intervals are merged and empty intervals are dropped.
+    Union, intersection and difference sweep both sets once,
+    taking O(n + m) time for sets of n and m intervals.
+
+    Example:
+        available = IntervalSet.idle_of(mc_schedule) - shifts_off
+        unavailable = available.complement(horizon)
+    """
+
+    __slots__ = ["__starts", "__ends"]
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        """
+        Args:
+            intervals (Iterable[Interval], optional): intervals in any order
+        """
+        self.__starts: List[Any] = []
+        self.__ends: List[Any] = []
+        self.__merge_sorted(
+            sorted(
+                (interval.dt_range() for interval in intervals),
+                key=lambda dt_range: dt_range[0],
+            )
+        )
+
+    @classmethod
+    def from_ranges(
+        cls, dt_ranges: Iterable[Tuple[Any, Any]]
+    ) -> "IntervalSet":
+        """Creates a set from (start, end) tuples in any order
+
+        Args:
+            dt_ranges (Iterable[Tuple[Any, Any]]): (start, end) of intervals
+
+        Returns:
+            IntervalSet
+        """
+        interval_set = cls()
+        interval_set.__merge_sorted(
+            sorted(dt_ranges, key=lambda dt_range: dt_range[0])
+        )
+        return interval_set
+
+    @classmethod
+    def from_activities(cls, ac_iterable: Iterable[Activity]) -> "IntervalSet":
+        """Creates a set of the intervals of activities
+        (e.g. mc_schedule.actual_ac_iter() or mc_schedule.idle_ac_iter())
+
+        Args:
+            ac_iterable (Iterable[Activity]): activities in any order
+
+        Returns:
+            IntervalSet
+        """
+        return cls.from_ranges(ac.interval.dt_range() for ac in ac_iterable)
+
+    @classmethod
+    def busy_of(cls, mc_schedule: "MCSchedule") -> "IntervalSet":
+        """Creates a set of the time occupied by operations and breakdowns
+
+        Args:
+            mc_schedule (MCSchedule)
+
+        Returns:
+            IntervalSet
+        """
+        return cls.from_activities(mc_schedule.actual_ac_iter())
+
+    @classmethod
+    def idle_of(cls, mc_schedule: "MCSchedule") -> "IntervalSet":
+        """Creates a set of the idle time of a machine schedule
+
+        Args:
+            mc_schedule (MCSchedule)
+
+        Returns:
+            IntervalSet
+        """
+        # gaps are sorted and disjoint (no Idle instances are created)
+        interval_set = cls()
+        interval_set.__merge_sorted(mc_schedule.gap_iter())
+        return interval_set
+
+    def __len__(self) -> int:
+        return len(self.__starts)
+
+    def __iter__(self) -> Iterator[Interval]:
+        for start, end in zip(self.__starts, self.__ends):
+            yield Interval(start, end)
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.__starts == other.__starts and self.__ends == other.__ends
+
+    def __contains__(self, moment: Any) -> bool:
+        idx = bisect.bisect_right(self.__starts, moment) - 1
+        return idx >= 0 and moment < self.__ends[idx]
+
+    def __or__(self, other: "IntervalSet") -> "IntervalSet":
+        return self.union(other)
+
+    def __and__(self, other: "IntervalSet") -> "IntervalSet":
+        return self.intersection(other)
+
+    def __sub__(self, other: "IntervalSet") -> "IntervalSet":
+        return self.difference(other)
+
+    def dt_ranges(self) -> Iterator[Tuple[Any, Any]]:
+        """
+        Yields:
+            Iterator[Tuple[Any, Any]]: (start, end) of the intervals
+        """
+        return zip(self.__starts, self.__ends)
+
+    def duration(self) -> Any:
+        """Returns the total length of the intervals
+
+        Returns:
+            Any: timedelta (or integer ticks for Moments);
+                datetime.timedelta(0) for an empty set
+        """
+        if not self.__starts:
+            return dt.timedelta(0)
+        total = self.__ends[0] - self.__starts[0]
+        for start, end in zip(self.__starts[1:], self.__ends[1:]):
+            total += end - start
+        return total
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        """Returns moments in either set
+
+        Args:
+            other (IntervalSet)
+
+        Returns:
+            IntervalSet
+        """
+        dt_range_list: List[Tuple[Any, Any]] = []
+        i, j = 0, 0
+        n, m = len(self.__starts), len(other.__starts)
+        while i < n or j < m:
+            if j >= m or (i < n and self.__starts[i] <= other.__starts[j]):
+                dt_range_list.append((self.__starts[i], self.__ends[i]))
+                i += 1
+            else:
+                dt_range_list.append((other.__starts[j], other.__ends[j]))
+                j += 1
+        interval_set = IntervalSet()
+        interval_set.__merge_sorted(dt_range_list)
+        return interval_set
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        """Returns moments in both sets
+
+        Args:
+            other (IntervalSet)
+
+        Returns:
+            IntervalSet
+        """
+        interval_set = IntervalSet()
+        i, j = 0, 0
+        n, m = len(self.__starts), len(other.__starts)
+        while i < n and j < m:
+            start = max(self.__starts[i], other.__starts[j])
+            end = min(self.__ends[i], other.__ends[j])
+            if start < end:
+                interval_set.__starts.append(start)
+                interval_set.__ends.append(end)
+            if self.__ends[i] < other.__ends[j]:
+                i += 1
+            else:
+                j += 1
+        return interval_set
+
+    def difference(self, other: "IntervalSet") -> "IntervalSet":
+        """Returns moments in this set but not in other
+
+        Args:
+            other (IntervalSet)
+
+        Returns:
+            IntervalSet
+        """
+        interval_set = IntervalSet()
+        j = 0
+        m = len(other.__starts)
+        for start, end in zip(self.__starts, self.__ends):
+            current = start
+            # intervals of other ending before this one are never used again
+            while j < m and other.__ends[j] <= current:
+                j += 1
+            k = j
+            while k < m and other.__starts[k] < end:
+                if current < other.__starts[k]:
+                    interval_set.__starts.append(current)
+                    interval_set.__ends.append(other.__starts[k])
+                current = max(current, other.__ends[k])
+                if current >= end:
+                    break
+                k += 1
+            if current < end:
+                interval_set.__starts.append(current)
+                interval_set.__ends.append(end)
+            j = k
+        return interval_set
+
+    def complement(self, horizon: Interval) -> "IntervalSet":
+        """Returns moments in horizon but not in this set
+
+        Args:
+            horizon (Interval): a reference horizon
+
+        Returns:
+            IntervalSet
+        """
+        return IntervalSet([horizon]).difference(self)
+
+    def __merge_sorted(self, dt_ranges: Iterable[Tuple[Any, Any]]):
+        # appends (start, end) sorted by start, merging overlaps
+        starts = self.__starts
+        ends = self.__ends
+        for start, end in dt_ranges:
+            if not start < end:
+                continue
+            if ends and start <= ends[-1]:
+                if ends[-1] < end:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+
+
+def main():
+    from mstk.schedule.ac_types import AcTypesParam
+    from mstk.schedule.machine import Machine
+    from mstk.schedule.activity import Breakdown
+
+    ac_types_param = AcTypesParam()
+    horizon = Interval(0, 20)
+    machine_1 = Machine("test machine 1")
+    machine_1.reset_schedule(horizon, ac_types_param)
+    mc_schedule_1 = machine_1.mc_schedule
+    mc_schedule_1.add_activity(
+        Breakdown("bd1", Interval(3, 5), machine_1, ac_types_param)
+    )
+    mc_schedule_1.add_activity(
+        Breakdown("bd2", Interval(12, 14), machine_1, ac_types_param)
+    )
+
+    shifts_off = IntervalSet([Interval(0, 2), Interval(8, 10)])
+    busy = IntervalSet.busy_of(mc_schedule_1)
+    print("busy:", busy)
+    print("idle:", IntervalSet.idle_of(mc_schedule_1))
+    available = (busy | shifts_off).complement(horizon)
+    print("available:", available, available.duration())
+    print("available & idle:", available & IntervalSet.idle_of(mc_schedule_1))
+
+
+if __name__ == "__main__":
+    main()
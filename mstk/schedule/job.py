@@ -1,6 +1,19 @@
-from typing import List, Dict, Any, Iterator, Callable
-
-from mstk.schedule.activity import Operation
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Set,
+    Dict,
+    Any,
+    Iterator,
+    Callable,
+    Optional,
+)
+
+from mstk.schedule.activity import Activity, Operation
+from mstk.schedule.undo_log import UndoLog
+
+if TYPE_CHECKING:
+    from mstk.schedule.machine import Machine
 
 __all__ = ["Job"]
 
@@ -8,12 +21,57 @@ __all__ = ["Job"]
 class Job:
     """A container for job information"""
 
-    __slots__ = ["__job_id", "__operation_list", "__contents"]
+    __slots__ = [
+        "__job_id",
+        "__operation_list",
+        "__operation_set",
+        "__contents",
+        "__undo_log",
+        "__operation_loader",
+    ]
 
     def __init__(self, job_id):
         self.__job_id: str = job_id
         self.__operation_list: List[Operation] = []
+        # the same operations as operation_list for membership checks
+        self.__operation_set: Set[Operation] = set()
         self.__contents: Dict[str, Any] = {}
+        # records inverse edits in transactions of a Schedule
+        self.__undo_log: Optional[UndoLog] = None
+        # creates operation_list on the first access (see defer_operations)
+        self.__operation_loader: Optional[Callable[[], List[Operation]]] = None
+
+    def __reduce__(self):
+        # operations are restored with their machines (see Activity.__reduce__);
+        # undo_log is not pickled
+        self.load_operations()
+        return (
+            Job.from_state,
+            (self.__job_id, self.__contents, self.__operation_list),
+        )
+
+    @classmethod
+    def from_state(
+        cls,
+        job_id: str,
+        contents: Dict[str, Any],
+        operation_list: List[Operation],
+    ) -> "Job":
+        """Creates a job from a pickled state
+
+        Args:
+            job_id (str): an identifier of the job
+            contents (Dict[str, Any]): contents of the job
+            operation_list (List[Operation]): operations of the job
+
+        Returns:
+            Job: the created Job object (without undo_log)
+        """
+        job = cls(job_id)
+        job.__contents = contents
+        job.__operation_list = list(operation_list)
+        job.__operation_set = set(job.__operation_list)
+        return job
 
     @property
     def job_id(self) -> str:
@@ -21,23 +79,60 @@ class Job:
 
     @property
     def operation_list(self) -> List[Operation]:
+        self.load_operations()
         return self.__operation_list
 
+    @property
+    def is_deferred(self) -> bool:
+        """True if operation_list is not created yet (see defer_operations)"""
+        return self.__operation_loader is not None
+
     @property
     def contents(self) -> Dict[str, Any]:
         return self.__contents
 
+    @property
+    def undo_log(self) -> Optional[UndoLog]:
+        return self.__undo_log
+
+    @undo_log.setter
+    def undo_log(self, undo_log: Optional[UndoLog]):
+        self.__undo_log = undo_log
+
+    def defer_operations(self, loader: Callable[[], List[Operation]]):
+        """Defers operation_list to the first access of the operations
+        (e.g. operations of a loaded schedule, see Schedule.from_state)
+
+        Args:
+            loader (Callable[[], List[Operation]]): a function returning
+                the operations in order
+        """
+        self.__operation_loader = loader
+
+    def load_operations(self):
+        """Creates deferred operations (nothing is done if not deferred)"""
+        loader = self.__operation_loader
+        if loader is None:
+            return
+        self.__operation_loader = None
+        self.__operation_list = list(loader())
+        self.__operation_set = set(self.__operation_list)
+
     def add_operation(self, operation: Operation):
         """Adds an operation to the operation list
 
         Args:
             operation (Operation): an operation to be added
         """
-        if operation in self.operation_list:
+        self.load_operations()
+        if operation in self.__operation_set:
             raise KeyError(
                 f"Operation {operation.ac_id} exists in job {self.job_id}"
             )
         self.operation_list.append(operation)
+        self.__operation_set.add(operation)
+        if self.__undo_log is not None:
+            self.__undo_log.record(self.remove_operation, operation)
 
     def remove_operation(self, operation: Operation):
         """Removes an operation to the operation list
@@ -45,7 +140,63 @@ class Job:
         Args:
             operation (Operation): an operation to be removed
         """
-        self.operation_list.remove(operation)
+        self.load_operations()
+        if self.operation_list and self.operation_list[-1] is operation:
+            idx = len(self.operation_list) - 1
+        else:
+            idx = self.operation_list.index(operation)
+        del self.operation_list[idx]
+        self.__operation_set.discard(operation)
+        if self.__undo_log is not None:
+            self.__undo_log.record(self.insert_operation, idx, operation)
+
+    def insert_operation(self, idx: int, operation: Operation):
+        """Inserts an operation at a position of the operation list
+
+        Args:
+            idx (int): a position in the operation list
+            operation (Operation): an operation to be inserted
+        """
+        self.load_operations()
+        if operation in self.__operation_set:
+            raise KeyError(
+                f"Operation {operation.ac_id} exists in job {self.job_id}"
+            )
+        self.operation_list.insert(idx, operation)
+        self.__operation_set.add(operation)
+        if self.__undo_log is not None:
+            self.__undo_log.record(self.remove_operation, operation)
+
+    def copy(self) -> "Job":
+        """Returns a copy of the job with the same operations
+        (operation_list and contents are copied, not shared)
+
+        Returns:
+            Job: the copied Job object (without undo_log)
+        """
+        self.load_operations()
+        job = Job(self.job_id)
+        job.__operation_list = list(self.__operation_list)
+        job.__operation_set = set(self.__operation_set)
+        job.__contents = dict(self.__contents)
+        return job
+
+    def rebind_operations(self, mc: "Machine", ac_dict: Dict[str, Activity]):
+        """Replaces operations on mc with the activities of ac_dict
+        with the same ac_ids (used when a machine is copied)
+
+        Args:
+            mc (Machine): the machine of operations to be replaced
+            ac_dict (Dict[str, Activity]): new activities by ac_id
+        """
+        self.load_operations()
+        self.__operation_list = [
+            ac_dict.get(operation.ac_id, operation)
+            if operation.mc is mc
+            else operation
+            for operation in self.__operation_list
+        ]
+        self.__operation_set = set(self.__operation_list)
 
     def oper_iter(self) -> Iterator[Operation]:
         """
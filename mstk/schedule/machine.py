@@ -3,19 +3,38 @@ Created on 10th Aug. 2020
 """
 from __future__ import annotations
 
-__all__ = ["Machine", "MCSchedule"]
+__all__ = ["Machine", "MCSchedule", "ImplicitIdleMCSchedule"]
 
 # common Python packages
-from typing import List, Dict, Tuple, Any, Iterator, Union, Callable
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    Any,
+    Iterator,
+    Iterable,
+    Union,
+    Callable,
+    Optional,
+    Sequence,
+)
 
 import datetime as dt
 import warnings
+from array import array
 
 # defined packages
 from mstk.schedule import to_dt
-from mstk.schedule.interval import Interval
+from mstk.schedule.interval import Interval, IntervalArray
 from mstk.schedule.activity import Activity, Idle, Operation, Breakdown
 from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.sorted_ac_list import SortedAcList, AcIdList
+from mstk.schedule.gap_index import GapIndex
+from mstk.schedule.undo_log import UndoLog
+from mstk.schedule.job import Job
+
+# storages of activities in MCSchedule
+mc_schedule_backends = ["default", "implicit_idle", "columnar"]
 
 
 class Machine:
@@ -43,17 +62,106 @@ class Machine:
         except:
             raise
 
-    def reset_schedule(self, horizon: Interval, ac_types_param: AcTypesParam):
+    def reset_schedule(
+        self,
+        horizon: Interval,
+        ac_types_param: AcTypesParam,
+        backend: str = "default",
+    ):
         """Reset the mc_schedule
 
         Args:
             horizon (Interval): a new horizon to be assigned
             ac_types_param (AcTypesParam): a container of ac types
+            backend (str, optional): a storage of activities, one of mc_schedule_backends. Defaults to "default".
+
+        Raises:
+            ValueError: **backend** is not valid
         """
-        self.__mc_schedule = MCSchedule(
+        if backend == "default":
+            mc_schedule_class = MCSchedule
+        elif backend == "implicit_idle":
+            mc_schedule_class = ImplicitIdleMCSchedule
+        elif backend == "columnar":
+            # NumPy is required only for the columnar backend
+            from mstk.schedule.columnar import ColumnarMCSchedule
+
+            mc_schedule_class = ColumnarMCSchedule
+        else:
+            raise ValueError(
+                f"backend {backend} is invalid -- try one of {mc_schedule_backends}"
+            )
+        self.__mc_schedule = mc_schedule_class(
             self.mc_id, self, horizon, ac_types_param
         )
 
+    def __reduce__(self):
+        # pickled with the rows of its mc_schedule (see MCSchedule.get_state)
+        # so that jobs and other machines are not pickled together
+        try:
+            mc_schedule = self.__mc_schedule
+        except AttributeError:
+            return (Machine.from_state, (self.mc_id, self.__contents))
+        return (
+            Machine.from_state,
+            (
+                self.mc_id,
+                self.__contents,
+                type(mc_schedule),
+                mc_schedule.horizon,
+                mc_schedule.ac_types_param,
+                mc_schedule.get_state(),
+            ),
+        )
+
+    @classmethod
+    def from_state(
+        cls,
+        mc_id: str,
+        contents: Dict[str, Any],
+        mc_schedule_class: Optional[type] = None,
+        horizon: Optional[Interval] = None,
+        ac_types_param: Optional[AcTypesParam] = None,
+        state: Any = None,
+    ) -> Machine:
+        """Creates a machine from a pickled state
+
+        Args:
+            mc_id (str): an identifier of the machine
+            contents (Dict[str, Any]): contents of the machine
+            mc_schedule_class (type, optional): a class of the mc_schedule
+                (if None, the machine has no mc_schedule)
+            horizon (Interval, optional): the horizon of the mc_schedule
+            ac_types_param (AcTypesParam, optional): a container of ac types
+            state (Any, optional): a state returned by MCSchedule.get_state
+
+        Returns:
+            Machine: the created Machine object
+        """
+        mc = cls(mc_id)
+        mc.__contents.update(contents)
+        if mc_schedule_class is not None:
+            mc.__mc_schedule = mc_schedule_class(
+                mc_id, mc, horizon, ac_types_param
+            )
+            mc.__mc_schedule.set_state(state)
+        return mc
+
+    def copy(self, job_dict: Dict[str, "Job"]) -> Machine:
+        """Returns a copy of the machine with a copy of its mc_schedule
+        (see MCSchedule.copy)
+
+        Args:
+            job_dict (Dict[str, Job]): jobs of the copied operations by job_id
+
+        Returns:
+            Machine: the copied Machine object
+        """
+        mc = Machine(self.mc_id)
+        mc.__contents.update(self.__contents)
+        mc.__mc_schedule = self.mc_schedule.copy(mc, job_dict)
+        return mc
+
     def ac_iter(self) -> Iterator[Activity]:
         """
         Yields:
@@ -104,7 +212,11 @@ class Machine:
 
 
 class MCSchedule:
-    """A schedule consists of activities on a machine"""
+    """A schedule consists of activities on a machine
+
+    Activities are stored in a SortedAcList keyed on their start times,
+    so that lookups, insertions and deletions take logarithmic time
+    """
 
     def __init__(
         self,
@@ -116,7 +228,9 @@ class MCSchedule:
         self.__mc_id: str = mc_id
         self.__mc: Machine = mc
         self.__horizon: Interval = horizon
-        self.__ac_id_list: List[str] = list()
+        self.__ac_list: SortedAcList = SortedAcList()
+        # a live view of ac_ids over __ac_list, which is never replaced
+        self.__ac_id_list: AcIdList = AcIdList(self.__ac_list)
         self.__ac_dict: Dict[str, Activity] = dict()
         self.__ac_types_param = ac_types_param
 
@@ -128,6 +242,15 @@ class MCSchedule:
         self.__ac_cum_counts: Dict[str, int] = {
             ac_type: 0 for ac_type in ac_types_param.all_types
         }
+        # built on the first earliest-fit query, then kept up to date
+        self.__gap_index: Optional[GapIndex] = None
+        # records inverse edits in transactions of a Schedule
+        self.__undo_log: Optional[UndoLog] = None
+        # intervals and ac_ids of ac_iter for ac_ids_at, built on the first
+        # lookup and dropped on every change
+        self.__moment_index: Optional[
+            Tuple[IntervalArray, List[Optional[str]]]
+        ] = None
 
         self.initialize_idle()
 
@@ -144,9 +267,19 @@ class MCSchedule:
         return self.__horizon
 
     @property
-    def ac_id_list(self) -> List[str]:
+    def ac_id_list(self) -> Sequence[str]:
+        """A read-only view of ac_ids in the order of time
+
+        The same view is returned on every call and reflects later changes;
+        it supports len, iteration, indexing and comparison with lists.
+        Copy it with list() to keep the ac_ids of a moment.
+        """
         return self.__ac_id_list
 
+    @property
+    def ac_list(self) -> SortedAcList:
+        return self.__ac_list
+
     @property
     def ac_dict(self) -> Dict[str, Activity]:
         return self.__ac_dict
@@ -163,10 +296,36 @@ class MCSchedule:
     def ac_cum_counts(self) -> Dict[str, int]:
         return self.__ac_cum_counts
 
+    @property
+    def undo_log(self) -> Optional[UndoLog]:
+        return self.__undo_log
+
+    @undo_log.setter
+    def undo_log(self, undo_log: Optional[UndoLog]):
+        self.__undo_log = undo_log
+
+    @property
+    def gap_index(self) -> GapIndex:
+        """An index of idle gaps (built on the first access)"""
+        if self.__gap_index is None:
+            self.__gap_index = GapIndex(self.gap_iter())
+        return self.__gap_index
+
+    @property
+    def is_gap_indexed(self) -> bool:
+        """True if gap_index is built and maintained on every change"""
+        return self.__gap_index is not None
+
+    def reset_gap_index(self):
+        """Drops gap_index; it is built again on the next access"""
+        self.__gap_index = None
+
     def initialize_idle(self):
         """Initialize MCSchedule with an idle activity"""
-        self.__ac_id_list = []
+        self.__ac_list.clear()
         self.__ac_dict = {}
+        self.reset_gap_index()
+        self.__moment_index = None
         idle_type = self.ac_types_param.idle
         idle_id = self.make_ac_id_for_type(idle_type)
         initial_idle = Idle(
@@ -176,16 +335,13 @@ class MCSchedule:
             ac_types_param=self.ac_types_param,
         )
 
-        self.ac_dict[idle_id] = initial_idle
-        self.ac_id_list.append(idle_id)
-
         self.__ac_counts = {
             ac_type: 0 for ac_type in self.ac_types_param.all_types
         }
         self.__ac_cum_counts = {
             ac_type: 0 for ac_type in self.ac_types_param.all_types
         }
-        self.ac_counts[self.ac_types_param.idle] = 1
+        self.insert_ac(initial_idle)
         self.ac_cum_counts[self.ac_types_param.idle] = 1
 
     def make_ac_id_for_type(self, ac_type: str) -> str:
@@ -200,13 +356,152 @@ class MCSchedule:
         return_string = f"{ac_type}-{self.mc_id}-{self.ac_cum_counts[ac_type]}"
         return return_string
 
+    def make_ac_id_for_gap(self, gap_start: dt.datetime) -> str:
+        """Makes ac_id of an idle gap that is not stored with its start time
+
+        Args:
+            gap_start (datetime.datetime): the start time of the gap
+
+        Returns:
+            str: new ac_id
+        """
+        return f"{self.ac_types_param.idle}-{self.mc_id}-{gap_start}"
+
+    def insert_ac(self, ac: Activity):
+        """Stores an activity without checking the occupation of its interval
+        (ac_cum_counts is not changed)
+
+        Args:
+            ac (Activity): an activity to be stored
+        """
+        self.__ac_list.add(ac)
+        self.ac_dict[ac.ac_id] = ac
+        self.__moment_index = None
+        self.__ac_counts[ac.ac_type] += 1
+        if ac.ac_type == self.ac_types_param.idle:
+            self.update_gaps([], [ac.interval.dt_range()])
+        if self.__undo_log is not None:
+            self.__undo_log.record(self.remove_ac, ac)
+
+    def remove_ac(self, ac: Activity):
+        """Removes a stored activity (ac_cum_counts is not changed)
+
+        Args:
+            ac (Activity): an activity to be removed
+        """
+        self.__ac_list.remove(ac)
+        self.ac_dict.pop(ac.ac_id)
+        self.__moment_index = None
+        self.__ac_counts[ac.ac_type] -= 1
+        if ac.ac_type == self.ac_types_param.idle:
+            self.update_gaps([ac.interval.dt_range()], [])
+        if self.__undo_log is not None:
+            self.__undo_log.record(self.insert_ac, ac)
+
+    def change_ac_interval(
+        self, ac: Activity, start: dt.datetime, end: dt.datetime
+    ):
+        """Changes the interval of a stored activity and updates its position
+
+        Args:
+            ac (Activity): a stored activity
+            start (datetime.datetime): a new start time
+            end (datetime.datetime): a new end time
+        """
+        self.remove_ac(ac)
+        if self.__undo_log is not None:
+            self.__undo_log.record(
+                self.set_interval, ac, *ac.interval.dt_range()
+            )
+        self.set_interval(ac, start, end)
+        self.insert_ac(ac)
+
+    @staticmethod
+    def set_interval(ac: Activity, start: dt.datetime, end: dt.datetime):
+        """Changes the interval of an activity that is not stored
+
+        Args:
+            ac (Activity): an activity
+            start (datetime.datetime): a new start time
+            end (datetime.datetime): a new end time
+        """
+        if start > ac.interval.end:
+            ac.change_end_time(end)
+            ac.change_start_time(start)
+        else:
+            ac.change_start_time(start)
+            ac.change_end_time(end)
+
+    def update_gaps(
+        self,
+        old_gaps: List[Tuple[dt.datetime, dt.datetime]],
+        new_gaps: List[Tuple[dt.datetime, dt.datetime]],
+    ):
+        """Replaces idle gaps in gap_index (nothing is done until it is built)
+
+        Args:
+            old_gaps (List[Tuple[dt.datetime, dt.datetime]]): (start, end) of removed gaps
+            new_gaps (List[Tuple[dt.datetime, dt.datetime]]): (start, end) of added gaps
+                (gaps of duration 0 are ignored in both lists)
+        """
+        if self.__gap_index is None:
+            return
+        for gap_start, gap_end in old_gaps:
+            if gap_start < gap_end:
+                self.__gap_index.remove(gap_start)
+        for gap_start, gap_end in new_gaps:
+            if gap_start < gap_end:
+                self.__gap_index.add(gap_start, gap_end)
+
+    def gap_iter(
+        self, moment: Optional[dt.datetime] = None
+    ) -> Iterator[Tuple[dt.datetime, dt.datetime]]:
+        """Yields (start, end) of idle activities
+
+        Args:
+            moment (datetime.datetime, optional): if given, yields gaps ending after moment
+
+        Yields:
+            Iterator[Tuple[dt.datetime, dt.datetime]]
+        """
+        ac_iter = (
+            self.__ac_list if moment is None else self.ac_iter_from(moment)
+        )
+        idle_type = self.ac_types_param.idle
+        for ac in ac_iter:
+            if ac.ac_type == idle_type:
+                yield ac.interval.dt_range()
+
+    def earliest_fit(
+        self, release: dt.datetime, duration: dt.timedelta
+    ) -> Optional[dt.datetime]:
+        """Returns the earliest start of an idle interval of the duration
+        that does not precede release
+
+        The first call builds gap_index in linear time;
+        later calls take logarithmic time as the index is kept up to date
+        by add_activity and del_activities_in_interval
+
+        Args:
+            release (datetime.datetime): the earliest possible start
+            duration (datetime.timedelta): the duration of the interval
+                (integer ticks on a horizon of to_dt.Moment)
+
+        Returns:
+            Optional[dt.datetime]: the start time, None if no idle gap fits
+        """
+        _release = max(to_dt.to_moment_value(release), self.horizon.start)
+        if self.after_horizon_end(_release):
+            return None
+        return self.gap_index.earliest_fit(_release, duration)
+
     def ac_iter(self) -> Iterator[Activity]:
         """
         Yields:
             Iterator[Activity]
         """
-        for ac_id in self.ac_id_list:
-            yield self.ac_dict[ac_id]
+        for ac in self.__ac_list:
+            yield ac
 
     def ac_iter_of_types(self, ac_type_list: List[str]) -> Iterator[Activity]:
         """
@@ -222,8 +517,7 @@ class MCSchedule:
             raise KeyError(
                 f"List {ac_type_list} contains an unsupported activity type"
             )
-        for ac_id in self.ac_id_list:
-            ac = self.ac_dict[ac_id]
+        for ac in self.__ac_list:
             if ac.ac_type in ac_type_list:
                 yield ac
 
@@ -232,8 +526,7 @@ class MCSchedule:
         Yields:
             Iterator[Opearation]
         """
-        for ac_id in self.ac_id_list:
-            ac = self.ac_dict[ac_id]
+        for ac in self.__ac_list:
             if ac.ac_type == self.ac_types_param.operation:
                 yield ac
 
@@ -242,8 +535,7 @@ class MCSchedule:
         Yields:
             Iterator[Opearation, Breakdown, Activity]
         """
-        for ac_id in self.ac_id_list:
-            ac = self.ac_dict[ac_id]
+        for ac in self.__ac_list:
             if ac.ac_type == self.ac_types_param.idle:
                 continue
             else:
@@ -254,13 +546,63 @@ class MCSchedule:
         Yields:
             Iterator[Idle]
         """
-        for ac_id in self.ac_id_list:
-            ac = self.ac_dict[ac_id]
+        for ac in self.__ac_list:
             if ac.ac_type != self.ac_types_param.idle:
                 continue
             else:
                 yield ac
 
+    def ac_iter_from(self, moment: dt.datetime) -> Iterator[Activity]:
+        """Yields activities from the first one that ends after moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Yields:
+            Iterator[Activity]
+        """
+        for ac in self.__ac_list.iter_from_moment(moment):
+            if ac.interval.end > moment:
+                yield ac
+
+    def ac_iter_in(self, interval: Interval) -> Iterator[Activity]:
+        """Yields activities that are not distinct from interval
+        (see Interval.is_distinct), starting with a binary search
+
+        Args:
+            interval (Interval): a window of time
+
+        Yields:
+            Iterator[Activity]
+        """
+        for ac in self.ac_iter_from(interval.start):
+            if not ac.interval.start < interval.end:
+                break
+            yield ac
+
+    def actual_ac_iter_within(
+        self, interval: Interval
+    ) -> Iterator[Union[Operation, Breakdown]]:
+        """Yields operations and breakdowns in the closed interval
+        (activities of duration 0 on its boundaries are included),
+        starting with a binary search
+
+        Args:
+            interval (Interval): a window of time
+
+        Yields:
+            Iterator[Union[Operation, Breakdown]]
+        """
+        loc = self.ac_list.ceil_loc(interval.start)
+        if loc is None:
+            return
+        idle_type = self.ac_types_param.idle
+        for ac in self.ac_list.iter_from_loc(loc):
+            if interval.end < ac.interval.start:
+                break
+            if ac.interval.end <= interval.end and ac.ac_type != idle_type:
+                yield ac
+
     def hbar_tuple_list(self) -> List[Tuple[dt.datetime, dt.timedelta]]:
         """Returns a horizontal bar tuple list
 
@@ -272,8 +614,7 @@ class MCSchedule:
         """
         warnings.warn("This module is replaced by ac_iter", DeprecationWarning)
         return_list = list()
-        for ac_id in self.ac_id_list:
-            ac = self.ac_dict[ac_id]
+        for ac in self.__ac_list:
             return_list.append(ac.interval.start_duration_tuple())
         return return_list
 
@@ -283,10 +624,7 @@ class MCSchedule:
         Args:
             ac_id (str)
         """
-        _ac_type = self.ac_dict[ac_id].ac_type
-        self.ac_counts[_ac_type] -= 1
-        self.ac_id_list.remove(ac_id)
-        self.ac_dict.pop(ac_id)
+        self.remove_ac(self.ac_dict[ac_id])
 
     def before_horizon_start(self, moment: dt.datetime) -> bool:
         """Check if d_moment starts before the horizon
@@ -322,7 +660,7 @@ class MCSchedule:
         Returns:
             bool: True if no error is found
         """
-        _moment = to_dt.to_dt_datetime(moment)
+        _moment = to_dt.to_moment_value(moment)
         if self.before_horizon_start(_moment):
             err_str = f"Moment {moment} before horizon start "
             err_str += f" {self.horizon.start} of machine {self.mc_id}"
@@ -346,45 +684,115 @@ class MCSchedule:
             str: ac_id of the Activity instance occupying moment
                  if moment is boundary, latter ac_id is returned
         """
-        _moment = to_dt.to_dt_datetime(moment)
+        _moment = to_dt.to_moment_value(moment)
         self.error_if_moment_outside_horizon(_moment)
-        return_id: str
-        for ac in self.ac_iter():
-            if ac.includes(_moment) and ac.interval.end != _moment:
-                return_id = ac.ac_id
-                break
-        if "return_id" in locals():
-            return return_id
+        ac = self.__ac_list.floor(_moment)
+        if ac is not None and _moment < ac.interval.end:
+            return ac.ac_id
         e_str = "No Activity instance occupying moment "
         e_str += f"{moment} of machine {self.mc_id}"
         raise SyntaxError(e_str)
 
+    def ac_at(self, moment: dt.datetime) -> Optional[Activity]:
+        """Returns the activity occupying moment (a binary search)
+        if moment is boundary, latter activity is returned
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Optional[Activity]: None if no activity occupies moment
+                (e.g. moment is outside the horizon)
+        """
+        _moment = to_dt.to_moment_value(moment)
+        if not (self.horizon.start <= _moment < self.horizon.end):
+            return None
+        ac = self.__ac_list.floor(_moment)
+        if ac is not None and _moment < ac.interval.end:
+            return ac
+        return None
+
+    def ac_ids_at(self, moments: Any) -> List[Optional[str]]:
+        """Returns ac_ids of the activities occupying each of moments
+        (if a moment is boundary, latter ac_id is returned)
+
+        Moments are located at once with numpy.searchsorted over the starts
+        of activities, so that k moments take O(k log n) time for
+        n activities; the arrays of the activities are built on the first
+        lookup (O(n) time) and kept until the schedule changes
+
+        Args:
+            moments (Any): a list or an array of moments
+                (datetime64 or int64 arrays are not converted in a Python loop)
+
+        Returns:
+            List[Optional[str]]: ac_ids in the order of moments
+                (None if no activity occupies the moment)
+        """
+        if self.__moment_index is None:
+            ac_list = list(self.ac_iter())
+            # the last element is taken for the index -1 (no activity)
+            self.__moment_index = (
+                IntervalArray.from_intervals(ac.interval for ac in ac_list),
+                [ac.ac_id for ac in ac_list] + [None],
+            )
+        interval_array, ac_id_list = self.__moment_index
+        return [
+            ac_id_list[idx]
+            for idx in interval_array.index_of(moments).tolist()
+        ]
+
     def delete_ac_beyond_moment(self, moment: dt.datetime):
         """Deletes all activities beyond moment
-        the end of the activity occupying the moment is changed to the moment
+        the end of the activity occupying the moment is changed to the moment,
+        and the rest of the horizon becomes an idle activity
+        (the same gap as the backends that derive idle gaps)
 
         Args:
             moment (datetime.datetime)
         """
-        _moment = to_dt.to_dt_datetime(moment)
+        _moment = to_dt.to_moment_value(moment)
         # If given moment is beyond MCSchedule horizon, end
         if _moment >= self.horizon.end:
             return
 
+        idle_type = self.ac_types_param.idle
         _ac_id = self.ac_id_of_moment(_moment)
         last_ac = self.ac_dict[_ac_id]
-        if last_ac.interval.start == _moment:
-            last_maintained_idx = self.ac_id_list.index(_ac_id) - 1
-        else:
-            last_maintained_idx = self.ac_id_list.index(_ac_id)
-            self.ac_dict[_ac_id].interval.end = _moment
-        removal_ac_count = len(self.ac_id_list) - last_maintained_idx - 1
+        if last_ac.interval.start != _moment:
+            # an idle activity occupying moment is extended below instead
+            if last_ac.ac_type != idle_type:
+                self.change_ac_interval(
+                    last_ac, last_ac.interval.start, _moment
+                )
+            last_ac = self.__ac_list.next_of(last_ac)
+
+        while last_ac is not None:
+            removed_ac = self.__ac_list.last()
+            self.remove_ac(removed_ac)
+            if removed_ac is last_ac:
+                break
 
-        for _ in range(removal_ac_count):
-            _ac_type = self.ac_dict[self.ac_id_list[-1]].ac_type
-            self.ac_counts[_ac_type] -= 1
-            del self.ac_dict[self.ac_id_list[-1]]
-            self.ac_id_list.pop()
+        # the rest of the horizon is idle
+        last_ac = self.__ac_list.last()
+        if last_ac is not None and last_ac.ac_type == idle_type:
+            self.change_ac_interval(
+                last_ac, last_ac.interval.start, self.horizon.end
+            )
+            return
+        idle_start = (
+            self.horizon.start if last_ac is None else last_ac.interval.end
+        )
+        if idle_start < self.horizon.end:
+            self.insert_ac(
+                Idle(
+                    self.make_ac_id_for_type(idle_type),
+                    Interval(idle_start, self.horizon.end),
+                    self.mc,
+                    self.ac_types_param,
+                )
+            )
+            self.ac_cum_counts[idle_type] += 1
 
     def in_horizon_interval(self, given_interval: Interval) -> bool:
         """Checks whether the given interval conforms to the horizon
@@ -426,12 +834,10 @@ class MCSchedule:
         """
         self.error_if_interval_outside_horizon(given_interval)
         return_list: List[str] = list()
-        for ac in self.ac_iter():
-            ac_end = ac.interval.end
-            if given_interval.start < ac_end:
-                return_list.append(ac.ac_id)
-                if given_interval.end <= ac_end:
-                    break
+        for ac in self.ac_iter_from(given_interval.start):
+            return_list.append(ac.ac_id)
+            if given_interval.end <= ac.interval.end:
+                break
         return return_list
 
     def is_idle_only(self, given_interval: Interval) -> bool:
@@ -463,18 +869,15 @@ class MCSchedule:
         """
         _interval = ac.interval
 
-        if (_interval.duration().total_seconds() == 0) and (
+        if (_interval.start == _interval.end) and (
             _interval.end == self.horizon.end
         ):
             if ac.ac_type == self.ac_types_param.idle:
                 raise ValueError(
                     "An idle job with duration 0 is not allowed to insert"
                 )
-            self.ac_id_list.append(ac.ac_id)
-            self.ac_dict[ac.ac_id] = ac
-            self.ac_counts[ac.ac_type] += 1
+            self.insert_ac(ac)
             self.ac_cum_counts[ac.ac_type] += 1
-            # target_ac = self.ac_dict[self.ac_id_list[-1]]
             print(f"Warning: {ac} has duration of 0")
             return True
 
@@ -487,7 +890,6 @@ class MCSchedule:
         # Only one activity (idle) is on the target interval
         target_ac_id = self.ac_id_list_of_interval(_interval)[0]
         target_ac = self.ac_dict[target_ac_id]
-        target_ac_idx = self.ac_id_list.index(target_ac_id)
 
         idle_type = self.ac_types_param.idle
 
@@ -502,11 +904,9 @@ class MCSchedule:
                 idle_id, new_interval, self.mc, self.ac_types_param
             )
             added_ac_list.append(idle_after_ac)
-            self.ac_counts[idle_type] += 1
             self.ac_cum_counts[idle_type] += 1
 
         added_ac_list.append(ac)
-        self.ac_counts[ac.ac_type] += 1
         self.ac_cum_counts[ac.ac_type] += 1
 
         new_start_time: dt.datetime
@@ -518,162 +918,1114 @@ class MCSchedule:
                 idle_id, new_interval, self.mc, self.ac_types_param
             )
             added_ac_list.append(idle_before_ac)
-            self.ac_counts[idle_type] += 1
             self.ac_cum_counts[idle_type] += 1
 
-        self.delete_ac_id(target_ac_id)
+        self.remove_ac(target_ac)
 
         for added_ac in added_ac_list:
-            self.ac_id_list.insert(target_ac_idx, added_ac.ac_id)
-            self.ac_dict[added_ac.ac_id] = added_ac
+            self.insert_ac(added_ac)
 
         if ac.interval.duration() == 0:
             print(f"Warning: {ac} has duration of 0")
         return True
 
-    def del_activities_in_interval(self, given_interval: Interval):
-        """Deletes all activities within given interval
-        and fill empty space with idle activity
-
-        Args:
-            given_interval (Interval)
-        """
-        idle_type = self.ac_types_param.idle
-        self.error_if_interval_outside_horizon(given_interval)
-
-        target_ac_id_list = self.ac_id_list_of_interval(given_interval)
-        first_ac_idx = self.ac_id_list.index(target_ac_id_list[0])
-        last_ac_idx = self.ac_id_list.index(target_ac_id_list[-1])
-
-        before_is_idle: bool
-        if first_ac_idx == 0:
-            before_is_idle = False
-            new_start_time = self.horizon.start
-        else:
-            ac_before_target = self.ac_dict[self.ac_id_list[first_ac_idx - 1]]
-            before_is_idle = ac_before_target.ac_type == idle_type
-            if not before_is_idle:
-                new_start_time = ac_before_target.interval.end
-
-        after_is_idle: bool
-        if last_ac_idx == len(self.ac_id_list) - 1:
-            after_is_idle = False
-            new_end_time = self.horizon.end
-        else:
-            ac_after_target = self.ac_dict[self.ac_id_list[last_ac_idx + 1]]
-            after_is_idle = ac_after_target.ac_type == idle_type
-            if after_is_idle:
-                new_end_time = ac_after_target.interval.end
-            else:
-                new_end_time = ac_after_target.interval.start
+    def add_activities(self, ac_iterable: Iterable[Activity]) -> int:
+        """Adds activities at once; the stored activities are rebuilt
+        in a single pass in O(n log n) instead of add_activity for each
 
-        for ac_id in target_ac_id_list:
-            self.delete_ac_id(ac_id)
+        Idle activities are created again for every gap,
+        with ac_ids numbered in the order of time
 
-        # if two neighboring operations if target_ops are idle,
-        # ----------<=given interval=>----------------
-        # -|=idle1=||====target_ops====||=idle2=|-----
-        # remove the latter one and change the end time of former one
-        # -|===============idle1================|-----
-        if before_is_idle and after_is_idle:
-            self.delete_ac_id(ac_after_target.ac_id)
-            ac_before_target.change_end_time(new_end_time)
+        Args:
+            ac_iterable (Iterable[Activity]): operations and breakdowns
 
-        # if only a neighboring operation of the first element
-        # of target_ops are idle,
-        # ----------<=given interval=>----------------
-        # -|=idle=||====target_ops====||=job=|--------
-        # change the end time of the idle operation
-        # -|===========idle===========||=job=|--------
-        if before_is_idle and not after_is_idle:
-            ac_before_target.change_start_time(new_start_time)
+        Raises:
+            ValueError: an activity is an idle, out of the horizon,
+                or overlaps another (nothing is added)
 
-        # if only a neighboring operation of the last element
-        # of target_ops are idle,
-        # ----------<=given interval=>----------------
-        # -|=job=||====target_ops====||=idle=|--------
-        # change the start time of the idle operation
-        # -|=job=||===========idle===========|--------
-        if not before_is_idle and after_is_idle:
-            ac_after_target.change_start_time(new_start_time)
+        Returns:
+            int: the number of added activities
+        """
+        new_ac_list = list(ac_iterable)
+        sorted_ac_list = self.validate_new_acs(new_ac_list)
+        for ac in new_ac_list:
+            self.ac_cum_counts[ac.ac_type] += 1
+        self.load_sorted_acs(sorted_ac_list)
+        return len(new_ac_list)
 
-        # if either of neighboring operations of target_ops are not idle,
-        # ----------<=given interval=>----------------
-        # -|=job=||====target_ops======||=job=|-------
-        # create idle job and put it in the target_idx_first sequence
-        # -|=job=||========idle========||=job=|-------
-        if not before_is_idle and not after_is_idle:
-            idle_id = self.make_ac_id_for_type(idle_type)
-            new_idle_activity = Idle(
-                idle_id, idle_type, Interval(new_start_time, new_end_time)
-            )
-            self.ac_id_list.insert(first_ac_idx, idle_id)
-            self.ac_dict[idle_id] = new_idle_activity
-            self.ac_counts[idle_type] += 1
-            self.ac_cum_counts[idle_type] += 1
+    def validate_new_acs(
+        self, ac_iterable: Iterable[Activity]
+    ) -> List[Activity]:
+        """Sorts new activities together with the stored actual activities
+        and checks overlaps in a linear sweep
 
-    def idle_interval_list(self, release_date: dt.datetime) -> List[Interval]:
-        """Returns a list of idle activities
+        An activity of duration 0 may start at the start or the end of
+        another activity, but not inside it
 
         Args:
-            release_date (datetime.datetime)
+            ac_iterable (Iterable[Activity]): operations and breakdowns
+
+        Raises:
+            ValueError: an activity is an idle, out of the horizon,
+                or overlaps another
 
         Returns:
-            List[Interval]: list of idle activities beyond release_date
+            List[Activity]: all actual activities sorted by start time
         """
-        return_list: List[Interval] = list()
-        if self.after_horizon_end(release_date):
-            return return_list
-        for ac in self.ac_iter():
+        idle_type = self.ac_types_param.idle
+        new_ac_list: List[Activity] = []
+        for ac in ac_iterable:
+            if ac.ac_type == idle_type:
+                raise ValueError(f"{ac} is an idle activity")
+            self.error_if_interval_outside_horizon(ac.interval)
+            new_ac_list.append(ac)
+
+        # activities of duration 0 precede the one starting at the same time
+        sorted_ac_list = sorted(
+            list(self.actual_ac_iter()) + new_ac_list,
+            key=lambda ac: (
+                ac.interval.start,
+                ac.interval.end != ac.interval.start,
+            ),
+        )
+        prev_ac: Optional[Activity] = None
+        for ac in sorted_ac_list:
             if (
-                ac.ac_type == self.ac_types_param.idle
-                and ac.interval.end >= release_date
+                prev_ac is not None
+                and ac.interval.start < prev_ac.interval.end
             ):
-                return_list.append(ac.interval)
-        return return_list
+                raise ValueError(
+                    f"{ac} overlaps {prev_ac} in Machine {self.mc_id}"
+                )
+            if prev_ac is None or prev_ac.interval.end <= ac.interval.end:
+                prev_ac = ac
+        return sorted_ac_list
 
-    def last_ac_id_of_type(self, target_type: str) -> str:
-        """Returns ac_id of last Activity instance with target_type
+    def load_sorted_acs(self, sorted_ac_list: List[Activity]):
+        """Replaces the stored activities with actual activities
+        checked by validate_new_acs (ac_cum_counts is changed only for
+        the created idle activities)
 
         Args:
-            target_type (str): an ac_type value
-
-        Returns:
-            str: ac_id, "" if no such Activity instance
+            sorted_ac_list (List[Activity]): actual activities sorted by start time
         """
-        target_ac_id: str = ""
-        for ac_id in reversed(self.ac_id_list):
-            if self.ac_dict[ac_id].ac_type == target_type:
-                target_ac_id = ac_id
-                break
-        return target_ac_id
+        if self.__undo_log is not None and self.__undo_log.is_recording:
+            self.__undo_log.record(self.load_stored_acs, list(self.__ac_list))
+        self.load_stored_acs(self.fill_gaps_with_idle(sorted_ac_list))
 
-    def last_ac_interval_of_type(self, target_type: str) -> Interval:
-        """Returns interval of last Activity instance with target_type
+    def load_stored_acs(self, stored_ac_list: List[Activity]):
+        """Replaces the stored activities (for the default storage,
+        with idle activities in every gap)
 
         Args:
-            target_type (str): an ac_type value
+            stored_ac_list (List[Activity]): activities sorted by start time
+        """
+        self.__ac_list.reset(stored_ac_list)
+        self.__ac_dict = {ac.ac_id: ac for ac in stored_ac_list}
+        self.__moment_index = None
+        self.__ac_counts = {
+            ac_type: 0 for ac_type in self.ac_types_param.all_types
+        }
+        for ac in stored_ac_list:
+            self.__ac_counts[ac.ac_type] += 1
+        self.reset_gap_index()
+
+    def __reduce__(self):
+        # pickled as the mc_schedule of its (pickled) machine
+        return (getattr, (self.mc, "mc_schedule"))
+
+    def get_state(self) -> Tuple[Any, ...]:
+        """Returns the stored activities as flat columns to be pickled
+        (undo_log is not included)
 
         Returns:
-            Interval: interval of the Activity instance,
-                      (start, start) if no Activity of target_type
+            Tuple[Any, ...]: ac_cum_counts, starts, ends, type codes
+                (indices of ac_types_param.all_types), job indices
+                (-1 for no job), ac_ids, contents and the table of job_ids
         """
-        return_interval = Interval(self.horizon.start, self.horizon.start)
-        for ac_id in reversed(self.ac_id_list):
-            ac = self.ac_dict[ac_id]
-            if ac.ac_type == target_type:
-                return_interval = ac.interval
-                break
-        return return_interval
+        type_code_dict = {
+            ac_type: code
+            for code, ac_type in enumerate(self.ac_types_param.all_types)
+        }
+        job_index_dict: Dict[str, int] = {}
+        starts: List[Any] = []
+        ends: List[Any] = []
+        type_codes = array("b")
+        job_indices = array("i")
+        ac_ids: List[str] = []
+        contents: List[Dict[str, Any]] = []
+        for ac in self.__ac_list:
+            start, end = ac.interval.dt_range()
+            starts.append(start)
+            ends.append(end)
+            type_codes.append(type_code_dict[ac.ac_type])
+            if isinstance(ac, Operation):
+                job_indices.append(
+                    job_index_dict.setdefault(
+                        ac.job.job_id, len(job_index_dict)
+                    )
+                )
+            else:
+                job_indices.append(-1)
+            ac_ids.append(ac.ac_id)
+            contents.append(ac.contents)
+        return (
+            dict(self.ac_cum_counts),
+            starts,
+            ends,
+            type_codes,
+            job_indices,
+            ac_ids,
+            contents,
+            list(job_index_dict),
+        )
 
-    def intersection(self, other: "MCSchedule"):
-        # self.actual_ac_iter()
-        raise NotImplementedError()
+    def set_state(
+        self,
+        state: Tuple[Any, ...],
+        job_dict: Optional[Dict[str, "Job"]] = None,
+    ):
+        """Replaces the stored activities with a state of get_state
+        (contents of the state are stored as they are)
 
+        Args:
+            state (Tuple[Any, ...]): a state returned by get_state
+            job_dict (Dict[str, Job], optional): jobs of operations by job_id
+                (if None, new jobs with the same job_ids, which hold
+                no operations since jobs are not pickled with a machine)
 
-def main():
-    from mstk.schedule.job import Job
+        Raises:
+            KeyError: the job of an operation is not in job_dict
+        """
+        (
+            ac_cum_counts,
+            starts,
+            ends,
+            type_codes,
+            job_indices,
+            ac_ids,
+            contents,
+            job_id_list,
+        ) = state
+        if job_dict is None:
+            job_list = [Job(job_id) for job_id in job_id_list]
+        else:
+            job_list = [job_dict[job_id] for job_id in job_id_list]
+
+        mc = self.mc
+        ac_types_param = self.ac_types_param
+        all_types = ac_types_param.all_types
+        operation_type = ac_types_param.operation
+        breakdown_type = ac_types_param.breakdown
+        idle_type = ac_types_param.idle
+        stored_ac_list: List[Activity] = []
+        for start, end, code, job_index, ac_id, ac_contents in zip(
+            starts, ends, type_codes, job_indices, ac_ids, contents
+        ):
+            ac_type = all_types[code]
+            interval = Interval(start, end)
+            if ac_type == operation_type:
+                ac = Operation(
+                    ac_id,
+                    interval,
+                    mc,
+                    job_list[job_index],
+                    ac_types_param,
+                    ac_contents,
+                )
+            elif ac_type == breakdown_type:
+                ac = Breakdown(
+                    ac_id, interval, mc, ac_types_param, ac_contents
+                )
+            elif ac_type == idle_type:
+                ac = Idle(ac_id, interval, mc, ac_types_param, ac_contents)
+            else:
+                raise TypeError(
+                    f"{ac_type} cannot be stored in Machine {self.mc_id}"
+                )
+            stored_ac_list.append(ac)
+        self.load_stored_acs(stored_ac_list)
+        self.ac_cum_counts.update(ac_cum_counts)
+
+    def restore_ac(
+        self,
+        ac_type: str,
+        ac_id: str,
+        interval: Interval,
+        job_id: Optional[str],
+        contents: Dict[str, Any],
+    ) -> Activity:
+        """Returns the activity of a pickled activity on this machine
+        (see Activity.__reduce__): the stored one with the same ac_id
+        and interval if any, otherwise a new one with the fields
+
+        Args:
+            ac_type (str): the ac_type of the activity
+            ac_id (str): the ac_id of the activity
+            interval (Interval): the interval of the activity
+            job_id (Optional[str]): the job_id of an operation
+            contents (Dict[str, Any]): the contents of the activity
+
+        Returns:
+            Activity: the restored activity
+        """
+        ac = self.__ac_dict.get(ac_id)
+        if (
+            ac is not None
+            and ac.ac_type == ac_type
+            and ac.interval.dt_range() == interval.dt_range()
+        ):
+            return ac
+        job_dict = {} if job_id is None else {job_id: Job(job_id)}
+        return self.make_ac_of_row(
+            (ac_type, ac_id, interval.start, interval.end, job_id, contents),
+            job_dict,
+        )
+
+    @staticmethod
+    def ac_row(
+        ac: Activity, interval: Optional[Interval] = None
+    ) -> Tuple[Any, ...]:
+        """Returns the fields of an activity without references
+        to the machine and the job objects
+
+        Args:
+            ac (Activity): an activity
+            interval (Interval, optional): an interval of the row
+                (if None, the interval of **ac**)
+
+        Returns:
+            Tuple[Any, ...]: (ac_type, ac_id, start, end, job_id or None, contents)
+        """
+        if interval is None:
+            interval = ac.interval
+        job_id = ac.job.job_id if isinstance(ac, Operation) else None
+        return (
+            ac.ac_type,
+            ac.ac_id,
+            interval.start,
+            interval.end,
+            job_id,
+            ac.contents,
+        )
+
+    def make_ac_of_row(
+        self, row: Tuple[Any, ...], job_dict: Dict[str, "Job"]
+    ) -> Activity:
+        """Creates an activity of self.mc from a row of ac_row
+        (contents are copied)
+
+        Args:
+            row (Tuple[Any, ...]): (ac_type, ac_id, start, end, job_id, contents)
+            job_dict (Dict[str, Job]): jobs of operations by job_id
+
+        Raises:
+            KeyError: the job of an operation is not in job_dict
+            TypeError: ac_type is not an idle, a breakdown or an operation
+
+        Returns:
+            Activity: the created activity
+        """
+        ac_type, ac_id, start, end, job_id, contents = row
+        interval = Interval(start, end)
+        contents = dict(contents)
+        if ac_type == self.ac_types_param.operation:
+            return Operation(
+                ac_id,
+                interval,
+                self.mc,
+                job_dict[job_id],
+                self.ac_types_param,
+                contents,
+            )
+        elif ac_type == self.ac_types_param.breakdown:
+            return Breakdown(
+                ac_id, interval, self.mc, self.ac_types_param, contents
+            )
+        elif ac_type == self.ac_types_param.idle:
+            return Idle(
+                ac_id, interval, self.mc, self.ac_types_param, contents
+            )
+        raise TypeError(f"{ac_type} cannot be stored in Machine {self.mc_id}")
+
+    def slice_rows(
+        self, horizon: Interval, horz_overlap: str
+    ) -> List[Tuple[Any, ...]]:
+        """Returns rows (see ac_row) of operations and breakdowns
+        in a new horizon, found with a binary search (see Schedule.transform)
+
+        Args:
+            horizon (Interval): a new horizon
+            horz_overlap (str): "trim" for activities not distinct from horizon
+                with trimmed intervals, "exclude" for activities in horizon
+
+        Raises:
+            ValueError: **horz_overlap** is not valid
+
+        Returns:
+            List[Tuple[Any, ...]]: rows sorted by start time
+        """
+        if horz_overlap in ["trim"]:
+            ac_iterable = self.ac_iter_in(horizon)
+        elif horz_overlap in ["exclude"]:
+            ac_iterable = self.actual_ac_iter_within(horizon)
+        else:
+            raise ValueError(f"horz_overlap {horz_overlap} is not valid ")
+
+        idle_type = self.ac_types_param.idle
+        rows: List[Tuple[Any, ...]] = []
+        for ac in ac_iterable:
+            if ac.ac_type == idle_type:
+                continue
+            interval = ac.interval
+            # only the activities on the horizon boundary are trimmed
+            if interval.start < horizon.start or horizon.end < interval.end:
+                interval = horizon.intersect(interval)
+            rows.append(self.ac_row(ac, interval))
+        return rows
+
+    def copy(self, mc: Machine, job_dict: Dict[str, "Job"]) -> MCSchedule:
+        """Returns a copy of the machine schedule for another Machine object
+
+        Activities are copied with the same ac_ids, intervals and contents,
+        so that changes on either schedule are not reflected to the other.
+        Operations refer to the jobs of job_dict with the same job_ids
+        (or their own jobs if not in job_dict)
+
+        Args:
+            mc (Machine): the machine of the copied schedule
+            job_dict (Dict[str, Job]): jobs of the copied operations by job_id
+
+        Returns:
+            MCSchedule: the copied machine schedule (without undo_log)
+        """
+        mc_schedule = type(self)(
+            self.mc_id, mc, self.horizon, self.ac_types_param
+        )
+        mc_schedule.load_stored_acs(
+            [self.copy_ac(ac, mc, job_dict) for ac in self.__ac_list]
+        )
+        mc_schedule.ac_cum_counts.update(self.ac_cum_counts)
+        return mc_schedule
 
+    def copy_ac(
+        self,
+        ac: Activity,
+        mc: Machine,
+        job_dict: Dict[str, "Job"],
+        interval: Optional[Interval] = None,
+    ) -> Activity:
+        """Returns a copy of an activity assigned to mc
+
+        Args:
+            ac (Activity): an activity to be copied
+            mc (Machine): the machine of the copied activity
+            job_dict (Dict[str, Job]): jobs of operations by job_id
+            interval (Interval, optional): the interval of the copied activity
+                (if None, copied from **ac**)
+
+        Raises:
+            TypeError: the activity is not an idle, a breakdown or an operation
+
+        Returns:
+            Activity: the copied activity
+        """
+        if interval is None:
+            interval = Interval(*ac.interval.dt_range())
+        contents = dict(ac.contents)
+        if isinstance(ac, Operation):
+            job = job_dict.get(ac.job.job_id, ac.job)
+            return Operation(
+                ac.ac_id, interval, mc, job, self.ac_types_param, contents
+            )
+        elif isinstance(ac, Breakdown):
+            return Breakdown(
+                ac.ac_id, interval, mc, self.ac_types_param, contents
+            )
+        elif isinstance(ac, Idle):
+            return Idle(ac.ac_id, interval, mc, self.ac_types_param, contents)
+        raise TypeError(f"{ac} cannot be copied to Machine {mc.mc_id}")
+
+    def fill_gaps_with_idle(
+        self, sorted_ac_list: List[Activity]
+    ) -> List[Activity]:
+        """Returns actual activities sorted by start time
+        with new idle activities in the gaps between them
+
+        Args:
+            sorted_ac_list (List[Activity]): actual activities sorted by start time
+
+        Returns:
+            List[Activity]: activities to be stored
+        """
+        idle_type = self.ac_types_param.idle
+        stored_ac_list: List[Activity] = []
+        gap_start = self.horizon.start
+        for ac in sorted_ac_list + [None]:
+            gap_end = self.horizon.end if ac is None else ac.interval.start
+            if gap_start < gap_end:
+                idle_id = self.make_ac_id_for_type(idle_type)
+                self.ac_cum_counts[idle_type] += 1
+                stored_ac_list.append(
+                    Idle(
+                        idle_id,
+                        Interval(gap_start, gap_end),
+                        self.mc,
+                        self.ac_types_param,
+                    )
+                )
+            if ac is not None:
+                stored_ac_list.append(ac)
+                gap_start = ac.interval.end
+        return stored_ac_list
+
+    def del_activities_in_interval(self, given_interval: Interval):
+        """Deletes all activities within given interval
+        and fill empty space with idle activity
+
+        Args:
+            given_interval (Interval)
+        """
+        idle_type = self.ac_types_param.idle
+        self.error_if_interval_outside_horizon(given_interval)
+
+        target_ac_list = [
+            self.ac_dict[ac_id]
+            for ac_id in self.ac_id_list_of_interval(given_interval)
+        ]
+        ac_before_target = self.__ac_list.prev_of(target_ac_list[0])
+        ac_after_target = self.__ac_list.next_of(target_ac_list[-1])
+
+        before_is_idle: bool
+        if ac_before_target is None:
+            before_is_idle = False
+            new_start_time = self.horizon.start
+        else:
+            before_is_idle = ac_before_target.ac_type == idle_type
+            new_start_time = ac_before_target.interval.end
+
+        after_is_idle: bool
+        if ac_after_target is None:
+            after_is_idle = False
+            new_end_time = self.horizon.end
+        else:
+            after_is_idle = ac_after_target.ac_type == idle_type
+            if after_is_idle:
+                new_end_time = ac_after_target.interval.end
+            else:
+                new_end_time = ac_after_target.interval.start
+
+        for ac in target_ac_list:
+            self.remove_ac(ac)
+
+        # if two neighboring operations if target_ops are idle,
+        # ----------<=given interval=>----------------
+        # -|=idle1=||====target_ops====||=idle2=|-----
+        # remove the latter one and change the end time of former one
+        # -|===============idle1================|-----
+        if before_is_idle and after_is_idle:
+            self.remove_ac(ac_after_target)
+            self.change_ac_interval(
+                ac_before_target, ac_before_target.interval.start, new_end_time
+            )
+
+        # if only a neighboring operation of the first element
+        # of target_ops are idle,
+        # ----------<=given interval=>----------------
+        # -|=idle=||====target_ops====||=job=|--------
+        # change the end time of the idle operation
+        # -|===========idle===========||=job=|--------
+        if before_is_idle and not after_is_idle:
+            self.change_ac_interval(
+                ac_before_target, ac_before_target.interval.start, new_end_time
+            )
+
+        # if only a neighboring operation of the last element
+        # of target_ops are idle,
+        # ----------<=given interval=>----------------
+        # -|=job=||====target_ops====||=idle=|--------
+        # change the start time of the idle operation
+        # -|=job=||===========idle===========|--------
+        if not before_is_idle and after_is_idle:
+            self.change_ac_interval(
+                ac_after_target, new_start_time, new_end_time
+            )
+
+        # if either of neighboring operations of target_ops are not idle,
+        # ----------<=given interval=>----------------
+        # -|=job=||====target_ops======||=job=|-------
+        # create idle job and put it in the target_idx_first sequence
+        # -|=job=||========idle========||=job=|-------
+        if not before_is_idle and not after_is_idle:
+            idle_id = self.make_ac_id_for_type(idle_type)
+            new_idle_activity = Idle(
+                idle_id,
+                Interval(new_start_time, new_end_time),
+                self.mc,
+                self.ac_types_param,
+            )
+            self.insert_ac(new_idle_activity)
+            self.ac_cum_counts[idle_type] += 1
+
+    def idle_interval_list(self, release_date: dt.datetime) -> List[Interval]:
+        """Returns a list of idle activities
+
+        Args:
+            release_date (datetime.datetime)
+
+        Returns:
+            List[Interval]: list of idle activities beyond release_date
+        """
+        return_list: List[Interval] = list()
+        if self.after_horizon_end(release_date):
+            return return_list
+        for ac in self.__ac_list:
+            if (
+                ac.ac_type == self.ac_types_param.idle
+                and ac.interval.end >= release_date
+            ):
+                return_list.append(ac.interval)
+        return return_list
+
+    def last_ac_id_of_type(self, target_type: str) -> str:
+        """Returns ac_id of last Activity instance with target_type
+
+        Args:
+            target_type (str): an ac_type value
+
+        Returns:
+            str: ac_id, "" if no such Activity instance
+        """
+        target_ac_id: str = ""
+        for ac in reversed(self.__ac_list):
+            if ac.ac_type == target_type:
+                target_ac_id = ac.ac_id
+                break
+        return target_ac_id
+
+    def last_ac_interval_of_type(self, target_type: str) -> Interval:
+        """Returns interval of last Activity instance with target_type
+
+        Args:
+            target_type (str): an ac_type value
+
+        Returns:
+            Interval: interval of the Activity instance,
+                      (start, start) if no Activity of target_type
+        """
+        return_interval = Interval(self.horizon.start, self.horizon.start)
+        for ac in reversed(self.__ac_list):
+            if ac.ac_type == target_type:
+                return_interval = ac.interval
+                break
+        return return_interval
+
+    def intersection(
+        self, other: "MCSchedule"
+    ) -> List[Tuple[Activity, Activity, Interval]]:
+        """Returns pairs of actual activities of two schedules that overlap
+        (e.g. a planned and an actual schedule of a machine)
+
+        Both sequences of actual activities are swept once in the order of
+        time, taking O(n + m + k) time for k overlapping pairs.
+        Pairs follow Interval.is_distinct (touching activities do not overlap)
+
+        Args:
+            other (MCSchedule): a schedule to be compared
+
+        Returns:
+            List[Tuple[Activity, Activity, Interval]]: (activity of self,
+                activity of other, the overlapping interval) in the order of time
+        """
+        pair_list: List[Tuple[Activity, Activity, Interval]] = []
+        ac_iter = self.actual_ac_iter()
+        other_ac_iter = other.actual_ac_iter()
+        ac = next(ac_iter, None)
+        other_ac = next(other_ac_iter, None)
+        while ac is not None and other_ac is not None:
+            overlap = ac.interval.intersect(other_ac.interval)
+            if overlap is not None:
+                pair_list.append((ac, other_ac, overlap))
+            # the activity ending first cannot overlap later activities
+            if ac.interval.end < other_ac.interval.end:
+                ac = next(ac_iter, None)
+            else:
+                other_ac = next(other_ac_iter, None)
+        return pair_list
+
+
+class ImplicitIdleMCSchedule(MCSchedule):
+    """A schedule on a machine that does not store idle activities
+
+    Idle activities are the gaps between the stored activities;
+    they are created whenever they are iterated, with ac_ids made from
+    their start times (see make_ac_id_for_gap), and are not in ac_dict.
+    """
+
+    @property
+    def ac_id_list(self) -> List[str]:
+        """A list of ac_ids in the order of time (including idle gaps)
+
+        Warning:
+            Unlike the view of MCSchedule, the list is built on every call
+            since the ac_ids of gaps are derived; use ac_iter to traverse
+            activities
+        """
+        return [ac.ac_id for ac in self.ac_iter()]
+
+    @property
+    def ac_counts(self) -> Dict[str, int]:
+        """A copy of the counts of activities for each type
+        with the count of idle gaps (kept up to date on every change)"""
+        if self.__gap_count is None:
+            self.__gap_count = sum(1 for _ in self.gap_iter())
+        ac_counts = dict(super().ac_counts)
+        ac_counts[self.ac_types_param.idle] = self.__gap_count
+        return ac_counts
+
+    def initialize_idle(self):
+        """Initialize MCSchedule with a single gap over the horizon"""
+        # the gaps are counted again on the next access of ac_counts
+        self.__gap_count: Optional[int] = None
+        super().initialize_idle()
+
+    def make_idle(self, start: dt.datetime, end: dt.datetime) -> Idle:
+        """Creates an Idle instance of a gap
+
+        Args:
+            start (datetime.datetime): the start time of the gap
+            end (datetime.datetime): the end time of the gap
+
+        Returns:
+            Idle: the created activity
+        """
+        return Idle(
+            self.make_ac_id_for_gap(start),
+            Interval(start, end),
+            self.mc,
+            self.ac_types_param,
+        )
+
+    def insert_ac(self, ac: Activity):
+        """Stores an activity without checking the occupation of its interval
+        (ac_cum_counts is not changed; idle activities are ignored)
+
+        Args:
+            ac (Activity): an activity to be stored
+        """
+        if ac.ac_type == self.ac_types_param.idle:
+            return
+        super().insert_ac(ac)
+        if self.is_gap_indexed or self.__gap_count is not None:
+            gap_start, gap_end = self.__gap_bounds(ac)
+            ac_start, ac_end = ac.interval.dt_range()
+            self.__update_gaps(
+                [(gap_start, gap_end)],
+                [(gap_start, ac_start), (ac_end, gap_end)],
+            )
+
+    def remove_ac(self, ac: Activity):
+        """Removes a stored activity (ac_cum_counts is not changed)
+
+        Args:
+            ac (Activity): an activity to be removed
+        """
+        if ac.ac_type == self.ac_types_param.idle:
+            return
+        if not (self.is_gap_indexed or self.__gap_count is not None):
+            super().remove_ac(ac)
+            return
+        gap_start, gap_end = self.__gap_bounds(ac)
+        ac_start, ac_end = ac.interval.dt_range()
+        super().remove_ac(ac)
+        self.__update_gaps(
+            [(gap_start, ac_start), (ac_end, gap_end)],
+            [(gap_start, gap_end)],
+        )
+
+    def load_stored_acs(self, stored_ac_list: List[Activity]):
+        """Replaces the stored activities (idle activities are not stored)
+
+        Args:
+            stored_ac_list (List[Activity]): activities sorted by start time
+        """
+        super().load_stored_acs(stored_ac_list)
+        self.__gap_count = None
+
+    def change_ac_interval(
+        self, ac: Activity, start: dt.datetime, end: dt.datetime
+    ):
+        """Changes the interval of a stored activity and updates its position
+
+        Args:
+            ac (Activity): a stored activity
+            start (datetime.datetime): a new start time
+            end (datetime.datetime): a new end time
+        """
+        if ac.ac_type != self.ac_types_param.idle:
+            super().change_ac_interval(ac, start, end)
+
+    def gap_iter(
+        self, moment: Optional[dt.datetime] = None
+    ) -> Iterator[Tuple[dt.datetime, dt.datetime]]:
+        """Yields (start, end) of idle gaps
+
+        Args:
+            moment (datetime.datetime, optional): if given, yields gaps ending after moment
+
+        Yields:
+            Iterator[Tuple[dt.datetime, dt.datetime]]
+        """
+        for ac in self.__ac_iter_with_gaps(moment, with_gaps_only=True):
+            yield ac
+
+    def ac_iter(self) -> Iterator[Activity]:
+        """
+        Yields:
+            Iterator[Activity]
+        """
+        return self.__ac_iter_with_gaps(None)
+
+    def ac_iter_of_types(self, ac_type_list: List[str]) -> Iterator[Activity]:
+        """
+        Yields:
+            Iterator[Activity]
+        """
+        if not (
+            all(
+                (ac_type in self.ac_types_param.all_types)
+                for ac_type in ac_type_list
+            )
+        ):
+            raise KeyError(
+                f"List {ac_type_list} contains an unsupported activity type"
+            )
+        for ac in self.ac_iter():
+            if ac.ac_type in ac_type_list:
+                yield ac
+
+    def idle_ac_iter(self) -> Iterator[Idle]:
+        """
+        Yields:
+            Iterator[Idle]
+        """
+        for gap_start, gap_end in self.gap_iter():
+            yield self.make_idle(gap_start, gap_end)
+
+    def ac_iter_from(self, moment: dt.datetime) -> Iterator[Activity]:
+        """Yields activities from the first one that ends after moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Yields:
+            Iterator[Activity]
+        """
+        return self.__ac_iter_with_gaps(moment)
+
+    def hbar_tuple_list(self) -> List[Tuple[dt.datetime, dt.timedelta]]:
+        """Returns a horizontal bar tuple list
+
+        Warnings:
+            Use an iterator ac_iter to retrieve activities
+
+        Returns:
+            List[Tuple[dt.datetime, dt.timedelta]]: Tuple of [start, duration]
+        """
+        warnings.warn("This module is replaced by ac_iter", DeprecationWarning)
+        return [ac.interval.start_duration_tuple() for ac in self.ac_iter()]
+
+    def gap_of_moment(
+        self, moment: dt.datetime
+    ) -> Optional[Tuple[dt.datetime, dt.datetime]]:
+        """Returns the idle gap occupying moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Optional[Tuple[dt.datetime, dt.datetime]]: (start, end) of the gap,
+                None if an activity occupies moment
+        """
+        floor_ac = self.ac_list.floor(moment)
+        if floor_ac is None:
+            gap_start = self.horizon.start
+            next_ac = self.ac_list.first()
+        elif moment < floor_ac.interval.end:
+            return None
+        else:
+            gap_start = floor_ac.interval.end
+            next_ac = self.ac_list.next_of(floor_ac)
+        gap_end = (
+            self.horizon.end if next_ac is None else next_ac.interval.start
+        )
+        if moment < gap_end:
+            return (gap_start, gap_end)
+        return None
+
+    def ac_at(self, moment: dt.datetime) -> Optional[Activity]:
+        """Returns the activity occupying moment (a binary search)
+        if moment is boundary, latter activity is returned
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Optional[Activity]: None if no activity occupies moment
+                (e.g. moment is outside the horizon)
+        """
+        _moment = to_dt.to_moment_value(moment)
+        if not (self.horizon.start <= _moment < self.horizon.end):
+            return None
+        floor_ac = self.ac_list.floor(_moment)
+        if floor_ac is not None and _moment < floor_ac.interval.end:
+            return floor_ac
+        gap = self.gap_of_moment(_moment)
+        return None if gap is None else self.make_idle(*gap)
+
+    def ac_id_of_moment(self, moment: dt.datetime) -> str:
+        """Returns the activity occupying moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Raises:
+            SyntaxError: no Activity instance occupying moment
+
+        Returns:
+            str: ac_id of the Activity instance occupying moment
+                 if moment is boundary, latter ac_id is returned
+        """
+        _moment = to_dt.to_moment_value(moment)
+        self.error_if_moment_outside_horizon(_moment)
+        floor_ac = self.ac_list.floor(_moment)
+        if floor_ac is not None and _moment < floor_ac.interval.end:
+            return floor_ac.ac_id
+        gap = self.gap_of_moment(_moment)
+        if gap is not None:
+            return self.make_ac_id_for_gap(gap[0])
+        e_str = "No Activity instance occupying moment "
+        e_str += f"{moment} of machine {self.mc_id}"
+        raise SyntaxError(e_str)
+
+    def delete_ac_beyond_moment(self, moment: dt.datetime):
+        """Deletes all activities beyond moment
+        the end of the activity occupying the moment is changed to the moment,
+        and the rest of the horizon becomes an idle gap
+
+        Args:
+            moment (datetime.datetime)
+        """
+        _moment = to_dt.to_moment_value(moment)
+        if _moment >= self.horizon.end:
+            return
+        last_ac = self.ac_list.last()
+        while last_ac is not None:
+            last_start, last_end = last_ac.interval.dt_range()
+            if last_start < _moment or last_start == last_end == _moment:
+                break
+            self.remove_ac(last_ac)
+            last_ac = self.ac_list.last()
+        if last_ac is not None and _moment < last_ac.interval.end:
+            self.change_ac_interval(last_ac, last_ac.interval.start, _moment)
+
+    def is_idle_only(self, given_interval: Interval) -> bool:
+        """Check if the given interval contains a single activity
+
+        Args:
+            given_interval (Interval):
+
+        Returns:
+            bool: True if an idle Activity occupies given interval
+        """
+        self.error_if_interval_outside_horizon(given_interval)
+        gap = self.gap_of_moment(given_interval.start)
+        return gap is not None and given_interval.end <= gap[1]
+
+    def add_activity(self, ac: Activity) -> bool:
+        """Tries to add given Activity instance with given interval
+
+        Args:
+            ac (Activity): with ac_type and Interval set
+
+        Returns:
+            bool: True if addition of Activity was successful, False otherwise
+        """
+        _interval = ac.interval
+
+        if (_interval.start == _interval.end) and (
+            _interval.end == self.horizon.end
+        ):
+            if ac.ac_type == self.ac_types_param.idle:
+                raise ValueError(
+                    "An idle job with duration 0 is not allowed to insert"
+                )
+            self.insert_ac(ac)
+            self.ac_cum_counts[ac.ac_type] += 1
+            print(f"Warning: {ac} has duration of 0")
+            return True
+
+        if not self.is_idle_only(_interval):
+            raise ValueError(
+                f"{_interval} is occupied in Machine {self.mc_id}"
+            )
+        self.insert_ac(ac)
+        self.ac_cum_counts[ac.ac_type] += 1
+        return True
+
+    def fill_gaps_with_idle(
+        self, sorted_ac_list: List[Activity]
+    ) -> List[Activity]:
+        """Returns actual activities as they are (gaps are not stored)
+
+        Args:
+            sorted_ac_list (List[Activity]): actual activities sorted by start time
+
+        Returns:
+            List[Activity]: activities to be stored
+        """
+        return sorted_ac_list
+
+    def del_activities_in_interval(self, given_interval: Interval):
+        """Deletes all activities within given interval
+        (the space becomes an idle gap)
+
+        Args:
+            given_interval (Interval)
+        """
+        self.error_if_interval_outside_horizon(given_interval)
+        start, end = given_interval.dt_range()
+        target_ac_list: List[Activity] = list()
+        for ac in self.ac_list.iter_from_moment(start):
+            if ac.interval.end <= start:
+                continue
+            if start < end:
+                if end <= ac.interval.start:
+                    break
+            elif start < ac.interval.start:
+                break
+            target_ac_list.append(ac)
+            if start == end:
+                break
+        for ac in target_ac_list:
+            self.remove_ac(ac)
+
+    def idle_interval_list(self, release_date: dt.datetime) -> List[Interval]:
+        """Returns a list of idle activities
+
+        Args:
+            release_date (datetime.datetime)
+
+        Returns:
+            List[Interval]: list of idle activities beyond release_date
+        """
+        return_list: List[Interval] = list()
+        if self.after_horizon_end(release_date):
+            return return_list
+        for gap_start, gap_end in self.gap_iter():
+            if gap_end >= release_date:
+                return_list.append(Interval(gap_start, gap_end))
+        return return_list
+
+    def last_ac_id_of_type(self, target_type: str) -> str:
+        """Returns ac_id of last Activity instance with target_type
+
+        Args:
+            target_type (str): an ac_type value
+
+        Returns:
+            str: ac_id, "" if no such Activity instance
+        """
+        if target_type != self.ac_types_param.idle:
+            return super().last_ac_id_of_type(target_type)
+        last_gap = self.__last_gap()
+        return "" if last_gap is None else self.make_ac_id_for_gap(last_gap[0])
+
+    def last_ac_interval_of_type(self, target_type: str) -> Interval:
+        """Returns interval of last Activity instance with target_type
+
+        Args:
+            target_type (str): an ac_type value
+
+        Returns:
+            Interval: interval of the Activity instance,
+                      (start, start) if no Activity of target_type
+        """
+        if target_type != self.ac_types_param.idle:
+            return super().last_ac_interval_of_type(target_type)
+        last_gap = self.__last_gap()
+        if last_gap is None:
+            return Interval(self.horizon.start, self.horizon.start)
+        return Interval(*last_gap)
+
+    def __update_gaps(
+        self,
+        old_gaps: List[Tuple[dt.datetime, dt.datetime]],
+        new_gaps: List[Tuple[dt.datetime, dt.datetime]],
+    ):
+        # updates gap_index (if built) and the count of gaps (if counted)
+        self.update_gaps(old_gaps, new_gaps)
+        if self.__gap_count is not None:
+            self.__gap_count += sum(start < end for start, end in new_gaps)
+            self.__gap_count -= sum(start < end for start, end in old_gaps)
+
+    def __gap_bounds(self, ac: Activity) -> Tuple[dt.datetime, dt.datetime]:
+        # the end of the previous activity and the start of the next one
+        prev_ac = self.ac_list.prev_of(ac)
+        next_ac = self.ac_list.next_of(ac)
+        return (
+            self.horizon.start if prev_ac is None else prev_ac.interval.end,
+            self.horizon.end if next_ac is None else next_ac.interval.start,
+        )
+
+    def __last_gap(self) -> Optional[Tuple[dt.datetime, dt.datetime]]:
+        gap_end = self.horizon.end
+        for ac in reversed(self.ac_list):
+            if ac.interval.end < gap_end:
+                return (ac.interval.end, gap_end)
+            gap_end = ac.interval.start
+        if self.horizon.start < gap_end:
+            return (self.horizon.start, gap_end)
+        return None
+
+    def __ac_iter_with_gaps(
+        self, moment: Optional[dt.datetime], with_gaps_only: bool = False
+    ) -> Iterator[Any]:
+        # yields activities and idle gaps ending after moment (if given)
+        if moment is None:
+            ac_iter = iter(self.ac_list)
+            prev_end = self.horizon.start
+        else:
+            floor_loc = self.ac_list.floor_loc(moment)
+            if floor_loc is None:
+                ac_iter = iter(self.ac_list)
+                prev_end = self.horizon.start
+            else:
+                ac_iter = self.ac_list.iter_from_loc(floor_loc)
+                prev_end = None
+        for ac in ac_iter:
+            ac_start, ac_end = ac.interval.dt_range()
+            if prev_end is not None and prev_end < ac_start:
+                if moment is None or moment < ac_start:
+                    if with_gaps_only:
+                        yield (prev_end, ac_start)
+                    else:
+                        yield self.make_idle(prev_end, ac_start)
+            if not with_gaps_only:
+                if moment is None or moment < ac_end:
+                    yield ac
+            prev_end = ac_end
+        if prev_end is None:
+            return
+        if prev_end < self.horizon.end:
+            if moment is None or moment < self.horizon.end:
+                if with_gaps_only:
+                    yield (prev_end, self.horizon.end)
+                else:
+                    yield self.make_idle(prev_end, self.horizon.end)
+
+
+def main():
     ac_types_param = AcTypesParam()
     machine_1 = Machine("test machine 1")
     machine_1.reset_schedule(Interval(0, 20), ac_types_param)
@@ -713,9 +2065,15 @@ def main():
     for ac in mc_schedule_1.ac_iter_of_types(["Idle"]):
         print(ac)
 
+    # earliest-fit test
+    print("\nearliest start of 3 seconds from 2:")
+    print(mc_schedule_1.earliest_fit(2, dt.timedelta(seconds=3)))
+
     # print(mc_schedule_1.ac_id_list_of_interval(Interval(5, 6)))
 
-    # print(mc_schedule_1.intersection(mc_schedule_1))
+    print("\nintersection with itself:")
+    for ac, other_ac, overlap in mc_schedule_1.intersection(mc_schedule_1):
+        print(ac.ac_id, other_ac.ac_id, overlap)
 
 
 if __name__ == "__main__":
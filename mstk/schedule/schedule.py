@@ -4,26 +4,52 @@ Created on 13th Aug. 2020
 
 __all__ = ["Schedule"]
 
-from typing import TYPE_CHECKING, List, Dict, Iterator, Optional
-
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Dict,
+    Iterator,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    Any,
+)
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 
 import datetime as dt
+import heapq
+from array import array
 
 from mstk.schedule.interval import Interval
-from mstk.schedule.machine import Machine
+from mstk.schedule.machine import Machine, MCSchedule
 from mstk.schedule.ac_types import AcTypesParam
 from mstk.schedule.activity import Activity, Operation, Breakdown
 from mstk.schedule.job import Job
+from mstk.schedule.schedule_view import ScheduleView
+from mstk.schedule.undo_log import UndoLog
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Schedule:
     """A set of machine schedules and tools to edit the machine schedules"""
 
     def __init__(
-        self, schedule_id: str, horizon: Interval, ac_types_param: AcTypesParam
+        self,
+        schedule_id: str,
+        horizon: Interval,
+        ac_types_param: AcTypesParam,
+        backend: str = "default",
     ):
         self.__schedule_id: str = schedule_id
         self.__horizon: Interval = horizon
+        # storage of activities in machines (see mc_schedule_backends)
+        self.__backend: str = backend
 
         self.__mc_id_list: List[str] = []
         self.__mc_dict: Dict[str, Machine] = {}
@@ -33,6 +59,17 @@ class Schedule:
 
         self.__ac_types_param: AcTypesParam = ac_types_param
 
+        # shared by machine schedules and jobs to revert transactions
+        self.__undo_log: UndoLog = UndoLog()
+
+        # copy-on-write state of forks (see fork):
+        # the id lists and dictionaries may be shared with other schedules,
+        # and only the machines and jobs in the owned sets may be changed
+        # in place (None if nothing is shared)
+        self.__shares_containers: bool = False
+        self.__owned_mc_ids: Optional[Set[str]] = None
+        self.__owned_job_ids: Optional[Set[str]] = None
+
     @property
     def schedule_id(self) -> str:
         return self.__schedule_id
@@ -61,9 +98,355 @@ class Schedule:
     def ac_types_param(self) -> AcTypesParam:
         return self.__ac_types_param
 
+    @property
+    def backend(self) -> str:
+        return self.__backend
+
+    @property
+    def undo_log(self) -> UndoLog:
+        return self.__undo_log
+
     def __repr__(self) -> str:
         return f"Schedule({self.schedule_id})"
 
+    def __reduce__(self):
+        # pickled as flat tables (see get_state), so that the references
+        # between machines, jobs and activities are rebuilt on load
+        # instead of being pickled recursively
+        return (Schedule.from_state, (self.get_state(),))
+
+    def get_state(self) -> Dict[str, Any]:
+        """Returns the schedule as flat tables to be pickled
+
+        Activities of each machine are columns of MCSchedule.get_state;
+        operation lists of jobs are kept as (machine index, ac_id) pairs.
+        The undo log and the copy-on-write state of forks are not included
+
+        Returns:
+            Dict[str, Any]: tables of the schedule
+        """
+        mc_index_dict = {
+            mc_id: mc_index for mc_index, mc_id in enumerate(self.mc_id_list)
+        }
+        job_op_counts = array("i")
+        job_op_mc_indices = array("i")
+        job_op_ac_ids: List[str] = []
+        for job in self.job_iter():
+            job_op_counts.append(len(job.operation_list))
+            for operation in job.oper_iter():
+                job_op_mc_indices.append(mc_index_dict[operation.mc.mc_id])
+                job_op_ac_ids.append(operation.ac_id)
+        return {
+            "schedule_id": self.schedule_id,
+            "horizon": self.horizon.dt_range(),
+            "ac_types_param": self.ac_types_param,
+            "backend": self.backend,
+            "mc_id_list": list(self.mc_id_list),
+            "mc_contents": [mc.contents for mc in self.mc_iter()],
+            "mc_states": [mc.mc_schedule.get_state() for mc in self.mc_iter()],
+            "job_id_list": list(self.job_id_list),
+            "job_contents": [job.contents for job in self.job_iter()],
+            "job_op_counts": job_op_counts,
+            "job_op_mc_indices": job_op_mc_indices,
+            "job_op_ac_ids": job_op_ac_ids,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Schedule":
+        """Creates a schedule from tables of get_state
+        (contents of the tables are stored as they are)
+
+        Operations of jobs on the columnar backend are created on the first
+        access of each job, or before their machines change
+        (see Job.defer_operations); rows of the operations on their machines
+        may be given as job_op_rows instead of job_op_ac_ids
+
+        Args:
+            state (Dict[str, Any]): tables returned by get_state
+
+        Returns:
+            Schedule: the created Schedule object
+        """
+        schedule = cls(
+            state["schedule_id"],
+            Interval(*state["horizon"]),
+            state["ac_types_param"],
+            state["backend"],
+        )
+        for job_id, contents in zip(
+            state["job_id_list"], state["job_contents"]
+        ):
+            schedule.add_job(job_id).contents.update(contents)
+        mc_list: List[Machine] = []
+        for mc_id, contents, mc_state in zip(
+            state["mc_id_list"], state["mc_contents"], state["mc_states"]
+        ):
+            mc = schedule.add_machine(mc_id)
+            mc.contents.update(contents)
+            mc.mc_schedule.set_state(mc_state, schedule.job_dict)
+            mc_list.append(mc)
+
+        if schedule.backend == "columnar":
+            cls.__defer_operations(schedule, state, mc_list)
+            return schedule
+
+        # operations of each machine by ac_id, built on the first lookup
+        operation_dict_list: List[Optional[Dict[str, Operation]]] = [
+            None
+        ] * len(mc_list)
+        job_op_mc_indices = state["job_op_mc_indices"]
+        job_op_ac_ids = state["job_op_ac_ids"]
+        pos = 0
+        for job, count in zip(schedule.job_iter(), state["job_op_counts"]):
+            for mc_index, ac_id in zip(
+                job_op_mc_indices[pos : pos + count],
+                job_op_ac_ids[pos : pos + count],
+            ):
+                if operation_dict_list[mc_index] is None:
+                    operation_dict_list[mc_index] = {
+                        operation.ac_id: operation
+                        for operation in mc_list[mc_index].operation_iter()
+                    }
+                job.add_operation(operation_dict_list[mc_index][ac_id])
+            pos += count
+        return schedule
+
+    @staticmethod
+    def __defer_operations(
+        schedule: "Schedule", state: Dict[str, Any], mc_list: List[Machine]
+    ):
+        # gives jobs the rows of their operations to be created on access
+        mc_schedule_list = [mc.mc_schedule for mc in mc_list]
+        job_op_mc_indices = state["job_op_mc_indices"]
+        job_op_rows = state.get("job_op_rows")
+        if job_op_rows is None:
+            # rows of each machine by ac_id, built on the first lookup
+            row_dict_list: List[Optional[Dict[str, int]]] = [None] * len(
+                mc_list
+            )
+            job_op_rows = array("q")
+            for mc_index, ac_id in zip(
+                job_op_mc_indices, state["job_op_ac_ids"]
+            ):
+                if row_dict_list[mc_index] is None:
+                    # ac_ids of the rows in ColumnarMCSchedule.get_state
+                    row_dict_list[mc_index] = {
+                        ac_id: row
+                        for row, ac_id in enumerate(
+                            state["mc_states"][mc_index][5]
+                        )
+                    }
+                job_op_rows.append(row_dict_list[mc_index][ac_id])
+        pos = 0
+        for job, count in zip(schedule.job_iter(), state["job_op_counts"]):
+            if count == 0:
+                continue
+            mc_indices = job_op_mc_indices[pos : pos + count]
+            job.defer_operations(
+                partial(
+                    make_operation_list,
+                    mc_schedule_list,
+                    mc_indices,
+                    job_op_rows[pos : pos + count],
+                )
+            )
+            for mc_index in set(mc_indices):
+                mc_schedule_list[mc_index].defer_job(job)
+            pos += count
+
+    def save(self, path: str):
+        """Saves the schedule to a folder in a binary columnar format:
+        .npy columns of activities, id tables and a JSON header
+        (see mstk.schedule.snapshot.save_schedule)
+
+        Args:
+            path (str): the folder path (created if it does not exist)
+        """
+        # NumPy is required only for snapshots
+        from mstk.schedule.snapshot import save_schedule
+
+        save_schedule(self, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "Schedule":
+        """Loads a schedule saved with save
+        (see mstk.schedule.snapshot.load_schedule)
+
+        Args:
+            path (str): the folder path
+            mmap (bool, optional): memory-maps the columns in copy-on-write
+                mode. Defaults to True.
+
+        Raises:
+            ValueError: the folder is not a snapshot of a supported version
+
+        Returns:
+            Schedule: the loaded schedule
+        """
+        from mstk.schedule.snapshot import load_schedule
+
+        return load_schedule(path, mmap)
+
+    @contextmanager
+    def transaction(self) -> Iterator[UndoLog]:
+        """Records edits of machine schedules and jobs to revert them
+
+        Edits are reverted with rollback inside the transaction,
+        or automatically if an exception is raised in it;
+        transactions may be nested. Adding machines or jobs is not recorded.
+
+        Example:
+            with schedule.transaction():
+                schedule.add_operation(mc_id, job_id, start, end)
+                if not improved:
+                    schedule.rollback()
+
+        Yields:
+            Iterator[UndoLog]: the undo log of the schedule
+        """
+        self.__undo_log.begin()
+        try:
+            yield self.__undo_log
+        except BaseException:
+            self.__undo_log.rollback()
+            raise
+        finally:
+            self.__undo_log.end()
+
+    def savepoint(self) -> int:
+        """Returns a mark in the current transaction to roll back to
+
+        Raises:
+            RuntimeError: no transaction is open
+
+        Returns:
+            int: the number of recorded edits
+        """
+        return self.__undo_log.savepoint()
+
+    def rollback(self, savepoint: Optional[int] = None):
+        """Reverts edits of the current transaction in time proportional
+        to the number of edits (ac_cum_counts are not reverted)
+
+        Args:
+            savepoint (int, optional): a mark from savepoint
+                (if None, the start of the current transaction)
+
+        Raises:
+            RuntimeError: no transaction is open
+        """
+        self.__undo_log.rollback(savepoint)
+
+    def fork(self, schedule_id: Optional[str] = None) -> "Schedule":
+        """Returns a copy-on-write copy of the schedule in constant time
+
+        Both schedules share their machines and jobs until they change them;
+        a machine (or a job) is copied on its first change in either
+        schedule, with add_operation, add_breakdown, bulk_add,
+        find_earliest_slot or edit_machine (edit_job).
+
+        Warning:
+            Change machine schedules and jobs of a forked schedule
+            with the methods above, not through mc_dict or job_dict.
+            Activities on a shared machine refer to the jobs of the schedule
+            at the time of fork; look jobs up with job_dict by job_id
+
+        Args:
+            schedule_id (str, optional): an id of the fork (if None, the same id)
+
+        Returns:
+            Schedule: the forked schedule
+        """
+        forked = Schedule(
+            self.schedule_id if schedule_id is None else schedule_id,
+            self.horizon,
+            self.ac_types_param,
+            self.backend,
+        )
+        forked.__mc_id_list = self.__mc_id_list
+        forked.__mc_dict = self.__mc_dict
+        forked.__job_id_list = self.__job_id_list
+        forked.__job_dict = self.__job_dict
+        for schedule in (self, forked):
+            schedule.__shares_containers = True
+            schedule.__owned_mc_ids = set()
+            schedule.__owned_job_ids = set()
+        return forked
+
+    def edit_machine(self, mc_id: str) -> Machine:
+        """Returns the machine to be changed in place
+        (a shared machine of a forked schedule is copied first)
+
+        Args:
+            mc_id (str): an identifier of the machine
+
+        Raises:
+            KeyError: the machine id is not valid
+
+        Returns:
+            Machine: the Machine object owned by this schedule
+        """
+        if mc_id not in self.mc_dict:
+            raise KeyError(f"Machine {mc_id} does not exist")
+        if self.__owned_mc_ids is None or mc_id in self.__owned_mc_ids:
+            return self.mc_dict[mc_id]
+
+        old_mc = self.mc_dict[mc_id]
+        # jobs are owned first so that copied operations refer to them
+        job_id_set = {
+            operation.job.job_id for operation in old_mc.operation_iter()
+        }
+        for job_id in job_id_set:
+            self.edit_job(job_id)
+        new_mc = old_mc.copy(self.job_dict)
+        new_mc.mc_schedule.undo_log = self.__undo_log
+        self.__unshare_containers()
+        self.mc_dict[mc_id] = new_mc
+        self.__owned_mc_ids.add(mc_id)
+        if job_id_set:
+            # operations only, without the idles of ac_dict
+            new_ac_dict: Dict[str, Activity] = {
+                operation.ac_id: operation
+                for operation in new_mc.operation_iter()
+            }
+            for job_id in job_id_set:
+                self.job_dict[job_id].rebind_operations(old_mc, new_ac_dict)
+        return new_mc
+
+    def edit_job(self, job_id: str) -> Job:
+        """Returns the job to be changed in place
+        (a shared job of a forked schedule is copied first)
+
+        Args:
+            job_id (str): an identifier of the job
+
+        Raises:
+            KeyError: the job id is not valid
+
+        Returns:
+            Job: the Job object owned by this schedule
+        """
+        if job_id not in self.job_dict:
+            raise KeyError(f"Job {job_id} does not exist")
+        if self.__owned_job_ids is None or job_id in self.__owned_job_ids:
+            return self.job_dict[job_id]
+
+        new_job = self.job_dict[job_id].copy()
+        new_job.undo_log = self.__undo_log
+        self.__unshare_containers()
+        self.job_dict[job_id] = new_job
+        self.__owned_job_ids.add(job_id)
+        return new_job
+
+    def __unshare_containers(self):
+        # copies the id lists and dictionaries shared with forks
+        if self.__shares_containers:
+            self.__mc_id_list = list(self.__mc_id_list)
+            self.__mc_dict = dict(self.__mc_dict)
+            self.__job_id_list = list(self.__job_id_list)
+            self.__job_dict = dict(self.__job_dict)
+            self.__shares_containers = False
+
     def mc_iter(self) -> Iterator[Machine]:
         """
         Yields:
@@ -92,13 +475,17 @@ class Schedule:
         Returns:
             Machine: the created Machine object
         """
-        if mc_id in self.mc_id_list:
+        if mc_id in self.mc_dict:
             raise KeyError(f"Machine {mc_id} already exists")
         else:
+            self.__unshare_containers()
+            if self.__owned_mc_ids is not None:
+                self.__owned_mc_ids.add(mc_id)
             mc = Machine(mc_id)
             self.mc_id_list.append(mc_id)
             self.mc_dict[mc_id] = mc
-            mc.reset_schedule(self.horizon, self.ac_types_param)
+            mc.reset_schedule(self.horizon, self.ac_types_param, self.backend)
+            mc.mc_schedule.undo_log = self.__undo_log
         return mc
 
     def add_job(self, job_id: str) -> Job:
@@ -113,10 +500,14 @@ class Schedule:
         Returns:
             Job: the created Job object
         """
-        if job_id in self.job_id_list:
+        if job_id in self.job_dict:
             raise KeyError(f"Job {job_id} already exists")
         else:
+            self.__unshare_containers()
+            if self.__owned_job_ids is not None:
+                self.__owned_job_ids.add(job_id)
             job = Job(job_id)
+            job.undo_log = self.__undo_log
             self.job_id_list.append(job_id)
             self.job_dict[job_id] = job
         return job
@@ -145,13 +536,9 @@ class Schedule:
         Returns:
             Operation: the created Operation object
         """
-        if mc_id not in self.mc_id_list:
-            raise KeyError(f"Machine {mc_id} does not exist")
-        if job_id not in self.job_id_list:
-            raise KeyError(f"Job {job_id} does not exist")
+        mc = self.edit_machine(mc_id)
+        job = self.edit_job(job_id)
         ac_type = self.ac_types_param.operation
-        mc = self.mc_dict[mc_id]
-        job = self.job_dict[job_id]
 
         target_mc_schedule = mc.mc_schedule
         operation_count = target_mc_schedule.ac_cum_counts[ac_type] + 1
@@ -186,11 +573,8 @@ class Schedule:
         Returns:
             Breakdown: the created Breakdown object
         """
-        if mc_id not in self.mc_id_list:
-            raise KeyError(f"Machine {mc_id} does not exist")
-
+        mc = self.edit_machine(mc_id)
         ac_type = self.ac_types_param.breakdown
-        mc = self.mc_dict[mc_id]
 
         target_mc_schedule = mc.mc_schedule
         breakdown_count = target_mc_schedule.ac_cum_counts[ac_type] + 1
@@ -205,6 +589,299 @@ class Schedule:
 
         return new_activity
 
+    def bulk_add(self, rows: Iterable[Dict[str, Any]]) -> List[Activity]:
+        """Adds operations and breakdowns at once with MCSchedule.add_activities
+
+        Each row is a dictionary with keys
+
+        - mc_id, ac_type, start, end
+        - job_id (operations only)
+        - ac_id (optional; in default, the same id as add_operation or add_breakdown)
+        - contents (optional; a dictionary of the activity contents)
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): activities to be added
+
+        Raises:
+            KeyError: the machine id or the job id is not valid
+            ValueError: the ac_type is not supported, or activities overlap
+                (nothing is added)
+
+        Returns:
+            List[Activity]: the created activities in the order of rows
+        """
+        ac_list: List[Activity] = []
+        mc_ac_list_dict: Dict[str, List[Activity]] = {}
+        # cumulative counts of (mc_id, ac_type) to make ac_ids
+        ac_count_dict: Dict[Tuple[str, str], int] = {}
+        for row in rows:
+            mc_id = row["mc_id"]
+            mc = self.edit_machine(mc_id)
+            ac_type = row["ac_type"]
+            if ac_type not in [
+                self.ac_types_param.operation,
+                self.ac_types_param.breakdown,
+            ]:
+                raise ValueError(f"ac_type [{ac_type}] is not supported")
+            count_key = (mc_id, ac_type)
+            ac_count = ac_count_dict.get(
+                count_key, mc.mc_schedule.ac_cum_counts[ac_type]
+            )
+            ac_count_dict[count_key] = ac_count + 1
+            ac_id = (
+                row.get("ac_id", "") or f"{ac_type}({mc_id}-{ac_count + 1})"
+            )
+            interval = Interval(row["start"], row["end"])
+            if ac_type == self.ac_types_param.operation:
+                ac: Activity = Operation(
+                    ac_id,
+                    interval,
+                    mc,
+                    self.edit_job(row["job_id"]),
+                    self.ac_types_param,
+                    row.get("contents"),
+                )
+            else:
+                ac = Breakdown(
+                    ac_id,
+                    interval,
+                    mc,
+                    self.ac_types_param,
+                    row.get("contents"),
+                )
+            mc_ac_list_dict.setdefault(mc_id, []).append(ac)
+            ac_list.append(ac)
+
+        # every machine is checked before any of them is changed
+        sorted_ac_list_dict = {
+            mc_id: self.mc_dict[mc_id].mc_schedule.validate_new_acs(mc_ac_list)
+            for mc_id, mc_ac_list in mc_ac_list_dict.items()
+        }
+        for mc_id, mc_ac_list in mc_ac_list_dict.items():
+            mc_schedule = self.mc_dict[mc_id].mc_schedule
+            for ac in mc_ac_list:
+                mc_schedule.ac_cum_counts[ac.ac_type] += 1
+            mc_schedule.load_sorted_acs(sorted_ac_list_dict[mc_id])
+        for ac in ac_list:
+            if isinstance(ac, Operation):
+                ac.job.add_operation(ac)
+        return ac_list
+
+    def find_earliest_slot(
+        self,
+        job_id: str,
+        duration: Union[dt.timedelta, Dict[str, dt.timedelta]],
+        eligible_mc_ids: Optional[List[str]] = None,
+        release: Optional[dt.datetime] = None,
+        book: bool = False,
+        executor: Optional[Executor] = None,
+        chunk_size: int = 64,
+    ) -> Optional[Tuple[str, dt.datetime]]:
+        """Finds the machine and the start time of an operation that finishes earliest
+
+        Each machine answers with MCSchedule.earliest_fit, and the answers are
+        kept in a heap ordered by finish time (ties by the order of machines)
+
+        Args:
+            job_id (str): the id of the job of the operation
+            duration (Union[dt.timedelta, Dict[str, dt.timedelta]]): a processing time, or processing times by mc_id
+            eligible_mc_ids (List[str], optional): candidate machines (if None, all machines)
+            release (dt.datetime, optional): the earliest possible start (if None, the horizon start)
+            book (bool, optional): adds the operation to the found slot. Defaults to False.
+            executor (Executor, optional): a thread pool to query chunks of machines in parallel
+                (a query reads the gap index of a machine in O(log n), so a process pool,
+                which would pickle whole machine schedules and gap indexes per query, is rejected)
+            chunk_size (int, optional): the number of machines in a task of executor. Defaults to 64.
+
+        Raises:
+            KeyError: the job id or a machine id is not valid
+            ValueError: executor is a process pool
+
+        Returns:
+            Optional[Tuple[str, dt.datetime]]: (mc_id, start) of the slot, None if no machine has one
+        """
+        if job_id not in self.job_dict:
+            raise KeyError(f"Job {job_id} does not exist")
+        if isinstance(executor, ProcessPoolExecutor):
+            raise ValueError(
+                "find_earliest_slot takes a thread pool -- a process pool "
+                "pickles whole machine schedules on every query"
+            )
+        if eligible_mc_ids is None:
+            eligible_mc_ids = self.mc_id_list
+        release = self.horizon.start if release is None else release
+
+        mc_schedule_list: List[MCSchedule] = []
+        duration_list: List[dt.timedelta] = []
+        for mc_id in eligible_mc_ids:
+            if mc_id not in self.mc_dict:
+                raise KeyError(f"Machine {mc_id} does not exist")
+            mc_schedule_list.append(self.mc_dict[mc_id].mc_schedule)
+            if isinstance(duration, dict):
+                duration_list.append(duration[mc_id])
+            else:
+                duration_list.append(duration)
+
+        if executor is None:
+            start_list = earliest_fit_list(
+                mc_schedule_list, release, duration_list
+            )
+        else:
+            chunk_starts = range(0, len(mc_schedule_list), chunk_size)
+            start_list = []
+            for chunk_start_list in executor.map(
+                earliest_fit_list,
+                [mc_schedule_list[i : i + chunk_size] for i in chunk_starts],
+                [release] * len(chunk_starts),
+                [duration_list[i : i + chunk_size] for i in chunk_starts],
+            ):
+                start_list += chunk_start_list
+
+        slot_heap: List[Tuple[dt.datetime, int, dt.datetime]] = [
+            (start + duration_list[idx], idx, start)
+            for idx, start in enumerate(start_list)
+            if start is not None
+        ]
+        heapq.heapify(slot_heap)
+        while slot_heap:
+            _, idx, start = heapq.heappop(slot_heap)
+            mc_id = eligible_mc_ids[idx]
+            if book:
+                try:
+                    self.add_operation(
+                        mc_id, job_id, start, start + duration_list[idx]
+                    )
+                except ValueError:
+                    # the slot is rejected by add_activity; try the next one
+                    continue
+            return (mc_id, start)
+        return None
+
+    def activities_in(
+        self,
+        interval: Interval,
+        types: Optional[List[str]] = None,
+        mc_id_list: Optional[List[str]] = None,
+    ) -> Iterator[Activity]:
+        """Yields activities on any machine that overlap interval
+        in the order of start time
+
+        Each machine schedule is an index of its activities sorted by time,
+        kept up to date on every change; the window is found with a binary
+        search on each machine, so that the time is O(m log n + k)
+        for m machines and k yielded activities
+
+        Args:
+            interval (Interval): a window of time
+            types (List[str], optional): ac_types to be yielded
+                (if None, operations and breakdowns)
+            mc_id_list (List[str], optional): machines to look up (if None, all machines)
+
+        Raises:
+            KeyError: a machine id is not valid
+
+        Yields:
+            Iterator[Activity]: activities not distinct from interval
+        """
+        if types is None:
+            types = [
+                self.ac_types_param.operation,
+                self.ac_types_param.breakdown,
+            ]
+        if mc_id_list is None:
+            mc_id_list = self.mc_id_list
+        ac_iter_list: List[Iterator[Activity]] = []
+        for mc_id in mc_id_list:
+            if mc_id not in self.mc_dict:
+                raise KeyError(f"Machine {mc_id} does not exist")
+            ac_iter_list.append(
+                ac
+                for ac in self.mc_dict[mc_id].mc_schedule.ac_iter_in(interval)
+                if ac.ac_type in types
+            )
+        return heapq.merge(*ac_iter_list, key=lambda ac: ac.interval.start)
+
+    def snapshot_at(
+        self, moment: dt.datetime, mc_id_list: Optional[List[str]] = None
+    ) -> Dict[str, Optional[Activity]]:
+        """Returns the activity of each machine at moment
+        with MCSchedule.ac_at (a binary search on each machine)
+
+        Args:
+            moment (dt.datetime): a moment to look up
+            mc_id_list (List[str], optional): machines to look up (if None, all machines)
+
+        Raises:
+            KeyError: a machine id is not valid
+
+        Returns:
+            Dict[str, Optional[Activity]]: activities by mc_id
+                (None if no activity occupies moment)
+        """
+        if mc_id_list is None:
+            mc_id_list = self.mc_id_list
+        snapshot: Dict[str, Optional[Activity]] = {}
+        for mc_id in mc_id_list:
+            if mc_id not in self.mc_dict:
+                raise KeyError(f"Machine {mc_id} does not exist")
+            snapshot[mc_id] = self.mc_dict[mc_id].mc_schedule.ac_at(moment)
+        return snapshot
+
+    def intersection(
+        self,
+        other: "Schedule",
+        mc_id_list: Optional[List[str]] = None,
+        executor: Optional[Executor] = None,
+        chunk_size: int = 64,
+    ) -> Dict[str, List[Tuple[str, str, Interval]]]:
+        """Finds overlapping actual activities of machines in both schedules
+        (e.g. a plan and its actual) with MCSchedule.intersection
+
+        Args:
+            other (Schedule): a schedule to be compared
+            mc_id_list (List[str], optional): machines to be compared
+                (if None, the machines of self that are also in other)
+            executor (Executor, optional): an executor to compare chunks of machines in parallel
+                (a process pool pickles the machine schedules)
+            chunk_size (int, optional): the number of machines in a task of executor. Defaults to 64.
+
+        Raises:
+            KeyError: a machine id is not in both schedules
+
+        Returns:
+            Dict[str, List[Tuple[str, str, Interval]]]: (ac_id of self, ac_id of other,
+                the overlapping interval) by mc_id
+        """
+        if mc_id_list is None:
+            mc_id_list = [
+                mc_id for mc_id in self.mc_id_list if mc_id in other.mc_dict
+            ]
+        mc_schedule_list: List[MCSchedule] = []
+        other_mc_schedule_list: List[MCSchedule] = []
+        for mc_id in mc_id_list:
+            if mc_id not in self.mc_dict or mc_id not in other.mc_dict:
+                raise KeyError(f"Machine {mc_id} is not in both schedules")
+            mc_schedule_list.append(self.mc_dict[mc_id].mc_schedule)
+            other_mc_schedule_list.append(other.mc_dict[mc_id].mc_schedule)
+
+        if executor is None:
+            pair_list_list = intersection_list(
+                mc_schedule_list, other_mc_schedule_list
+            )
+        else:
+            chunk_starts = range(0, len(mc_schedule_list), chunk_size)
+            pair_list_list = []
+            for chunk_pair_list_list in executor.map(
+                intersection_list,
+                [mc_schedule_list[i : i + chunk_size] for i in chunk_starts],
+                [
+                    other_mc_schedule_list[i : i + chunk_size]
+                    for i in chunk_starts
+                ],
+            ):
+                pair_list_list += chunk_pair_list_list
+        return dict(zip(mc_id_list, pair_list_list))
+
     # TODO: def add_setup_to_mc
 
     def transform_interval_to_horizon(
@@ -244,16 +921,29 @@ class Schedule:
         start: dt.datetime = None,
         end: dt.datetime = None,
         horz_overlap: str = "trim",
+        executor: Optional[Executor] = None,
+        chunk_size: int = 64,
         **kwargs,
     ):
         """Transforms the schedule to conform with a new horizon
 
+        Activities in the new horizon are found with a binary search
+        on each machine and copied with their ac_ids and contents at once;
+        only the activities crossing the horizon boundary are trimmed
+
         Args:
             schedule_id (str): a name of the schedule
             mc_id_list (List[str], optional): a list of machine ids (if None, copied from **self.schedule**).
             start (dt.datetime, optional): a new value of the horizon  (if None, copied from **self.schedule**).
             end (dt.datetime, optional): a new value of the horizon. (if None, copied from **self.schedule**).
             horz_overlap (str, optional): an option for operations on the horizon boundary Defaults to "trim".
+            executor (Executor, optional): an executor to convert the times of chunks of machines
+                in parallel on the columnar backend; a process pool receives the tick columns
+                of the sliced rows and returns their moments (see ColumnarMCSchedule.slice_columns).
+                Activities are created in the calling process, which bounds the speedup
+                (see transform_benchmark). The other backends ignore executor,
+                since their workers would need whole machine schedules
+            chunk_size (int, optional): the number of machines in a task of executor. Defaults to 64.
 
         Raises:
             ValueError: **start** or **end** does not conform to the horizon
@@ -288,11 +978,15 @@ class Schedule:
                 "horz_overlap option 'include' is prohibited to prevent an inconsistent mc_schedule"
             )
 
-        new_schedule = Schedule(schedule_id, new_horizon, self.ac_types_param)
+        new_schedule = Schedule(
+            schedule_id, new_horizon, self.ac_types_param, self.backend
+        )
 
         for job_id in self.job_id_list:
             new_schedule.add_job(job_id)
 
+        new_mc_list: List[Machine] = []
+        mc_schedule_list: List[MCSchedule] = []
         for mc_id in mc_id_list:
             new_mc = new_schedule.add_machine(mc_id)
             try:
@@ -302,27 +996,221 @@ class Schedule:
                     f"Warning: Machine {mc_id} is not in schedule {self.schedule_id} (ignored)"
                 )
                 continue
-            for ac in old_mc.ac_iter():
-                if ac.ac_type == self.ac_types_param.idle:
-                    continue
+            new_mc_list.append(new_mc)
+            mc_schedule_list.append(old_mc.mc_schedule)
 
-                new_interval = self.transform_interval_to_horizon(
-                    ac.interval, new_horizon, horz_overlap
+        if executor is None or self.backend != "columnar":
+            rows_list = slice_rows_list(
+                mc_schedule_list, new_horizon, horz_overlap
+            )
+        else:
+            # boundary rows are binary-searched and sliced here; workers
+            # convert the tick columns only and return their moments
+            column_slices = [
+                mc_schedule.slice_columns(new_horizon, horz_overlap)
+                for mc_schedule in mc_schedule_list
+            ]
+            ticks_list = [
+                ticks
+                for column_slice in column_slices
+                for ticks in (column_slice.starts, column_slice.ends)
+            ]
+            moments_list: List[List[Any]] = []
+            if column_slices:
+                convert = partial(
+                    moments_of_ticks_list,
+                    horizon_start=column_slices[0].horizon_start,
+                    origin=column_slices[0].origin,
                 )
-
-                if new_interval != None:
-                    if ac.ac_type == self.ac_types_param.operation:
-                        job_id = ac.job.job_id
-                        new_schedule.add_operation(
-                            mc_id, job_id, *new_interval.dt_range()
-                        )
-                    elif ac.ac_type == self.ac_types_param.breakdown:
-                        new_schedule.add_breakdown(
-                            mc_id, *new_interval.dt_range()
-                        )
+                for chunk_moments_list in executor.map(
+                    convert,
+                    [
+                        ticks_list[i : i + 2 * chunk_size]
+                        for i in range(0, len(ticks_list), 2 * chunk_size)
+                    ],
+                ):
+                    moments_list += chunk_moments_list
+            rows_list = [
+                column_slice.rows(start_moments, end_moments)
+                for column_slice, start_moments, end_moments in zip(
+                    column_slices, moments_list[0::2], moments_list[1::2]
+                )
+            ]
+
+        for new_mc, old_mc_schedule, rows in zip(
+            new_mc_list, mc_schedule_list, rows_list
+        ):
+            new_mc_schedule = new_mc.mc_schedule
+            # ac_ids issued later do not collide with the copied ones
+            new_mc_schedule.ac_cum_counts.update(old_mc_schedule.ac_cum_counts)
+            if not rows:
+                continue
+            new_ac_list = [
+                new_mc_schedule.make_ac_of_row(row, new_schedule.job_dict)
+                for row in rows
+            ]
+            new_mc_schedule.load_sorted_acs(new_ac_list)
+            for new_ac in new_ac_list:
+                if new_ac.ac_type == self.ac_types_param.operation:
+                    new_ac.job.add_operation(new_ac)
 
         return new_schedule
 
+    def view(
+        self,
+        start: dt.datetime = None,
+        end: dt.datetime = None,
+        mc_id_list: Optional[List[str]] = None,
+    ) -> ScheduleView:
+        """Returns a read-only view of the schedule in a window of time
+        without copying activities (see transform to create a schedule)
+
+        Activities crossing the window boundary are trimmed when iterated
+
+        Args:
+            start (dt.datetime, optional): the start of the window (if None, the start of the horizon)
+            end (dt.datetime, optional): the end of the window (if None, the end of the horizon)
+            mc_id_list (List[str], optional): machines to be viewed (if None, all machines)
+
+        Raises:
+            ValueError: **start** or **end** does not conform to the horizon
+            KeyError: a machine id is not valid
+
+        Returns:
+            ScheduleView: a view with mc_iter, ac_iter and operation_iter
+        """
+        start = self.horizon.start if (start == None) else start
+        end = self.horizon.end if (end == None) else end
+        window = Interval(start, end)
+        if not (
+            self.horizon.in_closed_interval(window.start)
+            and self.horizon.in_closed_interval(window.end)
+        ):
+            raise ValueError(
+                f"The window {window} is not in the horizon {self.horizon}"
+            )
+        mc_id_list = (
+            list(self.mc_id_list) if (mc_id_list == None) else mc_id_list
+        )
+        for mc_id in mc_id_list:
+            if mc_id not in self.mc_dict:
+                raise KeyError(f"Machine {mc_id} does not exist")
+        return ScheduleView(self, window, mc_id_list)
+
+
+def earliest_fit_list(
+    mc_schedule_list: List[MCSchedule],
+    release: dt.datetime,
+    duration_list: List[dt.timedelta],
+) -> List[Optional[dt.datetime]]:
+    """Returns MCSchedule.earliest_fit of each machine schedule
+    (a task of Schedule.find_earliest_slot)
+
+    Args:
+        mc_schedule_list (List[MCSchedule]): machine schedules
+        release (dt.datetime): the earliest possible start
+        duration_list (List[dt.timedelta]): durations on the machine schedules
+
+    Returns:
+        List[Optional[dt.datetime]]: the earliest start on each machine schedule
+    """
+    return [
+        mc_schedule.earliest_fit(release, duration)
+        for mc_schedule, duration in zip(mc_schedule_list, duration_list)
+    ]
+
+
+def make_operation_list(
+    mc_schedule_list: List[MCSchedule],
+    mc_indices: Iterable[int],
+    rows: Iterable[int],
+) -> List[Operation]:
+    """Creates operations from rows of columnar machine schedules
+    (a loader of deferred operations of Schedule.from_state)
+
+    Args:
+        mc_schedule_list (List[MCSchedule]): columnar machine schedules
+        mc_indices (Iterable[int]): indices of mc_schedule_list
+        rows (Iterable[int]): rows of the operations on their machines
+
+    Returns:
+        List[Operation]: the created operations
+    """
+    return [
+        mc_schedule_list[mc_index].make_ac(row)
+        for mc_index, row in zip(mc_indices, rows)
+    ]
+
+
+def intersection_list(
+    mc_schedule_list: List[MCSchedule],
+    other_mc_schedule_list: List[MCSchedule],
+) -> List[List[Tuple[str, str, Interval]]]:
+    """Returns MCSchedule.intersection of each pair of machine schedules
+    with ac_ids (a task of Schedule.intersection)
+
+    Args:
+        mc_schedule_list (List[MCSchedule]): machine schedules
+        other_mc_schedule_list (List[MCSchedule]): machine schedules to be compared
+
+    Returns:
+        List[List[Tuple[str, str, Interval]]]: (ac_id, ac_id of other, overlap) of each pair
+    """
+    return [
+        [
+            (ac.ac_id, other_ac.ac_id, overlap)
+            for ac, other_ac, overlap in mc_schedule.intersection(
+                other_mc_schedule
+            )
+        ]
+        for mc_schedule, other_mc_schedule in zip(
+            mc_schedule_list, other_mc_schedule_list
+        )
+    ]
+
+
+def slice_rows_list(
+    mc_schedule_list: List[MCSchedule], horizon: Interval, horz_overlap: str
+) -> List[List[Tuple[Any, ...]]]:
+    """Returns MCSchedule.slice_rows of each machine schedule
+    (a task of Schedule.transform)
+
+    Args:
+        mc_schedule_list (List[MCSchedule]): machine schedules
+        horizon (Interval): a new horizon
+        horz_overlap (str): an option for activities on the horizon boundary
+
+    Returns:
+        List[List[Tuple[Any, ...]]]: rows of each machine schedule
+    """
+    return [
+        mc_schedule.slice_rows(horizon, horz_overlap)
+        for mc_schedule in mc_schedule_list
+    ]
+
+
+def moments_of_ticks_list(
+    ticks_list: List["np.ndarray"],
+    horizon_start: dt.datetime,
+    origin: Optional[int] = None,
+) -> List[List[Any]]:
+    """Converts tick columns of column slices to moments
+    (a task of Schedule.transform on the columnar backend)
+
+    Args:
+        ticks_list (List[np.ndarray]): int64 ticks of ColumnSlice.starts or ends
+        horizon_start (dt.datetime): the moment of tick 0
+        origin (int, optional): the Moment of tick 0 on a Moment horizon
+
+    Returns:
+        List[List[Any]]: moments of each tick column
+    """
+    from mstk.schedule.columnar import moments_of_ticks
+
+    return [
+        moments_of_ticks(ticks, horizon_start, origin) for ticks in ticks_list
+    ]
+
 
 def transform_test():
     ### Transformation test
@@ -344,6 +1232,58 @@ def transform_test():
     plot_schedule.draw_Gantt()
 
 
+def transform_benchmark(
+    n_machines: int = 64,
+    n_operations: int = 5000,
+    max_workers_list: Tuple[int, ...] = (1, 2, 4),
+):
+    ### Transformation benchmark of the columnar backend with process pools
+    import os
+    import time
+
+    start = dt.datetime(2020, 1, 1)
+    minute = dt.timedelta(minutes=1)
+    test_schedule = Schedule(
+        "bench",
+        Interval(start, start + minute * (3 * n_operations + 10)),
+        AcTypesParam(),
+        "columnar",
+    )
+    test_schedule.add_job("J1")
+    for mc_idx in range(n_machines):
+        test_schedule.add_machine(f"M{mc_idx}")
+        test_schedule.bulk_add(
+            {
+                "mc_id": f"M{mc_idx}",
+                "ac_type": "Operation",
+                "job_id": "J1",
+                "start": start + minute * (3 * idx),
+                "end": start + minute * (3 * idx + 2),
+            }
+            for idx in range(n_operations)
+        )
+    new_start = start + minute * n_operations
+    new_end = start + minute * (2 * n_operations)
+    print(
+        f"{n_machines} machines x {n_operations} operations, {os.cpu_count()} CPUs"
+    )
+
+    tic = time.perf_counter()
+    test_schedule.transform("serial", start=new_start, end=new_end)
+    print(f"serial: {time.perf_counter() - tic:.2f}s")
+    for max_workers in max_workers_list:
+        with ProcessPoolExecutor(max_workers) as executor:
+            tic = time.perf_counter()
+            test_schedule.transform(
+                "pooled",
+                start=new_start,
+                end=new_end,
+                executor=executor,
+                chunk_size=max(1, n_machines // max_workers),
+            )
+            print(f"{max_workers} workers: {time.perf_counter() - tic:.2f}s")
+
+
 def main():
 
     from mstk.test import sample_proj_folder
@@ -0,0 +1,237 @@
+""" Read-only views of a schedule in a window of time
+Created on 17th Oct. 2026
+"""
+from __future__ import annotations
+
+__all__ = ["MachineView", "ScheduleView"]
+
+# common Python packages
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Union
+
+# defined packages
+from mstk.schedule.interval import Interval
+from mstk.schedule.activity import Activity, Operation, Breakdown, Idle
+
+if TYPE_CHECKING:
+    from mstk.schedule.ac_types import AcTypesParam
+    from mstk.schedule.machine import Machine
+    from mstk.schedule.schedule import Schedule
+
+
+class MachineView:
+    """A read-only view of a machine in a window of time
+
+    Activities are found with a binary search on the machine schedule
+    and yielded as they are, except the ones crossing the window boundary,
+    which are yielded as copies with trimmed intervals.
+    Nothing is copied in advance, so the view follows later changes
+    of the machine schedule
+    """
+
+    __slots__ = ["__mc", "__window"]
+
+    def __init__(self, mc: "Machine", window: Interval):
+        """
+        Args:
+            mc (Machine): a machine to be viewed
+            window (Interval): a window of time in the horizon
+        """
+        self.__mc: "Machine" = mc
+        self.__window: Interval = window
+
+    @property
+    def mc(self) -> "Machine":
+        return self.__mc
+
+    @property
+    def mc_id(self) -> str:
+        return self.__mc.mc_id
+
+    @property
+    def contents(self) -> Dict[str, Any]:
+        return self.__mc.contents
+
+    @property
+    def window(self) -> Interval:
+        return self.__window
+
+    def __repr__(self) -> str:
+        return f"MachineView({self.mc_id}, {self.__window})"
+
+    def ac_iter(self) -> Iterator[Activity]:
+        """
+        Yields:
+            Iterator[Activity]
+        """
+        mc_schedule = self.__mc.mc_schedule
+        window = self.__window
+        for ac in mc_schedule.ac_iter_in(window):
+            if window.start <= ac.interval.start and (
+                ac.interval.end <= window.end
+            ):
+                yield ac
+            else:
+                yield mc_schedule.copy_ac(
+                    ac, ac.mc, {}, window.intersect(ac.interval)
+                )
+
+    def ac_iter_of_types(self, ac_type_list: List[str]) -> Iterator[Activity]:
+        """
+        Raises:
+            KeyError: ac_type_list contains an unsupported activity type
+
+        Yields:
+            Iterator[Activity]
+        """
+        all_types = self.__mc.mc_schedule.ac_types_param.all_types
+        if not all((ac_type in all_types) for ac_type in ac_type_list):
+            raise KeyError(
+                f"List {ac_type_list} contains an unsupported activity type"
+            )
+        for ac in self.ac_iter():
+            if ac.ac_type in ac_type_list:
+                yield ac
+
+    def operation_iter(self) -> Iterator[Operation]:
+        """
+        Yields:
+            Iterator[Operation]
+        """
+        operation_type = self.__mc.mc_schedule.ac_types_param.operation
+        return self.ac_iter_of_types([operation_type])
+
+    def actual_ac_iter(self) -> Iterator[Union[Operation, Breakdown]]:
+        """
+        Yields:
+            Iterator[Union[Operation, Breakdown]]
+        """
+        idle_type = self.__mc.mc_schedule.ac_types_param.idle
+        for ac in self.ac_iter():
+            if ac.ac_type != idle_type:
+                yield ac
+
+    def idle_ac_iter(self) -> Iterator[Idle]:
+        """
+        Yields:
+            Iterator[Idle]
+        """
+        idle_type = self.__mc.mc_schedule.ac_types_param.idle
+        return self.ac_iter_of_types([idle_type])
+
+
+class ScheduleView:
+    """A read-only view of a schedule in a window of time
+    (see Schedule.view)
+
+    Machines are looked up in the schedule on every iteration,
+    so that the view follows later changes (including copies
+    of forked schedules made on the first change)
+    """
+
+    __slots__ = ["__schedule", "__horizon", "__mc_id_list"]
+
+    def __init__(
+        self, schedule: "Schedule", horizon: Interval, mc_id_list: List[str]
+    ):
+        """
+        Args:
+            schedule (Schedule): a schedule to be viewed
+            horizon (Interval): a window of time in the horizon of schedule
+            mc_id_list (List[str]): ids of machines to be viewed
+        """
+        self.__schedule: "Schedule" = schedule
+        self.__horizon: Interval = horizon
+        self.__mc_id_list: List[str] = mc_id_list
+
+    @property
+    def schedule(self) -> "Schedule":
+        return self.__schedule
+
+    @property
+    def schedule_id(self) -> str:
+        return self.__schedule.schedule_id
+
+    @property
+    def horizon(self) -> Interval:
+        return self.__horizon
+
+    @property
+    def mc_id_list(self) -> List[str]:
+        return list(self.__mc_id_list)
+
+    @property
+    def job_id_list(self) -> List[str]:
+        return list(self.__schedule.job_id_list)
+
+    @property
+    def ac_types_param(self) -> "AcTypesParam":
+        return self.__schedule.ac_types_param
+
+    def __repr__(self) -> str:
+        return f"ScheduleView({self.schedule_id}, {self.__horizon})"
+
+    def mc_view(self, mc_id: str) -> MachineView:
+        """Returns a view of a machine in the window
+
+        Args:
+            mc_id (str): the id of a viewed machine
+
+        Raises:
+            KeyError: the machine is not in the view
+
+        Returns:
+            MachineView
+        """
+        if mc_id not in self.__mc_id_list:
+            raise KeyError(f"Machine {mc_id} is not in the view")
+        return MachineView(self.__schedule.mc_dict[mc_id], self.__horizon)
+
+    def mc_iter(self) -> Iterator[MachineView]:
+        """
+        Yields:
+            Iterator[MachineView]
+        """
+        for mc_id in self.__mc_id_list:
+            yield MachineView(self.__schedule.mc_dict[mc_id], self.__horizon)
+
+    def ac_iter(self) -> Iterator[Activity]:
+        """Yields activities of the machines in the order of mc_id_list
+
+        Yields:
+            Iterator[Activity]
+        """
+        for mc_view in self.mc_iter():
+            yield from mc_view.ac_iter()
+
+    def operation_iter(self) -> Iterator[Operation]:
+        """Yields operations of the machines in the order of mc_id_list
+
+        Yields:
+            Iterator[Operation]
+        """
+        for mc_view in self.mc_iter():
+            yield from mc_view.operation_iter()
+
+
+def main():
+    import datetime as dt
+    from mstk.schedule.ac_types import AcTypesParam
+    from mstk.schedule.schedule import Schedule
+
+    start = dt.datetime(2020, 1, 1)
+    hours = lambda n: start + dt.timedelta(hours=n)
+    schedule = Schedule("test", Interval(start, hours(24)), AcTypesParam())
+    schedule.add_machine("M1")
+    schedule.add_job("J1")
+    schedule.add_operation("M1", "J1", hours(2), hours(6))
+    schedule.add_breakdown("M1", hours(8), hours(9))
+
+    schedule_view = schedule.view(hours(4), hours(12))
+    print(schedule_view)
+    for mc_view in schedule_view.mc_iter():
+        for ac in mc_view.ac_iter():
+            print(mc_view.mc_id, ac)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+""" Binary columnar snapshots of schedules (see Schedule.save)
+Created on 17th Oct. 2026
+"""
+from __future__ import annotations
+
+__all__ = ["save_schedule", "load_schedule"]
+
+# common Python packages
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Dict,
+    Any,
+    Tuple,
+    Union,
+    Iterator,
+    BinaryIO,
+)
+
+from contextlib import contextmanager
+from functools import partial
+import datetime as dt
+import json, os, pickle
+
+import numpy as np
+
+# defined packages
+from mstk.schedule import to_dt
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.columnar import TICK, RowContents
+
+if TYPE_CHECKING:
+    from mstk.schedule.schedule import Schedule
+
+SNAPSHOT_FORMAT = "mstk.schedule.snapshot"
+SNAPSHOT_VERSION = 2
+HEADER_FILE = "header.json"
+CONTENTS_FILE = "contents.pkl"
+
+# columns of activities (rows of each machine are sorted by start time,
+# and machines are in the order of mc_id_list), contents of activities
+# (pickled bytes of rows, from offsets[row] to offsets[row + 1]),
+# and operations of jobs (rows of activities in the order of job_id_list
+# and operation lists)
+COLUMN_DTYPES = {
+    "starts": np.int64,
+    "ends": np.int64,
+    "type_codes": np.int8,
+    "mc_indices": np.int32,
+    "job_indices": np.int32,
+    "ac_ids": np.str_,
+    "ac_contents": np.uint8,
+    "ac_contents_offsets": np.int64,
+    "job_op_counts": np.int64,
+    "job_op_rows": np.int64,
+}
+
+
+def save_schedule(schedule: "Schedule", path: str):
+    """Saves a schedule to a folder (created if it does not exist)
+
+    The folder contains
+
+    - header.json: the schedule id, the backend, the horizon, ac types,
+      the tables of mc_ids and job_ids, and ac_cum_counts of machines
+    - .npy columns (see COLUMN_DTYPES): starts and ends in ticks from the
+      horizon start (microseconds, or ticks of Moments), codes of ac_types
+      (indices of ac_types_param.all_types), indices of machines and jobs
+      (-1 for no job), ac_ids, contents of activities pickled by row,
+      and rows of the operations of jobs
+    - contents.pkl: contents of machines and jobs
+
+    Stored activities are saved as they are, so that idles are kept
+    for the default backend (see MCSchedule.get_state).
+    Files are written to temporary files and then replaced,
+    so that schedules loaded from the folder keep their mapped columns
+
+    Args:
+        schedule (Schedule): a schedule to be saved
+        path (str): the folder path
+    """
+    os.makedirs(path, exist_ok=True)
+    horizon_start, horizon_end = schedule.horizon.dt_range()
+    is_moment = isinstance(horizon_start, to_dt.Moment)
+    job_index_dict = {
+        job_id: job_index
+        for job_index, job_id in enumerate(schedule.job_id_list)
+    }
+
+    column_lists: Dict[str, List[np.ndarray]] = {
+        name: [] for name in ["starts", "ends", "type_codes", "job_indices"]
+    }
+    mc_sizes: List[int] = []
+    ac_id_list: List[str] = []
+    ac_contents: List[bytes] = []
+    ac_cum_counts_list: List[Dict[str, int]] = []
+    # rows of activities on each machine by ac_id, built on the first lookup
+    row_dict_list: List[Any] = []
+    row_offset = 0
+    for mc in schedule.mc_iter():
+        (
+            ac_cum_counts,
+            starts,
+            ends,
+            type_codes,
+            job_indices,
+            ac_ids,
+            contents,
+            job_id_list,
+        ) = mc.mc_schedule.get_state()
+        if not isinstance(starts, np.ndarray):
+            starts = _to_ticks(starts, horizon_start, is_moment)
+            ends = _to_ticks(ends, horizon_start, is_moment)
+        # job indices of the machine to the ones of the schedule
+        # (the last entry keeps -1 of breakdowns and idles)
+        job_table = np.array(
+            [job_index_dict[job_id] for job_id in job_id_list] + [-1],
+            dtype=np.int32,
+        )
+        column_lists["starts"].append(np.asarray(starts, dtype=np.int64))
+        column_lists["ends"].append(np.asarray(ends, dtype=np.int64))
+        column_lists["type_codes"].append(np.asarray(type_codes, np.int8))
+        column_lists["job_indices"].append(
+            job_table[np.asarray(job_indices, dtype=np.int32)]
+        )
+        mc_sizes.append(len(ac_ids))
+        ac_id_list += ac_ids
+        ac_contents += [
+            pickle.dumps(ac_content, protocol=pickle.HIGHEST_PROTOCOL)
+            if ac_content
+            else b""
+            for ac_content in contents
+        ]
+        ac_cum_counts_list.append(dict(ac_cum_counts))
+        row_dict_list.append((row_offset, ac_ids))
+        row_offset += len(ac_ids)
+
+    job_op_counts: List[int] = []
+    job_op_rows: List[int] = []
+    mc_index_dict = {
+        mc_id: mc_index for mc_index, mc_id in enumerate(schedule.mc_id_list)
+    }
+    for job in schedule.job_iter():
+        job_op_counts.append(len(job.operation_list))
+        for operation in job.oper_iter():
+            mc_index = mc_index_dict[operation.mc.mc_id]
+            if isinstance(row_dict_list[mc_index], tuple):
+                offset, ac_ids = row_dict_list[mc_index]
+                row_dict_list[mc_index] = {
+                    ac_id: offset + row for row, ac_id in enumerate(ac_ids)
+                }
+            job_op_rows.append(row_dict_list[mc_index][operation.ac_id])
+
+    columns: Dict[str, np.ndarray] = {
+        name: _concatenate(column_list, COLUMN_DTYPES[name])
+        for name, column_list in column_lists.items()
+    }
+    columns["mc_indices"] = np.repeat(
+        np.arange(len(mc_sizes), dtype=np.int32), mc_sizes
+    )
+    columns["ac_ids"] = np.array(ac_id_list, dtype=np.str_)
+    columns["ac_contents"] = np.frombuffer(b"".join(ac_contents), np.uint8)
+    columns["ac_contents_offsets"] = np.cumsum(
+        [0] + [len(ac_content) for ac_content in ac_contents], dtype=np.int64
+    )
+    columns["job_op_counts"] = np.array(job_op_counts, dtype=np.int64)
+    columns["job_op_rows"] = np.array(job_op_rows, dtype=np.int64)
+    for name, column in columns.items():
+        with _replacing(os.path.join(path, f"{name}.npy")) as file_data:
+            np.save(file_data, column)
+
+    with _replacing(os.path.join(path, CONTENTS_FILE)) as file_data:
+        pickle.dump(
+            (
+                [mc.contents for mc in schedule.mc_iter()],
+                [job.contents for job in schedule.job_iter()],
+            ),
+            file_data,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "schedule_id": schedule.schedule_id,
+        "backend": schedule.backend,
+        "horizon": {
+            "start": _moment_to_json(horizon_start, is_moment),
+            "end": _moment_to_json(horizon_end, is_moment),
+            "moment": is_moment,
+        },
+        "ac_types": schedule.ac_types_param.to_dict(),
+        "mc_id_list": list(schedule.mc_id_list),
+        "job_id_list": list(schedule.job_id_list),
+        "ac_cum_counts": ac_cum_counts_list,
+        "size": len(ac_id_list),
+    }
+    if is_moment:
+        header["moment"] = {
+            "resolution": to_dt.Moment.resolution // TICK,
+            "epoch": to_dt.Moment.epoch.isoformat(),
+        }
+    with _replacing(os.path.join(path, HEADER_FILE)) as file_data:
+        file_data.write(json.dumps(header, indent=4).encode("utf-8"))
+
+
+def load_schedule(path: str, mmap: bool = True) -> "Schedule":
+    """Loads a schedule saved by save_schedule
+
+    With mmap, the columns are memory-mapped in copy-on-write mode,
+    so that pages are read when they are used and changes are not written
+    to the files. The columnar backend uses slices of them as its columns
+    without copying, unpickles contents of activities on their first access
+    (see RowContents), and creates operations of a job on its first access
+    (see Job.defer_operations). Ids of activities are still read into lists,
+    and the other backends create their activities on loading
+
+    Args:
+        path (str): the folder path
+        mmap (bool, optional): memory-maps the columns. Defaults to True.
+
+    Raises:
+        ValueError: the folder is not a snapshot of a supported version,
+            or Moments of the snapshot have another resolution or epoch
+
+    Returns:
+        Schedule: the loaded schedule
+    """
+    from mstk.schedule.schedule import Schedule
+
+    with open(
+        os.path.join(path, HEADER_FILE), "r", encoding="utf-8"
+    ) as file_data:
+        header = json.load(file_data)
+    if (
+        header.get("format") != SNAPSHOT_FORMAT
+        or header.get("version") != SNAPSHOT_VERSION
+    ):
+        raise ValueError(f"{path} is not a schedule snapshot")
+    is_moment = header["horizon"]["moment"]
+    if is_moment and (
+        header["moment"]["resolution"] != to_dt.Moment.resolution // TICK
+        or header["moment"]["epoch"] != to_dt.Moment.epoch.isoformat()
+    ):
+        raise ValueError(f"Moments of {path} have another resolution or epoch")
+    horizon_start = _moment_of_json(header["horizon"]["start"], is_moment)
+    horizon_end = _moment_of_json(header["horizon"]["end"], is_moment)
+
+    mmap_mode = "c" if mmap else None
+    columns = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+        for name in COLUMN_DTYPES
+    }
+    with open(os.path.join(path, CONTENTS_FILE), "rb") as file_data:
+        mc_contents, job_contents = pickle.load(file_data)
+
+    mc_id_list = header["mc_id_list"]
+    job_id_list = header["job_id_list"]
+    is_columnar = header["backend"] == "columnar"
+    # rows of machines are found by binary searches on mc_indices
+    bounds = np.searchsorted(
+        columns["mc_indices"], np.arange(len(mc_id_list) + 1)
+    ).tolist()
+    mc_states: List[Tuple[Any, ...]] = []
+    for mc_index, ac_cum_counts in enumerate(header["ac_cum_counts"]):
+        first, last = bounds[mc_index], bounds[mc_index + 1]
+        starts = columns["starts"][first:last]
+        ends = columns["ends"][first:last]
+        if not is_columnar:
+            starts = _of_ticks(starts, horizon_start, is_moment)
+            ends = _of_ticks(ends, horizon_start, is_moment)
+        # jobs of the machine, and indices into them
+        job_indices = np.asarray(columns["job_indices"][first:last])
+        has_job = job_indices >= 0
+        job_table, local_indices = np.unique(
+            job_indices[has_job], return_inverse=True
+        )
+        local_job_indices = np.full(last - first, -1, dtype=np.int32)
+        local_job_indices[has_job] = local_indices
+        mc_states.append(
+            (
+                ac_cum_counts,
+                starts,
+                ends,
+                columns["type_codes"][first:last],
+                local_job_indices,
+                columns["ac_ids"][first:last].tolist(),
+                RowContents(
+                    last - first,
+                    partial(
+                        _unpickle_contents,
+                        columns["ac_contents"],
+                        columns["ac_contents_offsets"][first : last + 1],
+                    ),
+                ),
+                [job_id_list[job_index] for job_index in job_table.tolist()],
+            )
+        )
+
+    # rows of operations on their machines
+    job_op_rows = np.asarray(columns["job_op_rows"])
+    job_op_mc_indices = np.asarray(columns["mc_indices"])[job_op_rows]
+    job_op_local_rows = job_op_rows - np.asarray(bounds)[job_op_mc_indices]
+    return Schedule.from_state(
+        {
+            "schedule_id": header["schedule_id"],
+            "horizon": (horizon_start, horizon_end),
+            "ac_types_param": AcTypesParam.from_dict(header["ac_types"]),
+            "backend": header["backend"],
+            "mc_id_list": mc_id_list,
+            "mc_contents": mc_contents,
+            "mc_states": mc_states,
+            "job_id_list": job_id_list,
+            "job_contents": job_contents,
+            "job_op_counts": columns["job_op_counts"].tolist(),
+            "job_op_mc_indices": job_op_mc_indices.tolist(),
+            "job_op_ac_ids": (
+                None
+                if is_columnar
+                else columns["ac_ids"][job_op_rows].tolist()
+            ),
+            "job_op_rows": job_op_local_rows.tolist(),
+        }
+    )
+
+
+@contextmanager
+def _replacing(fname: str) -> Iterator[BinaryIO]:
+    # writes a temporary file, and replaces fname with it when finished
+    temp_fname = f"{fname}.tmp"
+    try:
+        with open(temp_fname, "wb") as file_data:
+            yield file_data
+        os.replace(temp_fname, fname)
+    finally:
+        if os.path.exists(temp_fname):
+            os.remove(temp_fname)
+
+
+def _to_ticks(
+    moment_list: List[Any], horizon_start: Any, is_moment: bool
+) -> np.ndarray:
+    # moments to ticks from the horizon start
+    if is_moment:
+        return np.array(moment_list, dtype=np.int64) - int(horizon_start)
+    return np.array(
+        [(moment - horizon_start) // TICK for moment in moment_list],
+        dtype=np.int64,
+    )
+
+
+def _of_ticks(
+    ticks: np.ndarray, horizon_start: Any, is_moment: bool
+) -> List[Any]:
+    # ticks from the horizon start to moments
+    if is_moment:
+        origin = int(horizon_start)
+        return [to_dt.Moment(origin + tick) for tick in ticks.tolist()]
+    if horizon_start.tzinfo is None:
+        # datetime64[us] is converted to datetime.datetime by tolist
+        return (
+            np.datetime64(horizon_start, "us")
+            + np.asarray(ticks).astype("timedelta64[us]")
+        ).tolist()
+    return [horizon_start + tick * TICK for tick in ticks.tolist()]
+
+
+def _unpickle_contents(
+    data: np.ndarray, offsets: np.ndarray, row: int
+) -> Dict[str, Any]:
+    # contents of a row pickled in data[offsets[row]:offsets[row + 1]]
+    start, end = int(offsets[row]), int(offsets[row + 1])
+    if start == end:
+        return {}
+    return pickle.loads(data[start:end].tobytes())
+
+
+def _concatenate(array_list: List[np.ndarray], dtype: Any) -> np.ndarray:
+    if not array_list:
+        return np.empty(0, dtype=dtype)
+    return np.concatenate(array_list).astype(dtype, copy=False)
+
+
+def _moment_to_json(moment: Any, is_moment: bool) -> Union[int, str]:
+    return int(moment) if is_moment else moment.isoformat()
+
+
+def _moment_of_json(value: Union[int, str], is_moment: bool) -> Any:
+    if is_moment:
+        return to_dt.Moment(value)
+    return dt.datetime.fromisoformat(value)
+
+
+def main():
+    import tempfile
+    from mstk.schedule.schedule import Schedule
+    from mstk.schedule.interval import Interval
+
+    start = dt.datetime(2020, 1, 1)
+    hours = lambda n: start + dt.timedelta(hours=n)
+    schedule = Schedule(
+        "test", Interval(start, hours(24)), AcTypesParam(), "columnar"
+    )
+    schedule.add_machine("M1")
+    schedule.add_job("J1")
+    schedule.add_operation("M1", "J1", hours(2), hours(6))
+    schedule.add_breakdown("M1", hours(8), hours(9))
+
+    with tempfile.TemporaryDirectory() as path:
+        schedule.save(path)
+        loaded = Schedule.load(path)
+        for ac in loaded.mc_dict["M1"].ac_iter():
+            print(ac)
+
+
+if __name__ == "__main__":
+    main()
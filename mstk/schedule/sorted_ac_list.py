@@ -0,0 +1,384 @@
+""" Sorted activity container for machine schedules
+Created on 16th Oct. 2026
+"""
+from __future__ import annotations
+
+__all__ = ["SortedAcList", "AcIdList"]
+
+# common Python packages
+from typing import TYPE_CHECKING, List, Tuple, Iterator, Optional, Union
+from collections.abc import Sequence
+from bisect import bisect_left, bisect_right
+
+import datetime as dt
+
+if TYPE_CHECKING:
+    from mstk.schedule.activity import Activity
+
+
+class SortedAcList:
+    """A sequence of activities sorted by their start times
+
+    Activities are stored in a list of blocks whose lengths are bounded by
+    2 * load; the last start time of each block is kept in a separate list.
+    Searching a block and a position in the block are bisections,
+    so insertion, deletion and lookups cost O(log n + load).
+
+    Activities starting at the same moment are ordered as follows:
+    activities of duration 0 precede the one with a positive duration,
+    and activities of duration 0 keep the order of their insertion.
+
+    Warning:
+        The start time of an activity is the key of the container;
+        remove an activity before changing its start time and add it again
+    """
+
+    __slots__ = ["__load", "__start_blocks", "__ac_blocks", "__maxes", "__len"]
+
+    def __init__(self, load: int = 256):
+        self.__load: int = load
+        self.__start_blocks: List[List[dt.datetime]] = []
+        self.__ac_blocks: List[List["Activity"]] = []
+        self.__maxes: List[dt.datetime] = []
+        self.__len: int = 0
+
+    @property
+    def load(self) -> int:
+        return self.__load
+
+    def __len__(self) -> int:
+        return self.__len
+
+    def __iter__(self) -> Iterator["Activity"]:
+        for ac_block in self.__ac_blocks:
+            yield from ac_block
+
+    def __reversed__(self) -> Iterator["Activity"]:
+        for ac_block in reversed(self.__ac_blocks):
+            yield from reversed(ac_block)
+
+    def __repr__(self) -> str:
+        return f"SortedAcList({len(self)} activities)"
+
+    def at(self, index: int) -> "Activity":
+        """Returns the activity at a position in the order of the container
+
+        Args:
+            index (int): a position (negative positions count from the end)
+
+        Raises:
+            IndexError: if index is out of range
+
+        Returns:
+            Activity: the activity found by walking the lengths of the blocks
+        """
+        if index < 0:
+            index += self.__len
+        if not 0 <= index < self.__len:
+            raise IndexError(f"{index} is out of range")
+        for ac_block in self.__ac_blocks:
+            if index < len(ac_block):
+                return ac_block[index]
+            index -= len(ac_block)
+        raise IndexError(f"{index} is out of range")
+
+    def clear(self):
+        """Removes all activities"""
+        self.__start_blocks = []
+        self.__ac_blocks = []
+        self.__maxes = []
+        self.__len = 0
+
+    def reset(self, sorted_ac_list: List["Activity"]):
+        """Replaces all activities with activities already in order
+
+        Args:
+            sorted_ac_list (List[Activity]): activities in the order of the container
+        """
+        load = self.__load
+        self.__ac_blocks = [
+            sorted_ac_list[idx : idx + load]
+            for idx in range(0, len(sorted_ac_list), load)
+        ]
+        self.__start_blocks = [
+            [ac.interval.start for ac in ac_block]
+            for ac_block in self.__ac_blocks
+        ]
+        self.__maxes = [start_block[-1] for start_block in self.__start_blocks]
+        self.__len = len(sorted_ac_list)
+
+    def first(self) -> Optional["Activity"]:
+        """Returns the earliest activity (None if empty)"""
+        return self.__ac_blocks[0][0] if self.__len else None
+
+    def last(self) -> Optional["Activity"]:
+        """Returns the latest activity (None if empty)"""
+        return self.__ac_blocks[-1][-1] if self.__len else None
+
+    def add(self, ac: "Activity"):
+        """Inserts an activity according to its start time
+
+        Args:
+            ac (Activity): an activity to be inserted
+        """
+        start = ac.interval.start
+        if not self.__len:
+            self.__start_blocks.append([start])
+            self.__ac_blocks.append([ac])
+            self.__maxes.append(start)
+            self.__len = 1
+            return
+
+        block_idx = bisect_right(self.__maxes, start)
+        if block_idx == len(self.__maxes):
+            block_idx -= 1
+        pos = bisect_right(self.__start_blocks[block_idx], start)
+        if start == ac.interval.end:
+            # an activity of duration 0 goes before the one which starts
+            # at the same moment with a positive duration
+            prev_loc = self.__prev_loc((block_idx, pos))
+            if prev_loc is not None:
+                prev_ac = self.__ac_blocks[prev_loc[0]][prev_loc[1]]
+                prev_interval = prev_ac.interval
+                if prev_interval.start == start and prev_interval.end != start:
+                    block_idx, pos = prev_loc
+
+        start_block = self.__start_blocks[block_idx]
+        start_block.insert(pos, start)
+        self.__ac_blocks[block_idx].insert(pos, ac)
+        self.__maxes[block_idx] = start_block[-1]
+        self.__len += 1
+        if len(start_block) > 2 * self.__load:
+            self.__split(block_idx)
+
+    def remove(self, ac: "Activity"):
+        """Removes an activity
+
+        Args:
+            ac (Activity): an activity in the container
+
+        Raises:
+            ValueError: the activity is not in the container
+        """
+        block_idx, pos = self.locate(ac)
+        start_block = self.__start_blocks[block_idx]
+        del start_block[pos]
+        del self.__ac_blocks[block_idx][pos]
+        self.__len -= 1
+        if start_block:
+            self.__maxes[block_idx] = start_block[-1]
+            if len(self.__start_blocks) > 1 and (
+                len(start_block) < self.__load // 2
+            ):
+                self.__merge(block_idx)
+        else:
+            del self.__start_blocks[block_idx]
+            del self.__ac_blocks[block_idx]
+            del self.__maxes[block_idx]
+
+    def pop(self) -> "Activity":
+        """Removes and returns the latest activity
+
+        Raises:
+            IndexError: the container is empty
+
+        Returns:
+            Activity: the removed activity
+        """
+        if not self.__len:
+            raise IndexError("pop from an empty SortedAcList")
+        ac = self.__ac_blocks[-1][-1]
+        self.remove(ac)
+        return ac
+
+    def locate(self, ac: "Activity") -> Tuple[int, int]:
+        """Returns (block index, position in the block) of an activity
+
+        Args:
+            ac (Activity): an activity in the container
+
+        Raises:
+            ValueError: the activity is not in the container
+
+        Returns:
+            Tuple[int, int]: a location valid until the next modification
+        """
+        start = ac.interval.start
+        block_idx = bisect_left(self.__maxes, start)
+        if block_idx < len(self.__maxes):
+            pos = bisect_left(self.__start_blocks[block_idx], start)
+            loc: Optional[Tuple[int, int]] = (block_idx, pos)
+            while loc is not None:
+                if self.__start_blocks[loc[0]][loc[1]] != start:
+                    break
+                if self.__ac_blocks[loc[0]][loc[1]] is ac:
+                    return loc
+                loc = self.__next_loc(loc)
+        raise ValueError(f"{ac} is not in the SortedAcList")
+
+    def floor_loc(self, moment: dt.datetime) -> Optional[Tuple[int, int]]:
+        """Returns the location of the last activity starting at or before moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Optional[Tuple[int, int]]: None if every activity starts after moment
+        """
+        block_idx = bisect_right(self.__maxes, moment)
+        if block_idx < len(self.__maxes):
+            pos = bisect_right(self.__start_blocks[block_idx], moment)
+            return self.__prev_loc((block_idx, pos))
+        if self.__len:
+            return (block_idx - 1, len(self.__ac_blocks[-1]) - 1)
+        return None
+
+    def ceil_loc(self, moment: dt.datetime) -> Optional[Tuple[int, int]]:
+        """Returns the location of the first activity starting at or after moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Optional[Tuple[int, int]]: None if every activity starts before moment
+        """
+        block_idx = bisect_left(self.__maxes, moment)
+        if block_idx < len(self.__maxes):
+            pos = bisect_left(self.__start_blocks[block_idx], moment)
+            return (block_idx, pos)
+        return None
+
+    def floor(self, moment: dt.datetime) -> Optional["Activity"]:
+        """Returns the last activity starting at or before moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Optional[Activity]: None if every activity starts after moment
+        """
+        loc = self.floor_loc(moment)
+        return None if loc is None else self.__ac_blocks[loc[0]][loc[1]]
+
+    def next_of(self, ac: "Activity") -> Optional["Activity"]:
+        """Returns the activity right after ac (None if ac is the last one)"""
+        loc = self.__next_loc(self.locate(ac))
+        return None if loc is None else self.__ac_blocks[loc[0]][loc[1]]
+
+    def prev_of(self, ac: "Activity") -> Optional["Activity"]:
+        """Returns the activity right before ac (None if ac is the first one)"""
+        loc = self.__prev_loc(self.locate(ac))
+        return None if loc is None else self.__ac_blocks[loc[0]][loc[1]]
+
+    def iter_from_loc(self, loc: Tuple[int, int]) -> Iterator["Activity"]:
+        """Yields activities from the given location to the end
+
+        Args:
+            loc (Tuple[int, int]): a location returned by locate or floor_loc
+
+        Yields:
+            Iterator[Activity]
+        """
+        block_idx, pos = loc
+        ac_blocks = self.__ac_blocks
+        if block_idx < len(ac_blocks):
+            yield from ac_blocks[block_idx][pos:]
+            for ac_block in ac_blocks[block_idx + 1 :]:
+                yield from ac_block
+
+    def iter_from_moment(self, moment: dt.datetime) -> Iterator["Activity"]:
+        """Yields activities from the last one starting at or before moment
+
+        Args:
+            moment (datetime.datetime)
+
+        Yields:
+            Iterator[Activity]
+        """
+        loc = self.floor_loc(moment)
+        return self.iter_from_loc((0, 0) if loc is None else loc)
+
+    def __next_loc(self, loc: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        block_idx, pos = loc
+        if pos + 1 < len(self.__ac_blocks[block_idx]):
+            return (block_idx, pos + 1)
+        if block_idx + 1 < len(self.__ac_blocks):
+            return (block_idx + 1, 0)
+        return None
+
+    def __prev_loc(self, loc: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        block_idx, pos = loc
+        if pos > 0:
+            return (block_idx, pos - 1)
+        if block_idx > 0:
+            return (block_idx - 1, len(self.__ac_blocks[block_idx - 1]) - 1)
+        return None
+
+    def __split(self, block_idx: int):
+        start_block = self.__start_blocks[block_idx]
+        ac_block = self.__ac_blocks[block_idx]
+        half = len(start_block) // 2
+        self.__start_blocks.insert(block_idx + 1, start_block[half:])
+        self.__ac_blocks.insert(block_idx + 1, ac_block[half:])
+        del start_block[half:]
+        del ac_block[half:]
+        self.__maxes[block_idx] = start_block[-1]
+        self.__maxes.insert(
+            block_idx + 1, self.__start_blocks[block_idx + 1][-1]
+        )
+
+    def __merge(self, block_idx: int):
+        # merges a short block with its neighbor and splits again if too long
+        if block_idx == len(self.__start_blocks) - 1:
+            block_idx -= 1
+        self.__start_blocks[block_idx] += self.__start_blocks[block_idx + 1]
+        self.__ac_blocks[block_idx] += self.__ac_blocks[block_idx + 1]
+        del self.__start_blocks[block_idx + 1]
+        del self.__ac_blocks[block_idx + 1]
+        del self.__maxes[block_idx + 1]
+        self.__maxes[block_idx] = self.__start_blocks[block_idx][-1]
+        if len(self.__start_blocks[block_idx]) > 2 * self.__load:
+            self.__split(block_idx)
+
+
+class AcIdList(Sequence):
+    """A read-only view of the ac_ids of a SortedAcList in the order of time
+
+    The view is live: changes of the container are reflected without
+    building a new list. Iteration and len are as cheap as those of the
+    container, and indexing walks the blocks (O(n / load)).
+    The view compares equal to a list or a tuple of the same ac_ids.
+    """
+
+    __slots__ = ["__ac_list"]
+
+    def __init__(self, ac_list: SortedAcList):
+        self.__ac_list: SortedAcList = ac_list
+
+    def __len__(self) -> int:
+        return len(self.__ac_list)
+
+    def __iter__(self) -> Iterator[str]:
+        for ac in self.__ac_list:
+            yield ac.ac_id
+
+    def __reversed__(self) -> Iterator[str]:
+        for ac in reversed(self.__ac_list):
+            yield ac.ac_id
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return list(self)[index]
+        return self.__ac_list.at(index).ac_id
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (AcIdList, list, tuple)):
+            return len(self) == len(other) and all(
+                ac_id == other_id for ac_id, other_id in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"AcIdList({list(self)})"
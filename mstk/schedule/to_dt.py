@@ -1,27 +1,131 @@
 """moment to datetime.datetime function
 Created on 10th Aug. 2020
 """
-from typing import Union, List
+from typing import Union, List, Optional
 import datetime as dt
 
-__all__ = ["to_dt_datetime"]
+__all__ = ["Moment", "to_dt_datetime", "to_moment_value"]
 
+INT64_MIN = -(2 ** 63)
+INT64_MAX = 2 ** 63 - 1
 
-class Moment:
-    """A container for time-related object (e.g. dt.datetime, int, ...)
 
-    Warning:
-        Not implemented
+class Moment(int):
+    """An integer number of ticks from an epoch
+
+    Moments are compared and subtracted as plain integers, so that
+    intervals and machine schedules on Moments run without datetime
+    arithmetic; the difference of two Moments is an integer duration
+    in ticks, and adding an integer to a Moment gives a Moment.
+    Moments are converted to datetime.datetime only where needed
+    (e.g. reading, writing and plotting schedules) with to_datetime.
+
+    The length of a tick (resolution) and the epoch are shared by all
+    Moments; change them with set_resolution before creating Moments.
+    Values are limited to int64 to be stored in NumPy columns.
     """
 
-    __slots__ = ["__value"]
+    __slots__ = ()
+
+    resolution: dt.timedelta = dt.timedelta(seconds=1)
+    epoch: dt.datetime = dt.datetime(1970, 1, 1)
+
+    def __new__(cls, ticks: int = 0) -> "Moment":
+        value = int.__new__(cls, ticks)
+        if not (INT64_MIN <= value <= INT64_MAX):
+            raise OverflowError(f"Moment {int(value)} is out of int64 range")
+        return value
+
+    def __repr__(self) -> str:
+        return f"Moment({int(self)})"
+
+    def __str__(self) -> str:
+        return int.__repr__(self)
+
+    def __add__(self, other: int) -> "Moment":
+        if isinstance(other, int) and not isinstance(other, Moment):
+            return Moment(int(self) + other)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other: int) -> Union[int, "Moment"]:
+        if isinstance(other, Moment):
+            return int(self) - int(other)
+        elif isinstance(other, int):
+            return Moment(int(self) - other)
+        return NotImplemented
+
+    @classmethod
+    def set_resolution(
+        cls, resolution: dt.timedelta, epoch: Optional[dt.datetime] = None
+    ):
+        """Sets the length of a tick and the epoch of all Moments
+
+        Args:
+            resolution (datetime.timedelta): the length of a tick
+            epoch (datetime.datetime, optional): the datetime of Moment(0) (if None, unchanged)
+
+        Raises:
+            ValueError: resolution is not positive
+        """
+        if resolution <= dt.timedelta(0):
+            raise ValueError(f"resolution {resolution} is not positive")
+        cls.resolution = resolution
+        if epoch is not None:
+            cls.epoch = epoch
+
+    @classmethod
+    def from_datetime(cls, moment: dt.datetime) -> "Moment":
+        """Converts a datetime to the Moment of the tick containing it
+
+        Args:
+            moment (datetime.datetime)
+
+        Returns:
+            Moment
+        """
+        return cls((moment - cls.epoch) // cls.resolution)
+
+    @classmethod
+    def to_ticks(cls, duration: dt.timedelta) -> int:
+        """Converts a timedelta to the number of ticks (rounded down)
 
-    def __init__(self, value):
-        raise NotImplementedError("Moment is not supported")
+        Args:
+            duration (datetime.timedelta)
+
+        Returns:
+            int: ticks
+        """
+        return duration // cls.resolution
+
+    @classmethod
+    def to_timedelta(cls, ticks: int) -> dt.timedelta:
+        """Converts a number of ticks to a timedelta
+
+        Args:
+            ticks (int)
+
+        Returns:
+            datetime.timedelta
+        """
+        return cls.resolution * int(ticks)
+
+    def to_datetime(self) -> dt.datetime:
+        """
+        Returns:
+            datetime.datetime: the start of the tick
+        """
+        return self.epoch + self.resolution * int(self)
+
+
+# types of values stored in intervals as they are
+MOMENT_TYPES = (dt.datetime, Moment)
 
 
 def to_dt_datetime(moment: Union[int, dt.datetime]) -> dt.datetime:
     """if moment is an integer, convert to datetime.datetime
+    (a Moment is converted with Moment.to_datetime)
 
     Args:
         moment ([type]): datetime.datetime instance or numeric
@@ -31,6 +135,8 @@ def to_dt_datetime(moment: Union[int, dt.datetime]) -> dt.datetime:
     """
     if isinstance(moment, dt.datetime):
         return moment
+    elif isinstance(moment, Moment):
+        return moment.to_datetime()
     elif isinstance(moment, int) or isinstance(moment, float):
         # elif moment.isnumeric():
         return dt.datetime.fromtimestamp(moment)
@@ -40,8 +146,31 @@ def to_dt_datetime(moment: Union[int, dt.datetime]) -> dt.datetime:
         )
 
 
+def to_moment_value(
+    moment: Union[int, dt.datetime, Moment]
+) -> Union[dt.datetime, Moment]:
+    """Returns a Moment or a datetime.datetime as it is,
+    and converts other numbers to datetime.datetime (see to_dt_datetime)
+
+    Args:
+        moment (Union[int, datetime.datetime, Moment])
+
+    Returns:
+        Union[datetime.datetime, Moment]: a value stored in intervals
+    """
+    if type(moment) in MOMENT_TYPES:
+        return moment
+    elif isinstance(moment, (Moment, dt.datetime)):
+        return moment
+    return to_dt_datetime(moment)
+
+
 def main():
     print(to_dt_datetime(1))
+    Moment.set_resolution(dt.timedelta(minutes=1), dt.datetime(2020, 1, 1))
+    moment = Moment.from_datetime(dt.datetime(2020, 1, 1, 9, 30))
+    print(repr(moment), moment + 30, (moment + 30) - moment)
+    print(to_dt_datetime(moment + 30))
     print(to_dt_datetime(dt.datetime(2020, 8, 10)))
     try:
         to_dt_datetime("aa")
@@ -0,0 +1,113 @@
+""" Undo log of primitive edits for transactional schedule changes
+Created on 17th Oct. 2026
+"""
+from __future__ import annotations
+
+__all__ = ["UndoLog"]
+
+# common Python packages
+from typing import List, Tuple, Callable, Optional, Any
+
+
+class UndoLog:
+    """A stack of inverse edits recorded by machine schedules and jobs
+
+    While a transaction is open, every primitive edit (storing or removing
+    an activity, changing its interval, adding or removing an operation
+    of a job) pushes a function with arguments that reverts it.
+    Rolling back pops and calls them, so it takes time proportional to
+    the number of edits since the savepoint.
+
+    Note:
+        ac_cum_counts of machine schedules are not reverted,
+        so that ac_ids issued in a reverted edit are never reused
+    """
+
+    __slots__ = ["__entries", "__savepoints", "__replaying"]
+
+    def __init__(self):
+        self.__entries: List[Tuple[Callable, Tuple[Any, ...]]] = []
+        # savepoints of open transactions (innermost last)
+        self.__savepoints: List[int] = []
+        self.__replaying: bool = False
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __repr__(self) -> str:
+        return f"UndoLog({len(self)} edits, {self.depth} transactions)"
+
+    @property
+    def depth(self) -> int:
+        """The number of open (nested) transactions"""
+        return len(self.__savepoints)
+
+    @property
+    def is_recording(self) -> bool:
+        return bool(self.__savepoints) and not self.__replaying
+
+    def record(self, func: Callable, *args: Any):
+        """Pushes an inverse edit if a transaction is open
+
+        Args:
+            func (Callable): a function that reverts an edit
+            *args (Any): arguments of func
+        """
+        if self.__savepoints and not self.__replaying:
+            self.__entries.append((func, args))
+
+    def begin(self):
+        """Opens a (nested) transaction"""
+        self.__savepoints.append(len(self.__entries))
+
+    def end(self):
+        """Closes the innermost transaction and keeps its edits
+
+        Raises:
+            RuntimeError: no transaction is open
+        """
+        if not self.__savepoints:
+            raise RuntimeError("No transaction is open")
+        self.__savepoints.pop()
+        if not self.__savepoints:
+            self.__entries.clear()
+
+    def savepoint(self) -> int:
+        """Returns a mark of the current state to roll back to
+
+        Raises:
+            RuntimeError: no transaction is open
+
+        Returns:
+            int: the number of recorded edits
+        """
+        if not self.__savepoints:
+            raise RuntimeError("No transaction is open")
+        return len(self.__entries)
+
+    def rollback(self, savepoint: Optional[int] = None):
+        """Reverts edits in the reverse order
+
+        Args:
+            savepoint (int, optional): a mark from savepoint
+                (if None, the start of the innermost transaction)
+
+        Raises:
+            RuntimeError: no transaction is open
+            ValueError: the savepoint precedes the innermost transaction
+        """
+        if not self.__savepoints:
+            raise RuntimeError("No transaction is open")
+        if savepoint is None:
+            savepoint = self.__savepoints[-1]
+        elif savepoint < self.__savepoints[-1]:
+            raise ValueError(
+                f"Savepoint {savepoint} precedes the current transaction"
+            )
+        self.__replaying = True
+        try:
+            while len(self.__entries) > savepoint:
+                func, args = self.__entries.pop()
+                func(*args)
+        finally:
+            self.__replaying = False
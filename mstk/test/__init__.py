@@ -21,6 +21,7 @@
             "start": [datetime.datetime] <(Optional) start time of horizon>,
             "end": [datetime.datetime] <(Optional) end time of horizon>
         },
+        "datetime_format": [str] <(Optional) A strptime format of all dates (detected if null or absent)>,
         "plot_option": {
             "legend_on": [bool] <(Required) whether to plot legends>
             "horz_line_on": [bool] <(Required) whether to draw a separating line between machines>
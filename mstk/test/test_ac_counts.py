@@ -0,0 +1,59 @@
+""" Tests of MCSchedule.ac_counts
+Created on 17th Oct. 2026
+"""
+import random
+
+import pytest
+
+from mstk.test.test_ac_ids_at import make_schedule, minutes
+
+BACKENDS = ["default", "implicit_idle", "columnar"]
+
+
+def count_acs(mc_schedule):
+    ac_counts = {
+        ac_type: 0 for ac_type in mc_schedule.ac_types_param.all_types
+    }
+    for ac in mc_schedule.ac_iter():
+        ac_counts[ac.ac_type] += 1
+    return ac_counts
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_ac_counts_follow_changes(backend):
+    schedule = make_schedule(backend, 40)
+    mc_schedule = schedule.mc_dict["M1"].mc_schedule
+    assert mc_schedule.ac_counts == count_acs(mc_schedule)
+
+    rng = random.Random(2)
+    for _ in range(60):
+        ac_id_list = [ac.ac_id for ac in mc_schedule.operation_iter()]
+        if rng.random() < 0.5 and ac_id_list:
+            mc_schedule.delete_ac_id(rng.choice(ac_id_list))
+        else:
+            start = rng.randrange(130)
+            try:
+                schedule.add_breakdown(
+                    "M1", minutes(start), minutes(start + rng.randint(0, 2))
+                )
+            except ValueError:
+                pass
+        assert mc_schedule.ac_counts == count_acs(mc_schedule)
+
+
+@pytest.mark.parametrize("backend", ["implicit_idle", "columnar"])
+def test_ac_counts_of_gaps_are_copies(backend, monkeypatch):
+    schedule = make_schedule(backend, 40)
+    mc_schedule = schedule.mc_dict["M1"].mc_schedule
+    idle = mc_schedule.ac_types_param.idle
+    ac_counts = mc_schedule.ac_counts
+    ac_counts[idle] += 100
+    assert mc_schedule.ac_counts[idle] == ac_counts[idle] - 100
+
+    # gaps are not walked again after a change (the breakdown fills a gap)
+    def error_gap_iter(moment=None):
+        raise AssertionError("gaps are iterated")
+
+    monkeypatch.setattr(mc_schedule, "gap_iter", error_gap_iter)
+    schedule.add_breakdown("M1", minutes(2), minutes(3))
+    assert mc_schedule.ac_counts[idle] == ac_counts[idle] - 101
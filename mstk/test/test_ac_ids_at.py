@@ -0,0 +1,99 @@
+""" Tests of MCSchedule.ac_ids_at
+Created on 17th Oct. 2026
+"""
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.interval import Interval
+from mstk.schedule.schedule import Schedule
+
+START = dt.datetime(2020, 1, 1)
+BACKENDS = ["default", "implicit_idle", "columnar"]
+
+
+def minutes(count: int) -> dt.datetime:
+    return START + dt.timedelta(minutes=count)
+
+
+def make_schedule(backend: str, n_operations: int) -> Schedule:
+    schedule = Schedule(
+        "test",
+        Interval(minutes(0), minutes(3 * n_operations + 10)),
+        AcTypesParam(),
+        backend,
+    )
+    schedule.add_machine("M1")
+    schedule.add_job("J1")
+    schedule.bulk_add(
+        {
+            "mc_id": "M1",
+            "ac_type": "Operation",
+            "job_id": "J1",
+            "start": minutes(3 * idx),
+            "end": minutes(3 * idx + 2),
+        }
+        for idx in range(n_operations)
+    )
+    return schedule
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_ac_ids_at_matches_ac_at(backend):
+    mc_schedule = make_schedule(backend, 50).mc_dict["M1"].mc_schedule
+    moment_list = [minutes(count) for count in range(-2, 165)]
+    expected = []
+    for moment in moment_list:
+        ac = mc_schedule.ac_at(moment)
+        expected.append(None if ac is None else ac.ac_id)
+    assert mc_schedule.ac_ids_at(moment_list) == expected
+    # datetime64 arrays give the same ac_ids
+    assert mc_schedule.ac_ids_at(np.array(moment_list, "datetime64[us]")) == (
+        expected
+    )
+
+
+@pytest.mark.parametrize("backend", ["default", "implicit_idle"])
+def test_batch_lookup_iterates_activities_once(backend, monkeypatch):
+    schedule = make_schedule(backend, 2000)
+    mc_schedule = schedule.mc_dict["M1"].mc_schedule
+    calls = []
+    ac_iter = mc_schedule.ac_iter
+
+    def counted_ac_iter():
+        calls.append(1)
+        return ac_iter()
+
+    monkeypatch.setattr(mc_schedule, "ac_iter", counted_ac_iter)
+    moments = np.datetime64(START, "us") + np.arange(
+        0, 6000 * 60 * 10 ** 6, 6 * 10 ** 6
+    ).astype("timedelta64[us]")
+    first = mc_schedule.ac_ids_at(moments)
+    for _ in range(100):
+        assert mc_schedule.ac_ids_at(moments[:10]) == first[:10]
+    assert len(calls) == 1
+
+    # the arrays are built again after a change
+    schedule.add_breakdown("M1", minutes(6002), minutes(6003))
+    assert mc_schedule.ac_ids_at([minutes(6002)]) == [
+        mc_schedule.ac_at(minutes(6002)).ac_id
+    ]
+    assert len(calls) == 2
+
+
+def test_columnar_batch_lookup_uses_columns(monkeypatch):
+    mc_schedule = make_schedule("columnar", 2000).mc_dict["M1"].mc_schedule
+
+    def error_ac_iter():
+        raise AssertionError("activities are iterated")
+
+    monkeypatch.setattr(mc_schedule, "ac_iter", error_ac_iter)
+    ac_id_list = mc_schedule.ac_ids_at(
+        [minutes(0), minutes(2), minutes(6000), minutes(9000)]
+    )
+    assert ac_id_list[0] == "Operation(M1-1)"
+    assert ac_id_list[1].startswith("Idle")
+    assert ac_id_list[2].startswith("Idle")
+    assert ac_id_list[3] is None
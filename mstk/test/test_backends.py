@@ -0,0 +1,90 @@
+""" Tests of the machine schedule backends against each other
+Created on 17th Oct. 2026
+"""
+import datetime as dt
+import random
+
+import pytest
+
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.activity import Breakdown, Operation
+from mstk.schedule.interval import Interval
+from mstk.schedule.job import Job
+from mstk.schedule.machine import Machine
+from mstk.schedule.to_dt import Moment
+
+START = dt.datetime(2020, 1, 1)
+BACKENDS = ["default", "implicit_idle", "columnar"]
+
+
+def make_converter(tick: bool):
+    if tick:
+        return lambda count: Moment(count * 60), lambda count: count * 60
+    return (
+        lambda count: START + dt.timedelta(minutes=count),
+        lambda count: dt.timedelta(minutes=count),
+    )
+
+
+def state_of(mc_schedule):
+    return (
+        [
+            (ac.ac_type, ac.ac_id, ac.interval.dt_range())
+            for ac in mc_schedule.actual_ac_iter()
+        ],
+        list(mc_schedule.gap_iter()),
+        mc_schedule.ac_counts,
+    )
+
+
+def run_random_edits(backend: str, seed: int, tick: bool):
+    # returns the results of random edits and queries, and the final state
+    to_moment, to_duration = make_converter(tick)
+    rng = random.Random(seed)
+    ac_types_param = AcTypesParam()
+    mc = Machine("M1")
+    mc.reset_schedule(
+        Interval(to_moment(0), to_moment(500)), ac_types_param, backend
+    )
+    mc_schedule = mc.mc_schedule
+    job = Job("J1")
+    result_list = []
+    for step in range(150):
+        start = rng.randint(0, 500)
+        end = min(500, start + rng.choice([0, 1, 5, 20, 60]))
+        interval = Interval(to_moment(start), to_moment(end))
+        draw = rng.random()
+        try:
+            if draw < 0.4:
+                result = mc_schedule.add_activity(
+                    Operation(f"O{step}", interval, mc, job, ac_types_param)
+                )
+            elif draw < 0.5:
+                result = mc_schedule.add_activity(
+                    Breakdown(f"B{step}", interval, mc, ac_types_param)
+                )
+            elif draw < 0.65:
+                result = mc_schedule.del_activities_in_interval(interval)
+            elif draw < 0.7:
+                result = mc_schedule.delete_ac_beyond_moment(
+                    to_moment(rng.randint(250, 500))
+                )
+            elif draw < 0.9:
+                result = mc_schedule.earliest_fit(
+                    to_moment(start), to_duration(rng.randint(0, 60))
+                )
+            else:
+                ac = mc_schedule.ac_at(to_moment(start))
+                result = None if ac is None else ac.interval.dt_range()
+        except (ValueError, SyntaxError) as error:
+            result = type(error).__name__
+        result_list.append(result)
+    return result_list, state_of(mc_schedule)
+
+
+@pytest.mark.parametrize("tick", [False, True])
+@pytest.mark.parametrize("seed", range(8))
+def test_backends_give_the_same_results(seed, tick):
+    result_list, state = run_random_edits("default", seed, tick)
+    for backend in BACKENDS[1:]:
+        assert run_random_edits(backend, seed, tick) == (result_list, state)
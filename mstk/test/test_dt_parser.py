@@ -0,0 +1,86 @@
+""" Tests of DatetimeParser
+Created on 17th Oct. 2026
+"""
+import datetime as dt
+import random
+
+import pytest
+from dateutil.parser import parse as dt_parse
+
+from mstk.read_schedule import DatetimeParser
+
+BASE = dt.datetime(2020, 1, 1)
+
+
+def random_texts(dt_format: str, count: int = 300):
+    rng = random.Random(dt_format)
+    texts = []
+    for _ in range(count):
+        moment = BASE + dt.timedelta(minutes=30 * rng.randrange(20000))
+        text = moment.strftime(dt_format)
+        # strings without leading zeros are read as dateutil reads them
+        texts.append(text.lstrip("0") if rng.random() < 0.3 else text)
+    return texts
+
+
+@pytest.mark.parametrize(
+    "dt_format, detected",
+    [
+        ("%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M"),
+        ("%Y-%m-%d %H:%M:%S", "iso"),
+        ("%Y-%m-%dT%H:%M", "iso"),
+        ("%Y/%m/%d", "%Y/%m/%d"),
+        ("%m-%d-%Y %H:%M", "%m-%d-%Y %H:%M"),
+        # no candidate format; dateutil reads every string
+        ("%b %d %Y %H:%M", None),
+    ],
+)
+def test_detected_format_reads_as_dateutil(dt_format, detected):
+    texts = random_texts(dt_format)
+    dt_parser = DatetimeParser()
+    assert [dt_parser(text) for text in texts] == [
+        dt_parse(text) for text in texts
+    ]
+    assert dt_parser.dt_format == detected
+
+
+def test_strings_out_of_format_fall_back_to_dateutil():
+    dt_parser = DatetimeParser()
+    texts = [f"1/{day}/2020 10:00" for day in range(1, 20)]
+    texts += ["2020-03-04 05:06", "13/1/2020 00:00"]
+    assert [dt_parser(text) for text in texts] == [
+        dt_parse(text) for text in texts
+    ]
+    assert dt_parser.dt_format == "%m/%d/%Y %H:%M"
+
+
+@pytest.mark.parametrize(
+    "dt_format", ["%d/%m/%Y %H:%M", "%Y%m%d%H%M", "%d.%m.%Y  %H:%M"]
+)
+def test_given_format_reads_as_strptime(dt_format):
+    rng = random.Random(1)
+    dt_parser = DatetimeParser(dt_format)
+    for _ in range(2000):
+        moment = BASE + dt.timedelta(seconds=rng.randrange(10 ** 8))
+        text = moment.strftime(dt_format)
+        if rng.random() < 0.2:
+            text = text.replace("0", "", 1)
+        try:
+            expected = dt.datetime.strptime(text, dt_format)
+        except ValueError:
+            try:
+                expected = dt_parse(text)
+            except (ValueError, OverflowError):
+                continue
+        assert dt_parser(text) == expected, text
+    assert dt_parser("2020-01-05") == dt.datetime(2020, 1, 5)
+
+
+def test_cache_is_bounded():
+    dt_parser = DatetimeParser("%m/%d/%Y", cache_size=2)
+    texts = ["1/2/2020", "1/3/2020", "1/4/2020", "1/2/2020"]
+    assert [dt_parser(text) for text in texts] == [
+        dt.datetime(2020, 1, day) for day in [2, 3, 4, 2]
+    ]
+    with pytest.raises(ValueError):
+        dt_parser("not a date")
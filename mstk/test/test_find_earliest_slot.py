@@ -0,0 +1,59 @@
+""" Tests of Schedule.find_earliest_slot
+Created on 17th Oct. 2026
+"""
+import datetime as dt
+import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.interval import Interval
+from mstk.schedule.schedule import Schedule
+
+START = dt.datetime(2020, 1, 1)
+MINUTE = dt.timedelta(minutes=1)
+
+
+def make_schedule(backend: str) -> Schedule:
+    schedule = Schedule(
+        "test", Interval(START, START + MINUTE * 2000), AcTypesParam(), backend
+    )
+    schedule.add_job("J1")
+    rng = random.Random(5)
+    for mc_idx in range(12):
+        mc_id = f"M{mc_idx}"
+        schedule.add_machine(mc_id)
+        for _ in range(40):
+            start = START + MINUTE * rng.randrange(1900)
+            try:
+                schedule.add_operation(
+                    mc_id, "J1", start, start + MINUTE * rng.randint(1, 40)
+                )
+            except ValueError:
+                pass
+    return schedule
+
+
+@pytest.mark.parametrize("backend", ["default", "implicit_idle", "columnar"])
+def test_thread_pool_matches_serial(backend):
+    schedule = make_schedule(backend)
+    with ThreadPoolExecutor(3) as executor:
+        for minutes in [1, 10, 30, 90]:
+            for release in [START, START + MINUTE * 700]:
+                assert schedule.find_earliest_slot(
+                    "J1",
+                    MINUTE * minutes,
+                    release=release,
+                    executor=executor,
+                    chunk_size=5,
+                ) == schedule.find_earliest_slot(
+                    "J1", MINUTE * minutes, release=release
+                )
+
+
+def test_process_pool_is_rejected():
+    schedule = make_schedule("default")
+    with ProcessPoolExecutor(1) as executor:
+        with pytest.raises(ValueError):
+            schedule.find_earliest_slot("J1", MINUTE, executor=executor)
@@ -0,0 +1,100 @@
+""" Tests of Schedule.fork (copy-on-write)
+Created on 17th Oct. 2026
+"""
+import datetime as dt
+import random
+
+import pytest
+
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.interval import Interval
+from mstk.schedule.schedule import Schedule
+
+START = dt.datetime(2020, 1, 1)
+HOUR = dt.timedelta(hours=1)
+BACKENDS = ["default", "implicit_idle", "columnar"]
+
+
+def state_of(schedule: Schedule):
+    mc_state = {
+        mc.mc_id: [
+            (ac.ac_id, ac.interval.dt_range())
+            for ac in mc.mc_schedule.actual_ac_iter()
+        ]
+        for mc in schedule.mc_iter()
+    }
+    job_state = {
+        job.job_id: [operation.ac_id for operation in job.operation_list]
+        for job in schedule.job_iter()
+    }
+    return mc_state, job_state
+
+
+def book(schedule: Schedule, rng: random.Random, count: int):
+    for _ in range(count):
+        schedule.find_earliest_slot(
+            f"J{rng.randrange(3)}",
+            HOUR * rng.randint(1, 50),
+            release=START + HOUR * rng.randint(0, 100),
+            book=True,
+        )
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_fork_copies_on_write(backend):
+    rng = random.Random(1)
+    schedule = Schedule(
+        "test", Interval(START, START + HOUR * 240), AcTypesParam(), backend
+    )
+    for idx in range(5):
+        schedule.add_machine(f"M{idx}")
+    for idx in range(3):
+        schedule.add_job(f"J{idx}")
+    book(schedule, rng, 40)
+    state = state_of(schedule)
+
+    forked = schedule.fork("forked")
+    assert forked.schedule_id == "forked"
+    assert state_of(forked) == state
+    book(forked, rng, 30)
+    assert state_of(schedule) == state
+
+    forked_state = state_of(forked)
+    book(schedule, rng, 30)
+    assert state_of(forked) == forked_state
+
+    schedule.add_machine("X")
+    assert "X" not in forked.mc_dict
+
+    # untouched machines are shared
+    other = schedule.fork()
+    other.add_breakdown("M0", START + HOUR * 239, START + HOUR * 240)
+    assert other.mc_dict["M1"] is schedule.mc_dict["M1"]
+    assert other.mc_dict["M0"] is not schedule.mc_dict["M0"]
+
+    # operations of a job refer to the machines of their schedule
+    for job in other.job_iter():
+        for operation in job.operation_list:
+            mc = other.mc_dict[operation.mc.mc_id]
+            assert operation.ac_id in {
+                ac.ac_id for ac in mc.mc_schedule.actual_ac_iter()
+            }
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_rollback_in_fork(backend):
+    rng = random.Random(2)
+    schedule = Schedule(
+        "test", Interval(START, START + HOUR * 240), AcTypesParam(), backend
+    )
+    for idx in range(3):
+        schedule.add_machine(f"M{idx}")
+        schedule.add_job(f"J{idx}")
+    book(schedule, rng, 10)
+    state = state_of(schedule)
+    forked = schedule.fork()
+    with forked.transaction():
+        book(forked, rng, 5)
+        forked.rollback()
+    assert state_of(forked) == state
+    assert state_of(schedule) == state
@@ -0,0 +1,107 @@
+""" Tests of GapIndex against brute-force searches
+Created on 17th Oct. 2026
+"""
+import datetime as dt
+import random
+
+import pytest
+
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.activity import Breakdown
+from mstk.schedule.gap_index import GapIndex
+from mstk.schedule.interval import Interval
+from mstk.schedule.machine import Machine
+
+START = dt.datetime(2020, 1, 1)
+MINUTE = dt.timedelta(minutes=1)
+
+
+def brute_earliest_fit(gap_list, release, duration):
+    for gap_start, gap_end in sorted(gap_list):
+        start = max(gap_start, release)
+        if start < gap_end and duration <= gap_end - start:
+            return start
+    return None
+
+
+def random_gaps(rng: random.Random):
+    gap_list = []
+    moment = 0
+    while moment < 1000:
+        moment += rng.randint(0, 10)
+        end = moment + rng.randint(1, 30)
+        gap_list.append((moment, end))
+        moment = end
+    return gap_list
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_earliest_fit_matches_brute_force(seed):
+    rng = random.Random(seed)
+    gap_list = random_gaps(rng)
+    gap_index = GapIndex(gap_list)
+    assert list(gap_index) == gap_list
+
+    for _ in range(300):
+        if rng.random() < 0.3 and gap_list:
+            gap = gap_list.pop(rng.randrange(len(gap_list)))
+            gap_index.remove(gap[0])
+        elif rng.random() < 0.2:
+            # a gap in the space left by a removed one
+            moment = rng.randint(0, 1100)
+            if not any(start <= moment < end for start, end in gap_list):
+                end = min(
+                    [start for start, _ in gap_list if start > moment]
+                    + [moment + 40]
+                )
+                gap_list.append((moment, end))
+                gap_index.add(moment, end)
+        release = rng.randint(-10, 1100)
+        duration = rng.randint(0, 40)
+        assert gap_index.earliest_fit(release, duration) == (
+            brute_earliest_fit(gap_list, release, duration)
+        )
+    assert list(gap_index) == sorted(gap_list)
+    assert len(gap_index) == len(gap_list)
+
+
+def test_floor():
+    gap_index = GapIndex([(0, 5), (10, 12), (20, 30)])
+    assert gap_index.floor(-1) is None
+    assert gap_index.floor(0) == (0, 5)
+    assert gap_index.floor(15) == (10, 12)
+    assert gap_index.floor(40) == (20, 30)
+    with pytest.raises(KeyError):
+        gap_index.remove(7)
+
+
+@pytest.mark.parametrize("backend", ["default", "implicit_idle", "columnar"])
+def test_gap_index_of_machine_schedule_follows_changes(backend):
+    rng = random.Random(4)
+    ac_types_param = AcTypesParam()
+    mc = Machine("M1")
+    mc.reset_schedule(
+        Interval(START, START + MINUTE * 500), ac_types_param, backend
+    )
+    mc_schedule = mc.mc_schedule
+    for step in range(200):
+        start = rng.randint(0, 500)
+        end = min(500, start + rng.randint(0, 30))
+        interval = Interval(START + MINUTE * start, START + MINUTE * end)
+        if step == 20:
+            # built once, and then updated on every change
+            assert list(mc_schedule.gap_index) == list(mc_schedule.gap_iter())
+        if rng.random() < 0.6:
+            try:
+                mc_schedule.add_activity(
+                    Breakdown(f"B{step}", interval, mc, ac_types_param)
+                )
+            except ValueError:
+                pass
+        else:
+            mc_schedule.del_activities_in_interval(interval)
+        release = START + MINUTE * rng.randint(0, 500)
+        duration = MINUTE * rng.randint(0, 40)
+        assert mc_schedule.earliest_fit(release, duration) == (
+            brute_earliest_fit(list(mc_schedule.gap_iter()), release, duration)
+        )
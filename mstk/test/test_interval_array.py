@@ -0,0 +1,100 @@
+""" Tests of IntervalArray
+Created on 17th Oct. 2026
+"""
+import datetime as dt
+import random
+
+import numpy as np
+import pytest
+
+from mstk.schedule.interval import Interval, IntervalArray
+from mstk.schedule.to_dt import Moment
+
+START = dt.datetime(2020, 1, 1)
+
+
+def make_converter(tick: bool):
+    if tick:
+        return Moment
+    return lambda count: START + dt.timedelta(minutes=count)
+
+
+def random_intervals(rng: random.Random, to_moment, count: int):
+    interval_list = []
+    for _ in range(count):
+        start = rng.randint(0, 100)
+        end = start + rng.choice([0, 0, 1, 5, 20])
+        interval_list.append(Interval(to_moment(start), to_moment(end)))
+    return interval_list
+
+
+def ranges_of(intervals):
+    return [interval.dt_range() for interval in intervals]
+
+
+def test_clip_to_drops_distinct_rows():
+    interval_array = IntervalArray.from_intervals(
+        [Interval(5, 10), Interval(9, 11), Interval(11, 12), Interval(1, 2)]
+    )
+    clipped, overlapped = interval_array.clip_to(Interval(9, 11))
+    assert overlapped.tolist() == [True, True, False, False]
+    assert ranges_of(clipped) == ranges_of([Interval(9, 10), Interval(9, 11)])
+    # the same rows as the intersections with the horizon
+    assert ranges_of(clipped) == ranges_of(
+        interval_array.intersect(Interval(9, 11))
+    )
+    assert np.array_equal(
+        overlapped, ~interval_array.is_distinct(Interval(9, 11))
+    )
+
+
+@pytest.mark.parametrize("tick", [False, True])
+def test_operations_match_intervals(tick):
+    rng = random.Random(3)
+    to_moment = make_converter(tick)
+    interval_list = random_intervals(rng, to_moment, 200)
+    other_list = random_intervals(rng, to_moment, 150)
+    interval_array = IntervalArray.from_intervals(interval_list)
+    other_array = IntervalArray.from_intervals(other_list)
+    assert len(interval_array) == len(interval_list)
+    assert interval_array.is_tick == tick
+    assert ranges_of(interval_array) == ranges_of(interval_list)
+    assert type(interval_array[3].start) is type(interval_list[3].start)
+
+    horizon = Interval(to_moment(30), to_moment(60))
+    assert interval_array.is_distinct(horizon).tolist() == [
+        interval.is_distinct(horizon) for interval in interval_list
+    ]
+    assert ranges_of(interval_array.intersect(horizon)) == [
+        interval.intersect(horizon).dt_range()
+        for interval in interval_list
+        if not interval.is_distinct(horizon)
+    ]
+    moment_list = [to_moment(rng.randint(0, 120)) for _ in range(200)]
+    moments = np.array(moment_list, dtype=object) if tick else moment_list
+    assert interval_array.contains(moments).tolist() == [
+        interval.in_closed_interval(moment)
+        for interval, moment in zip(interval_list, moment_list)
+    ]
+
+    self_index, other_index = interval_array.overlap_pairs(
+        other_array, chunk_size=37
+    )
+    assert set(zip(self_index.tolist(), other_index.tolist())) == {
+        (idx, other_idx)
+        for idx, interval in enumerate(interval_list)
+        for other_idx, other in enumerate(other_list)
+        if not interval.is_distinct(other)
+    }
+
+
+def test_index_of_sorted_intervals():
+    interval_array = IntervalArray.from_intervals(
+        Interval(Moment(start), Moment(end))
+        for start, end in [(0, 5), (5, 7), (9, 12)]
+    )
+    index = interval_array.index_of([Moment(tick) for tick in range(-1, 14)])
+    assert index.tolist() == (
+        [-1] + [0] * 5 + [1] * 2 + [-1] * 2 + [2] * 3 + [-1] * 2
+    )
+    assert interval_array[0:0].index_of([Moment(1)]).tolist() == [-1]
@@ -0,0 +1,94 @@
+""" Tests of IntervalSet against sets of moments
+Created on 17th Oct. 2026
+"""
+import datetime as dt
+import random
+
+import pytest
+
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.interval import Interval
+from mstk.schedule.interval_set import IntervalSet
+from mstk.schedule.schedule import Schedule
+from mstk.schedule.to_dt import Moment
+
+
+def random_intervals(rng: random.Random):
+    interval_list = []
+    for _ in range(rng.randint(0, 12)):
+        start = rng.randint(0, 60)
+        end = start + rng.randint(0, 8)
+        interval_list.append(Interval(Moment(start), Moment(end)))
+    return interval_list
+
+
+def moments_of(intervals):
+    return {
+        moment
+        for interval in intervals
+        for moment in range(interval.start, interval.end)
+    }
+
+
+def is_normal(interval_set: IntervalSet) -> bool:
+    # sorted, disjoint, merged and not empty
+    dt_ranges = list(interval_set.dt_ranges())
+    return all(start < end for start, end in dt_ranges) and all(
+        dt_ranges[idx][1] < dt_ranges[idx + 1][0]
+        for idx in range(len(dt_ranges) - 1)
+    )
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_set_operations_match_moments(seed):
+    rng = random.Random(seed)
+    horizon = Interval(Moment(10), Moment(50))
+    for _ in range(200):
+        interval_list = random_intervals(rng)
+        other_list = random_intervals(rng)
+        interval_set = IntervalSet(interval_list)
+        other_set = IntervalSet(other_list)
+        moments = moments_of(interval_list)
+        other_moments = moments_of(other_list)
+        assert moments_of(interval_set) == moments
+        assert is_normal(interval_set)
+        for result, expected in [
+            (interval_set | other_set, moments | other_moments),
+            (interval_set & other_set, moments & other_moments),
+            (interval_set - other_set, moments - other_moments),
+            (interval_set.complement(horizon), set(range(10, 50)) - moments),
+        ]:
+            assert moments_of(result) == expected
+            assert is_normal(result)
+        assert interval_set.duration() == (len(moments) or dt.timedelta(0))
+        moment = rng.randint(0, 70)
+        assert (Moment(moment) in interval_set) == (moment in moments)
+        assert IntervalSet.from_ranges(
+            interval.dt_range() for interval in interval_list
+        ) == (interval_set)
+
+
+@pytest.mark.parametrize("backend", ["default", "implicit_idle", "columnar"])
+def test_busy_and_idle_of_machine_schedule(backend):
+    start = dt.datetime(2020, 1, 1)
+    minute = dt.timedelta(minutes=1)
+    schedule = Schedule(
+        "test", Interval(start, start + minute * 100), AcTypesParam(), backend
+    )
+    schedule.add_machine("M1")
+    schedule.add_job("J1")
+    for first, last in [(0, 10), (10, 15), (30, 40), (70, 100)]:
+        schedule.add_operation(
+            "M1", "J1", start + minute * first, start + minute * last
+        )
+    mc_schedule = schedule.mc_dict["M1"].mc_schedule
+    busy = IntervalSet.busy_of(mc_schedule)
+    idle = IntervalSet.idle_of(mc_schedule)
+    assert [(first - start) // minute for first, _ in busy.dt_ranges()] == [
+        0,
+        30,
+        70,
+    ]
+    assert busy | idle == IntervalSet([mc_schedule.horizon])
+    assert len(busy & idle) == 0
+    assert idle == busy.complement(mc_schedule.horizon)
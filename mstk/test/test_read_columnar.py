@@ -0,0 +1,141 @@
+""" Tests of read_schedule with the python and columnar engines
+Created on 17th Oct. 2026
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+
+import pytest
+
+from mstk.read_schedule import read_schedule
+from mstk.schedule.schedule import Schedule
+from mstk.test import sample_proj_folder
+
+
+def state_of(schedule: Schedule):
+    # idle activities are compared as gaps (their ac_ids depend on backends)
+    mc_state = {
+        mc.mc_id: (
+            mc.contents,
+            [
+                (ac.ac_type, ac.ac_id, ac.interval.dt_range(), ac.contents)
+                for ac in mc.mc_schedule.actual_ac_iter()
+            ],
+            list(mc.mc_schedule.gap_iter()),
+        )
+        for mc in schedule.mc_iter()
+    }
+    job_state = {
+        job.job_id: (
+            job.contents,
+            [
+                (operation.mc.mc_id, operation.ac_id)
+                for operation in job.oper_iter()
+            ],
+        )
+        for job in schedule.job_iter()
+    }
+    return (
+        schedule.schedule_id,
+        schedule.horizon.dt_range(),
+        schedule.mc_id_list,
+        schedule.job_id_list,
+        mc_state,
+        job_state,
+    )
+
+
+def read_quietly(proj_folder: str, engine: str) -> Schedule:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return read_schedule(proj_folder, engine=engine)
+
+
+def copy_sample(tmp_path, edit_metadata=None, edit_rows=None) -> str:
+    proj_folder = str(tmp_path / "proj")
+    shutil.copytree(sample_proj_folder, proj_folder)
+    if edit_metadata is not None:
+        fname = os.path.join(proj_folder, "schedule_metadata.json")
+        with open(fname) as file_data:
+            metadata = json.load(file_data)
+        edit_metadata(metadata)
+        with open(fname, "w") as file_data:
+            json.dump(metadata, file_data)
+    if edit_rows is not None:
+        fname = os.path.join(proj_folder, "activity_info.csv")
+        with open(fname) as file_data:
+            lines = file_data.read().splitlines()
+        with open(fname, "w") as file_data:
+            file_data.write("\n".join(edit_rows(lines)) + "\n")
+    return proj_folder
+
+
+def test_engines_read_the_sample_project_alike():
+    schedule = read_quietly(sample_proj_folder, "python")
+    columnar_schedule = read_quietly(sample_proj_folder, "columnar")
+    assert schedule.backend == "default"
+    assert columnar_schedule.backend == "columnar"
+    assert state_of(columnar_schedule) == state_of(schedule)
+
+
+def without_info_files(metadata):
+    metadata["file_info"]["machine_info"] = None
+    metadata["file_info"]["job_info"] = None
+
+
+def with_open_horizon(metadata):
+    metadata["horizon"] = {"start": None, "end": None}
+
+
+def with_given_format(metadata):
+    metadata["datetime_format"] = "%m/%d/%Y %H:%M"
+
+
+@pytest.mark.parametrize(
+    "edit_metadata",
+    [without_info_files, with_open_horizon, with_given_format],
+)
+def test_engines_read_edited_projects_alike(tmp_path, edit_metadata):
+    proj_folder = copy_sample(tmp_path, edit_metadata)
+    assert state_of(read_quietly(proj_folder, "columnar")) == state_of(
+        read_quietly(proj_folder, "python")
+    )
+
+
+@pytest.mark.parametrize(
+    "edit_rows, error",
+    [
+        # an activity overlapping another one
+        (lambda lines: lines + [lines[1]], ValueError),
+        (
+            lambda lines: lines + ["A1,1/1/2020 00:00,1/1/2020 00:10,Foo,,"],
+            ValueError,
+        ),
+        (
+            lambda lines: lines
+            + ["ZZ,1/1/2020 00:00,1/1/2020 00:10,Breakdown,,"],
+            KeyError,
+        ),
+        (
+            lambda lines: lines
+            + ["A1,1/5/2020 23:50,1/5/2020 23:55,Operation,NOJOB,"],
+            KeyError,
+        ),
+        (
+            lambda lines: lines
+            + ["A1,1/7/2020 00:00,1/7/2020 00:10,Breakdown,,"],
+            ValueError,
+        ),
+    ],
+)
+def test_engines_raise_the_same_errors(tmp_path, edit_rows, error):
+    proj_folder = copy_sample(tmp_path, edit_rows=edit_rows)
+    for engine in ["python", "columnar"]:
+        with pytest.raises(error):
+            read_quietly(proj_folder, engine)
+
+
+def test_invalid_engine():
+    with pytest.raises(ValueError):
+        read_schedule(sample_proj_folder, engine="pandas")
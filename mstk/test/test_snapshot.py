@@ -0,0 +1,106 @@
+""" Tests of pickling, saving and loading schedules
+Created on 17th Oct. 2026
+"""
+import pickle
+import random
+
+import pytest
+
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.interval import Interval
+from mstk.schedule.schedule import Schedule
+from mstk.test.test_backends import BACKENDS, make_converter, state_of
+
+
+def make_schedule(backend: str, tick: bool, seed: int = 0) -> Schedule:
+    to_moment, _ = make_converter(tick)
+    rng = random.Random(seed)
+    schedule = Schedule(
+        "test",
+        Interval(to_moment(0), to_moment(1000)),
+        AcTypesParam(),
+        backend,
+    )
+    for mc_idx in range(3):
+        schedule.add_machine(f"M{mc_idx}")
+    for job_idx in range(5):
+        schedule.add_job(f"J{job_idx}")
+    for _ in range(120):
+        start = rng.randint(0, 990)
+        end = start + rng.randint(0, 10)
+        mc_id = f"M{rng.randrange(3)}"
+        try:
+            if rng.random() < 0.8:
+                schedule.add_operation(
+                    mc_id,
+                    f"J{rng.randrange(5)}",
+                    to_moment(start),
+                    to_moment(end),
+                )
+            else:
+                schedule.add_breakdown(mc_id, to_moment(start), to_moment(end))
+        except ValueError:
+            pass
+    schedule.mc_dict["M0"].contents["line"] = 1
+    schedule.job_dict["J0"].contents["due"] = to_moment(900)
+    return schedule
+
+
+def schedule_state_of(schedule: Schedule):
+    return (
+        schedule.backend,
+        schedule.horizon.dt_range(),
+        {
+            mc_id: (mc.contents, state_of(mc.mc_schedule))
+            for mc_id, mc in schedule.mc_dict.items()
+        },
+        {
+            job_id: (
+                job.contents,
+                [
+                    (op.ac_id, op.mc.mc_id, op.interval.dt_range())
+                    for op in job.operation_list
+                ],
+            )
+            for job_id, job in schedule.job_dict.items()
+        },
+    )
+
+
+def assert_linked(schedule: Schedule):
+    # operations of jobs are the activities in the machine schedules
+    for job in schedule.job_dict.values():
+        for op in job.operation_list:
+            assert op.job is job
+            assert op.mc is schedule.mc_dict[op.mc.mc_id]
+            ac = op.mc.mc_schedule.ac_dict[op.ac_id]
+            assert ac.interval.dt_range() == op.interval.dt_range()
+
+
+@pytest.mark.parametrize("tick", [False, True])
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_pickle_round_trip(backend, tick):
+    schedule = make_schedule(backend, tick)
+    loaded = pickle.loads(pickle.dumps(schedule))
+    assert schedule_state_of(loaded) == schedule_state_of(schedule)
+    assert_linked(loaded)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+@pytest.mark.parametrize("tick", [False, True])
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_save_load_round_trip(backend, tick, mmap, tmp_path):
+    schedule = make_schedule(backend, tick)
+    schedule.save(str(tmp_path / "snapshot"))
+    loaded = Schedule.load(str(tmp_path / "snapshot"), mmap=mmap)
+    assert schedule_state_of(loaded) == schedule_state_of(schedule)
+    assert_linked(loaded)
+
+    # the loaded schedule is editable and the saved files are unchanged
+    to_moment, _ = make_converter(tick)
+    mc_schedule = loaded.mc_dict["M1"].mc_schedule
+    mc_schedule.del_activities_in_interval(
+        Interval(to_moment(0), to_moment(1000))
+    )
+    again = Schedule.load(str(tmp_path / "snapshot"), mmap=mmap)
+    assert schedule_state_of(again) == schedule_state_of(schedule)
@@ -0,0 +1,123 @@
+""" Tests of SortedAcList and its views
+Created on 17th Oct. 2026
+"""
+import random
+
+import pytest
+
+from mstk.schedule.interval import Interval
+from mstk.schedule.sorted_ac_list import SortedAcList
+from mstk.schedule.to_dt import Moment
+from mstk.test.test_ac_ids_at import make_schedule, minutes
+
+
+class Ac:
+    # an activity with an interval only
+    def __init__(self, idx: int, start: int, end: int):
+        self.idx = idx
+        self.interval = Interval(Moment(start), Moment(end))
+
+
+def make_acs(rng: random.Random):
+    # disjoint activities with a positive duration and activities
+    # of duration 0 outside them (some at the same moments)
+    ac_list = []
+    moment = 0
+    while moment < 400:
+        if rng.random() < 0.5:
+            end = moment + rng.randint(1, 5)
+            ac_list.append(Ac(len(ac_list), moment, end))
+        else:
+            end = moment + rng.randint(0, 3)
+        for _ in range(rng.choice([0, 0, 1, 2])):
+            ac_list.append(Ac(len(ac_list), moment, moment))
+        moment = end
+    return ac_list
+
+
+def sort_key(ac: Ac):
+    # start time, duration 0 first, and then the order of insertion
+    start, end = ac.interval.dt_range()
+    return (start, start != end, ac.idx)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_order_of_random_additions_and_removals(seed):
+    rng = random.Random(seed)
+    ac_list = make_acs(rng)
+    rng.shuffle(ac_list)
+    for idx, ac in enumerate(ac_list):
+        ac.idx = idx
+    sorted_ac_list = SortedAcList(load=4)
+    for ac in ac_list:
+        sorted_ac_list.add(ac)
+    expected = sorted(ac_list, key=sort_key)
+    assert list(sorted_ac_list) == expected
+    assert list(reversed(sorted_ac_list)) == expected[::-1]
+
+    for ac in rng.sample(ac_list, len(ac_list) // 2):
+        sorted_ac_list.remove(ac)
+        expected.remove(ac)
+    assert list(sorted_ac_list) == expected
+    assert len(sorted_ac_list) == len(expected)
+    assert sorted_ac_list.first() is expected[0]
+    assert sorted_ac_list.last() is expected[-1]
+    for idx, ac in enumerate(expected):
+        assert sorted_ac_list.at(idx) is ac
+        assert sorted_ac_list.locate(ac) is not None
+        assert sorted_ac_list.prev_of(ac) is (
+            expected[idx - 1] if idx > 0 else None
+        )
+        assert sorted_ac_list.next_of(ac) is (
+            expected[idx + 1] if idx + 1 < len(expected) else None
+        )
+
+
+def test_floor_and_iteration_from_moments():
+    rng = random.Random(9)
+    ac_list = sorted(make_acs(rng), key=sort_key)
+    sorted_ac_list = SortedAcList(load=4)
+    sorted_ac_list.reset(ac_list)
+    for moment in range(-1, 402):
+        starting = [ac for ac in ac_list if ac.interval.start <= moment]
+        floor_ac = starting[-1] if starting else None
+        assert sorted_ac_list.floor(Moment(moment)) is floor_ac
+        expected = ac_list[len(starting) - 1 :] if starting else ac_list
+        assert list(sorted_ac_list.iter_from_moment(Moment(moment))) == (
+            expected
+        )
+
+
+def test_remove_of_missing_activity():
+    sorted_ac_list = SortedAcList()
+    sorted_ac_list.add(Ac(0, 1, 2))
+    with pytest.raises(ValueError):
+        sorted_ac_list.remove(Ac(1, 1, 2))
+    sorted_ac_list.pop()
+    with pytest.raises(IndexError):
+        sorted_ac_list.pop()
+
+
+def test_ac_id_list_is_a_live_read_only_view():
+    schedule = make_schedule("default", 600)
+    mc_schedule = schedule.mc_dict["M1"].mc_schedule
+    ac_id_list = mc_schedule.ac_id_list
+    assert ac_id_list is mc_schedule.ac_id_list
+
+    expected = [ac.ac_id for ac in mc_schedule.ac_iter()]
+    assert ac_id_list == expected
+    assert len(ac_id_list) == len(expected)
+    for idx in [0, 1, 255, 256, 257, 700, -1, -len(expected)]:
+        assert ac_id_list[idx] == expected[idx]
+    assert ac_id_list[250:260] == expected[250:260]
+    assert list(reversed(ac_id_list)) == expected[::-1]
+    assert ac_id_list.index(expected[300]) == 300
+    with pytest.raises(IndexError):
+        ac_id_list[len(expected)]
+    with pytest.raises(TypeError):
+        ac_id_list[0] = "Operation(M1-1)"
+
+    # changes are reflected without asking for the view again
+    schedule.add_breakdown("M1", minutes(1802), minutes(1803))
+    assert ac_id_list == [ac.ac_id for ac in mc_schedule.ac_iter()]
+    assert len(ac_id_list) == len(expected) + 2
@@ -0,0 +1,147 @@
+""" Tests of Schedule.transform
+Created on 17th Oct. 2026
+"""
+import datetime as dt
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import pytest
+
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.interval import Interval
+from mstk.schedule.schedule import Schedule
+from mstk.schedule import to_dt
+
+START = dt.datetime(2020, 1, 1)
+MINUTE = dt.timedelta(minutes=1)
+BACKENDS = ["default", "implicit_idle", "columnar"]
+
+
+def make_schedule(
+    backend: str, start=START, unit=MINUTE, n_machines=4, n_operations=60
+):
+    schedule = Schedule(
+        "test",
+        Interval(start, start + unit * (3 * n_operations + 10)),
+        AcTypesParam(),
+        backend,
+    )
+    schedule.add_job("J1")
+    for mc_idx in range(n_machines):
+        schedule.add_machine(f"M{mc_idx}")
+        schedule.bulk_add(
+            {
+                "mc_id": f"M{mc_idx}",
+                "ac_type": "Operation",
+                "job_id": "J1",
+                "start": start + unit * (3 * idx + mc_idx),
+                "end": start + unit * (3 * idx + mc_idx + 2),
+                "contents": {"idx": idx},
+            }
+            for idx in range(n_operations)
+        )
+        schedule.add_breakdown(
+            f"M{mc_idx}",
+            start + unit * (3 * n_operations + 2),
+            start + unit * (3 * n_operations + 5),
+        )
+    return schedule
+
+
+def rows_of(schedule: Schedule):
+    return {
+        mc.mc_id: [
+            (
+                ac.ac_type,
+                ac.ac_id,
+                ac.interval.start,
+                ac.interval.end,
+                ac.contents,
+            )
+            for ac in mc.mc_schedule.ac_iter()
+        ]
+        for mc in schedule.mc_iter()
+    }
+
+
+class NoExecutor(Executor):
+    def submit(self, fn, *args, **kwargs):
+        raise AssertionError("executor is used")
+
+
+@pytest.mark.parametrize("horz_overlap", ["trim", "exclude"])
+def test_columnar_process_pool_matches_serial(horz_overlap):
+    schedule = make_schedule("columnar")
+    kwargs = dict(
+        start=START + MINUTE * 31,
+        end=START + MINUTE * 151,
+        horz_overlap=horz_overlap,
+    )
+    serial = schedule.transform("serial", **kwargs)
+    with ProcessPoolExecutor(2) as executor:
+        pooled = schedule.transform(
+            "pooled", executor=executor, chunk_size=3, **kwargs
+        )
+    assert rows_of(pooled) == rows_of(serial)
+
+
+def test_columnar_process_pool_on_moments():
+    start = to_dt.Moment(1000)
+    schedule = make_schedule("columnar", start, 60, n_machines=2)
+    kwargs = dict(start=start + 600, end=start + 6000)
+    serial = schedule.transform("serial", **kwargs)
+    with ProcessPoolExecutor(1) as executor:
+        pooled = schedule.transform("pooled", executor=executor, **kwargs)
+    assert rows_of(pooled) == rows_of(serial)
+    first_ac = pooled.mc_dict["M0"].mc_schedule.ac_list.first()
+    assert isinstance(first_ac.interval.start, to_dt.Moment)
+
+
+@pytest.mark.parametrize("backend", ["default", "implicit_idle"])
+def test_executor_is_ignored_without_columns(backend):
+    schedule = make_schedule(backend)
+    kwargs = dict(start=START + MINUTE * 31, end=START + MINUTE * 151)
+    pooled = schedule.transform("pooled", executor=NoExecutor(), **kwargs)
+    assert rows_of(pooled) == rows_of(schedule.transform("serial", **kwargs))
+
+
+def test_column_slice_is_smaller_than_machine_schedule():
+    schedule = make_schedule("columnar", n_machines=1, n_operations=3000)
+    mc_schedule = schedule.mc_dict["M0"].mc_schedule
+    column_slice = mc_schedule.slice_columns(
+        Interval(START + MINUTE * 300, START + MINUTE * 600), "trim"
+    )
+    assert len(column_slice) == 100
+    assert len(pickle.dumps(column_slice.starts)) * 20 < len(
+        pickle.dumps(mc_schedule)
+    )
+
+
+@pytest.mark.parametrize("horz_overlap", ["trim", "exclude"])
+@pytest.mark.parametrize("bounds", [(31, 151), (0, 190), (100, 101)])
+def test_backends_transform_the_same(bounds, horz_overlap):
+    kwargs = dict(
+        mc_id_list=["M0", "M2", "M3"],
+        start=START + MINUTE * bounds[0],
+        end=START + MINUTE * bounds[1],
+        horz_overlap=horz_overlap,
+    )
+    state_list = []
+    for backend in BACKENDS:
+        transformed = make_schedule(backend).transform("new", **kwargs)
+        assert transformed.backend == backend
+        assert transformed.horizon.dt_range() == (
+            kwargs["start"],
+            kwargs["end"],
+        )
+        # idle ac_ids are backend specific; gaps are compared instead
+        state_list.append(
+            {
+                mc_id: (
+                    [row for row in rows if row[0] != "Idle"],
+                    list(transformed.mc_dict[mc_id].mc_schedule.gap_iter()),
+                )
+                for mc_id, rows in rows_of(transformed).items()
+            }
+        )
+    assert state_list[0] == state_list[1] == state_list[2]
@@ -0,0 +1,154 @@
+""" Tests of UndoLog and transactions of a Schedule
+Created on 17th Oct. 2026
+"""
+import contextlib
+import datetime as dt
+import io
+import random
+
+import pytest
+
+from mstk.schedule.ac_types import AcTypesParam
+from mstk.schedule.interval import Interval
+from mstk.schedule.schedule import Schedule
+from mstk.schedule.undo_log import UndoLog
+
+START = dt.datetime(2020, 1, 1)
+MINUTE = dt.timedelta(minutes=1)
+BACKENDS = ["default", "implicit_idle", "columnar"]
+
+
+def minutes(count: int) -> dt.datetime:
+    return START + MINUTE * count
+
+
+def state_of(schedule: Schedule):
+    mc_state = {
+        mc.mc_id: [
+            (ac.ac_id, ac.ac_type, ac.interval.dt_range())
+            for ac in mc.mc_schedule.ac_iter()
+        ]
+        for mc in schedule.mc_iter()
+    }
+    job_state = {
+        job.job_id: [operation.ac_id for operation in job.operation_list]
+        for job in schedule.job_iter()
+    }
+    for mc in schedule.mc_iter():
+        mc_schedule = mc.mc_schedule
+        if mc_schedule.is_gap_indexed:
+            assert list(mc_schedule.gap_index) == list(mc_schedule.gap_iter())
+    return mc_state, job_state
+
+
+def random_edit(schedule: Schedule, rng: random.Random):
+    mc_id = f"M{rng.randrange(3)}"
+    start = rng.randint(0, 300)
+    end = min(300, start + rng.randint(0, 30))
+    draw = rng.random()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if draw < 0.35:
+                schedule.add_operation(
+                    mc_id, f"J{rng.randrange(3)}", minutes(start), minutes(end)
+                )
+            elif draw < 0.45:
+                schedule.add_breakdown(mc_id, minutes(start), minutes(end))
+            elif draw < 0.65:
+                schedule.mc_dict[mc_id].mc_schedule.del_activities_in_interval(
+                    Interval(minutes(start), minutes(end))
+                )
+            elif draw < 0.8:
+                schedule.bulk_add(
+                    [
+                        {
+                            "mc_id": mc_id,
+                            "ac_type": "Breakdown",
+                            "start": minutes(start),
+                            "end": minutes(end),
+                        }
+                    ]
+                )
+            else:
+                schedule.find_earliest_slot(
+                    "J0",
+                    MINUTE * rng.randint(1, 40),
+                    release=minutes(start),
+                    book=True,
+                )
+    except ValueError:
+        pass
+
+
+def make_schedule(backend: str) -> Schedule:
+    schedule = Schedule(
+        "test", Interval(minutes(0), minutes(300)), AcTypesParam(), backend
+    )
+    for idx in range(3):
+        schedule.add_machine(f"M{idx}")
+        schedule.add_job(f"J{idx}")
+    return schedule
+
+
+def test_undo_log_records_only_in_transactions():
+    undo_log = UndoLog()
+    values = []
+    undo_log.record(values.append, 0)
+    assert len(undo_log) == 0
+    with pytest.raises(RuntimeError):
+        undo_log.rollback()
+    with pytest.raises(RuntimeError):
+        undo_log.end()
+
+    undo_log.begin()
+    undo_log.record(values.append, 1)
+    savepoint = undo_log.savepoint()
+    undo_log.begin()
+    undo_log.record(values.append, 2)
+    undo_log.record(values.append, 3)
+    assert undo_log.depth == 2
+    with pytest.raises(ValueError):
+        undo_log.rollback(savepoint - 1)
+    undo_log.rollback()
+    assert values == [3, 2]
+    undo_log.end()
+    # the outer transaction keeps the edits of the inner one
+    undo_log.rollback(savepoint)
+    assert values == [3, 2]
+    undo_log.rollback()
+    assert values == [3, 2, 1]
+    undo_log.end()
+    assert len(undo_log) == 0 and undo_log.depth == 0
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_rollback_restores_schedule(backend):
+    rng = random.Random(backend)
+    schedule = make_schedule(backend)
+    for _ in range(30):
+        random_edit(schedule, rng)
+    schedule.mc_dict["M1"].mc_schedule.gap_index
+    initial = state_of(schedule)
+
+    with schedule.transaction():
+        for _ in range(20):
+            before = state_of(schedule)
+            savepoint = schedule.savepoint()
+            for _ in range(rng.randint(1, 8)):
+                random_edit(schedule, rng)
+            if rng.random() < 0.7:
+                schedule.rollback(savepoint)
+                assert state_of(schedule) == before
+
+        before = state_of(schedule)
+        with pytest.raises(KeyError):
+            with schedule.transaction():
+                for _ in range(8):
+                    random_edit(schedule, rng)
+                raise KeyError("an error in a nested transaction")
+        assert state_of(schedule) == before
+
+        random_edit(schedule, rng)
+        schedule.rollback()
+    assert state_of(schedule) == initial
+    assert len(schedule.undo_log) == 0
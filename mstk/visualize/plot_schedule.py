@@ -8,7 +8,9 @@ import matplotlib.patches as patches
 import matplotlib.dates as mdates
 import matplotlib.lines as lines
 
+from mstk.schedule.interval import Interval
 from mstk.schedule.schedule import Schedule
+from mstk.schedule.to_dt import to_dt_datetime
 from mstk.visualize.color_map import Cmap
 
 
@@ -38,6 +40,10 @@ class PlotSchedule:
         self.horz_line_on = (
             kwargs["horz_line_on"] if "horz_line_on" in kwargs else False
         )
+        # a window of time to draw (activities outside are not visited)
+        self.window: Interval = (
+            kwargs["window"] if "window" in kwargs else schedule.horizon
+        )
 
     @property
     def schedule(self) -> Schedule:
@@ -108,8 +114,8 @@ class PlotSchedule:
     def format_ax_main(self):
         """Sets the main axis of a figure"""
         # set limits in ax_main
-        self.x_min = mdates.date2num(self.schedule.horizon.start)
-        self.x_max = mdates.date2num(self.schedule.horizon.end)
+        self.x_min = mdates.date2num(to_dt_datetime(self.window.start))
+        self.x_max = mdates.date2num(to_dt_datetime(self.window.end))
         self.ax_main.set_xlim(self.x_min, self.x_max)
 
         # set x_axis in datetime format
@@ -195,29 +201,33 @@ class PlotSchedule:
             Yields:
                 matplotlib.patches.Rectangle: a patch of the trimmed activity
             """
-            for mc_id, mc in overlay_schedule.mc_dict.items():
-                if mc_id not in self.mc_id_list:
+            mc_id_list = [
+                mc_id
+                for mc_id in overlay_schedule.mc_id_list
+                if mc_id in self.mc_id_list
+            ]
+            for ac in overlay_schedule.activities_in(
+                self.window, mc_id_list=mc_id_list
+            ):
+                target_mc_index = self.mc_id_list.index(ac.mc.mc_id)
+                new_interval = self.schedule.transform_interval_to_horizon(
+                    ac.interval, self.window, "trim"
+                )
+                if new_interval == None:
                     continue
-                target_mc_index = self.mc_id_list.index(mc_id)
-                for ac in mc.actual_ac_iter():
-                    new_interval = self.schedule.transform_interval_to_horizon(
-                        ac.interval, self.schedule.horizon, "trim"
-                    )
-                    if new_interval == None:
-                        continue
-                    start = mdates.date2num(new_interval.start)
-                    end = mdates.date2num(new_interval.end)
-                    proc = end - start
-                    ac_patch = patches.Rectangle(
-                        (start, 1.1 * target_mc_index),
-                        proc,
-                        1,
-                        facecolor="k",
-                        edgecolor="r",
-                        alpha=0.3,
-                        linewidth=2,
-                    )
-                    yield ac_patch
+                start = mdates.date2num(to_dt_datetime(new_interval.start))
+                end = mdates.date2num(to_dt_datetime(new_interval.end))
+                proc = end - start
+                ac_patch = patches.Rectangle(
+                    (start, 1.1 * target_mc_index),
+                    proc,
+                    1,
+                    facecolor="k",
+                    edgecolor="r",
+                    alpha=0.3,
+                    linewidth=2,
+                )
+                yield ac_patch
 
         overlay_patch_list += [
             patch for patch in patch_generator(overlay_schedule)
@@ -243,10 +253,12 @@ class PlotSchedule:
                 target_mc_id
             ].mc_schedule
 
-            for ac in target_mc_schedule.actual_ac_iter():
+            for ac in target_mc_schedule.ac_iter_in(self.window):
+                if ac.ac_type == self.schedule.ac_types_param.idle:
+                    continue
 
-                start = mdates.date2num(ac.interval.start)
-                end = mdates.date2num(ac.interval.end)
+                start = mdates.date2num(to_dt_datetime(ac.interval.start))
+                end = mdates.date2num(to_dt_datetime(ac.interval.end))
                 proc = end - start
 
                 if ac.ac_type == self.schedule.ac_types_param.operation:
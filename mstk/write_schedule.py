@@ -0,0 +1,264 @@
+""" Writer of schedules in the standard project format (see mstk.test)
+Created on 17th Oct. 2026
+"""
+from __future__ import annotations
+
+__all__ = [
+    "write_machine_info",
+    "write_job_info",
+    "write_activity_info",
+    "write_schedule",
+]
+
+# common Python packages
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+import csv, json, os
+
+# defined packages
+from mstk.schedule import to_dt
+from mstk.schedule.activity import Operation
+from mstk.schedule.schedule import Schedule
+
+# columns of activity_info.csv before the contents columns
+ACTIVITY_COLUMNS = ["mc_id", "start", "end", "ac_type", "job_id"]
+# the size of a buffer of the files
+BUFFER_SIZE = 1 << 20
+
+
+def format_moment(moment: Any, dt_format: Optional[str] = None) -> str:
+    """Formats a moment of a schedule
+
+    Args:
+        moment (Any): a datetime or a Moment
+        dt_format (Optional[str], optional): a format of datetime.strftime
+            (if None, ISO 8601 with a space separator)
+
+    Returns:
+        str: the date string
+    """
+    moment = to_dt.to_dt_datetime(moment)
+    if dt_format == None:
+        return moment.isoformat(sep=" ")
+    return moment.strftime(dt_format)
+
+
+def find_contents_keys(
+    contents_iterable: Iterable[Dict[str, Any]], exclude: List[str]
+) -> List[str]:
+    """Returns keys of contents in the order of their first appearance
+
+    Args:
+        contents_iterable (Iterable[Dict[str, Any]]): contents
+        exclude (List[str]): keys not to be returned
+
+    Returns:
+        List[str]: the keys
+    """
+    key_dict: Dict[str, None] = {}
+    for contents in contents_iterable:
+        for key in contents:
+            if key not in key_dict and key not in exclude:
+                key_dict[key] = None
+    return list(key_dict)
+
+
+def write_rows(
+    fname: str,
+    header: List[str],
+    row_iter: Iterator[List[Any]],
+    chunk_size: int = 4096,
+):
+    """Writes rows to a .csv file in chunks through a buffered file
+
+    Args:
+        fname (str): the file path
+        header (List[str]): names of columns
+        row_iter (Iterator[List[Any]]): rows to be written
+        chunk_size (int, optional): the number of rows in a chunk.
+            Defaults to 4096.
+    """
+    with open(
+        fname, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE
+    ) as file_data:
+        writer = csv.writer(file_data)
+        writer.writerow(header)
+        chunk: List[List[Any]] = []
+        for row in row_iter:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                writer.writerows(chunk)
+                chunk.clear()
+        writer.writerows(chunk)
+
+
+def write_machine_info(fname: str, schedule: Schedule):
+    """Writes machine information (mc_id and contents of machines)
+
+    Args:
+        fname (str): the file path
+        schedule (Schedule): a schedule of machines
+    """
+    keys = find_contents_keys(
+        (mc.contents for mc in schedule.mc_iter()), ["mc_id"]
+    )
+    write_rows(
+        fname,
+        ["mc_id"] + keys,
+        (
+            [mc.mc_id] + [mc.contents.get(key, "") for key in keys]
+            for mc in schedule.mc_iter()
+        ),
+    )
+
+
+def write_job_info(fname: str, schedule: Schedule):
+    """Writes job information (job_id and contents of jobs)
+
+    Args:
+        fname (str): the file path
+        schedule (Schedule): a schedule of jobs
+    """
+    keys = find_contents_keys(
+        (job.contents for job in schedule.job_iter()), ["job_id"]
+    )
+    write_rows(
+        fname,
+        ["job_id"] + keys,
+        (
+            [job.job_id] + [job.contents.get(key, "") for key in keys]
+            for job in schedule.job_iter()
+        ),
+    )
+
+
+def write_activity_info(
+    fname: str,
+    schedule: Schedule,
+    dt_format: Optional[str] = None,
+    contents_keys: Optional[List[str]] = None,
+    chunk_size: int = 4096,
+):
+    """Writes operations and breakdowns machine by machine
+    in the order of start times
+
+    Activities are read from the machine schedules while writing,
+    so that only a chunk of rows is kept in memory
+
+    Args:
+        fname (str): the file path
+        schedule (Schedule): a schedule to be written
+        dt_format (Optional[str], optional): a format of datetime.strftime
+            (if None, ISO 8601 with a space separator)
+        contents_keys (Optional[List[str]], optional): keys of contents
+            to be written as columns (if None, all keys found in a pass
+            over the activities, except the columns of ACTIVITY_COLUMNS)
+        chunk_size (int, optional): the number of rows in a chunk.
+            Defaults to 4096.
+    """
+    if contents_keys == None:
+        contents_keys = find_contents_keys(
+            (
+                ac.contents
+                for mc in schedule.mc_iter()
+                for ac in mc.mc_schedule.actual_ac_iter()
+            ),
+            ACTIVITY_COLUMNS,
+        )
+
+    def row_iter() -> Iterator[List[Any]]:
+        for mc in schedule.mc_iter():
+            for ac in mc.mc_schedule.actual_ac_iter():
+                yield [
+                    mc.mc_id,
+                    format_moment(ac.interval.start, dt_format),
+                    format_moment(ac.interval.end, dt_format),
+                    ac.ac_type,
+                    ac.job.job_id if isinstance(ac, Operation) else "",
+                ] + [ac.contents.get(key, "") for key in contents_keys]
+
+    write_rows(fname, ACTIVITY_COLUMNS + contents_keys, row_iter(), chunk_size)
+
+
+def write_schedule(
+    schedule: Schedule,
+    proj_folder: str,
+    dt_format: Optional[str] = None,
+    contents_keys: Optional[List[str]] = None,
+    chunk_size: int = 4096,
+):
+    """Writes a schedule to a project folder that read_schedule reads
+
+    The folder (created if it does not exist) contains
+    schedule_metadata.json, ac_types.json, machine_info.csv, job_info.csv
+    and activity_info.csv. Idle activities are not written, and ac_ids
+    are given again by read_schedule
+
+    Args:
+        schedule (Schedule): a schedule to be written
+        proj_folder (str): the folder path
+        dt_format (Optional[str], optional): a format of datetime.strftime,
+            written to the metadata as datetime_format
+            (if None, ISO 8601 with a space separator)
+        contents_keys (Optional[List[str]], optional): keys of contents
+            of activities to be written (see write_activity_info)
+        chunk_size (int, optional): the number of rows in a chunk.
+            Defaults to 4096.
+    """
+    os.makedirs(proj_folder, exist_ok=True)
+    file_info = {
+        "ac_types_info": "ac_types.json",
+        "activity_info": "activity_info.csv",
+        "machine_info": "machine_info.csv",
+        "job_info": "job_info.csv",
+    }
+    with open(
+        os.path.join(proj_folder, file_info["ac_types_info"]),
+        "w",
+        encoding="utf-8",
+    ) as file_data:
+        json.dump(schedule.ac_types_param.to_dict(), file_data, indent=4)
+    write_machine_info(
+        os.path.join(proj_folder, file_info["machine_info"]), schedule
+    )
+    write_job_info(os.path.join(proj_folder, file_info["job_info"]), schedule)
+    write_activity_info(
+        os.path.join(proj_folder, file_info["activity_info"]),
+        schedule,
+        dt_format,
+        contents_keys,
+        chunk_size,
+    )
+
+    metadata = {
+        "schedule_name": schedule.schedule_id,
+        "file_info": file_info,
+        "horizon": {
+            "start": format_moment(schedule.horizon.start, dt_format),
+            "end": format_moment(schedule.horizon.end, dt_format),
+        },
+        "datetime_format": dt_format,
+        "plot_option": {"legend_on": True, "horz_line_on": False},
+    }
+    with open(
+        os.path.join(proj_folder, "schedule_metadata.json"),
+        "w",
+        encoding="utf-8",
+    ) as file_data:
+        json.dump(metadata, file_data, indent=4)
+
+
+def main():
+    import tempfile
+    from mstk.test import sample_proj_folder
+    from mstk.read_schedule import read_schedule
+
+    sample_schedule = read_schedule(sample_proj_folder)
+    with tempfile.TemporaryDirectory() as proj_folder:
+        write_schedule(sample_schedule, proj_folder)
+        written_schedule = read_schedule(proj_folder)
+    print("Finished writing a sample schedule")
+
+
+if __name__ == "__main__":
+    main()